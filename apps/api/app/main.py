@@ -18,9 +18,19 @@ from features.approval.api.routes import router as approval_router
 from features.el_comercio_feeds.api.routes import router as el_comercio_feeds_router
 from features.diario_correo_feeds.api.routes import router as diario_correo_feeds_router
 from features.scrapes.api.routes import router as scrapes_router
+from features.search.api.routes import router as search_router
 from features.youtube_feeds.api.routes import router as youtube_feeds_router
 from features.batch_fetch.api.routes import router as batch_fetch_router
+from features.translation.service.detection_jobs import resume_language_detection_jobs
+from features.translation.service.worker import (
+    is_worker_enabled,
+    start_translation_worker,
+    stop_translation_worker,
+)
+from lib.database import close_connections
+from lib.database.aio import close_db_executor
 from lib.database.init_db import run_migrations
+from lib.pagination import NEXT_CURSOR_HEADER
 
 app = FastAPI(title="RSS Leads API")
 
@@ -40,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 @app.on_event("startup")
@@ -47,6 +58,24 @@ def run_startup_migrations() -> None:
     if _should_run_migrations():
         run_migrations()
 
+@app.on_event("startup")
+def start_background_translation() -> None:
+    if is_worker_enabled():
+        start_translation_worker()
+
+@app.on_event("startup")
+def resume_language_detection() -> None:
+    resume_language_detection_jobs()
+
+@app.on_event("shutdown")
+def stop_background_translation() -> None:
+    stop_translation_worker()
+
+@app.on_event("shutdown")
+def close_database_connections() -> None:
+    close_db_executor()
+    close_connections()
+
 # Include all routers
 app.include_router(categories_router)
 app.include_router(countries_router)
@@ -62,6 +91,7 @@ app.include_router(approval_router)
 app.include_router(el_comercio_feeds_router)
 app.include_router(diario_correo_feeds_router)
 app.include_router(scrapes_router)
+app.include_router(search_router)
 app.include_router(youtube_feeds_router)
 app.include_router(dev_router)
 app.include_router(batch_fetch_router)
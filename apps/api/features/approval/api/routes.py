@@ -1,22 +1,21 @@
 from fastapi import APIRouter, HTTPException
-from typing import Optional
-from lib.database import fetch_all, fetch_one, execute_query
+import json
+from typing import List, Optional
+from lib.database import fetch_all, fetch_one, execute_query, transaction
+from lib.database.aio import execute_query_async, fetch_all_async, fetch_one_async, run_db
+from lib.database.counters import get_status_counts
 from features.approval.schema.models import (
-    ApprovalRequest, BatchApprovalRequest,
+    ApprovalRequest, BatchApprovalRequest, BulkApprovalRequest, BulkApprovalResponse,
+    ApprovalRuleCreate, ApprovalRuleUpdate, ApprovalRuleResponse,
     PendingContentItem, PendingContentResponse
 )
+from features.approval.service.bulk import apply_bulk_approval
+from features.approval.service.rules import invalidate_approval_rules, parse_keywords
 from datetime import datetime
 
 router = APIRouter(prefix="/approval", tags=["approval"])
 
-def auto_approve_reddit_posts() -> None:
-    """Ensure Reddit posts skip the approval queue."""
-    execute_query(
-        """UPDATE reddit_posts
-           SET approval_status = 'approved'
-           WHERE approval_status IS NULL OR approval_status = 'pending'""",
-        ()
-    )
+QUEUE_CONTENT_TYPES = ('lead', 'instagram_post', 'reddit_post', 'el_comercio_post', 'diario_correo_post')
 
 @router.get("/pending", response_model=PendingContentResponse)
 async def get_pending_content(
@@ -29,181 +28,75 @@ async def get_pending_content(
     content_type can be a single type or comma-separated list of types.
     For example: content_type=lead,el_comercio_post,diario_correo_post
     Returns unified list with content_type identifier.
+
+    Reads the trigger-maintained content_queue table, so limit/offset page
+    through all types at once and total_count is the full pending count.
+    The async approval handlers run their queries on the database executor
+    (lib.database.aio) so they never block the event loop.
     """
-    items = []
     content_types = content_type.split(',') if content_type else None
 
-    if not content_types or 'reddit_post' in content_types:
-        auto_approve_reddit_posts()
-
-    # Fetch pending leads
-    if not content_types or 'lead' in content_types:
-        leads = fetch_all(
-            """SELECT l.id,
-                      COALESCE(NULLIF(l.title_translated, ''), l.title) AS title,
-                      COALESCE(NULLIF(l.summary_translated, ''), l.summary) AS summary,
-                      l.detected_language,
-                      l.translation_status,
-                      l.link, l.collected_at, l.image_url, f.source_name
-               FROM leads l
-               JOIN feeds f ON l.feed_id = f.id
-               WHERE l.approval_status = 'pending'
-               ORDER BY l.collected_at DESC
-               LIMIT ? OFFSET ?""",
-            (limit, offset)
-        )
-        items.extend([{
-            'content_type': 'lead',
-            'content_id': lead['id'],
-            'title': lead['title'],
-            'summary': lead['summary'],
-            'source_name': lead['source_name'],
-            'collected_at': lead['collected_at'],
-            'image_url': lead['image_url'],
-            'link': lead['link'],
-            'detected_language': lead['detected_language'],
-            'translation_status': lead['translation_status'],
-        } for lead in leads])
-
-    # Fetch pending Instagram posts
-    if not content_types or 'instagram_post' in content_types:
-        instagram = fetch_all(
-            """SELECT ip.id,
-                      COALESCE(NULLIF(ip.caption_translated, ''), ip.caption) AS caption,
-                      ip.detected_language,
-                      ip.translation_status,
-                      COALESCE(NULLIF(ip.thumbnail_url, ''), NULLIF(ip.media_url, '')) AS image_url,
-                      ip.permalink, ip.collected_at, if.username
-               FROM instagram_posts ip
-               JOIN instagram_feeds if ON ip.instagram_feed_id = if.id
-               WHERE ip.approval_status = 'pending'
-               ORDER BY ip.collected_at DESC
-               LIMIT ? OFFSET ?""",
-            (limit, offset)
-        )
-        items.extend([{
-            'content_type': 'instagram_post',
-            'content_id': post['id'],
-            'title': post['caption'][:100] if post['caption'] else 'No caption',
-            'summary': post['caption'],
-            'source_name': f"@{post['username']}",
-            'collected_at': post['collected_at'],
-            'image_url': post['image_url'],
-            'link': post['permalink'],
-            'detected_language': post['detected_language'],
-            'translation_status': post['translation_status'],
-        } for post in instagram])
-
-    # Fetch pending Reddit posts
-    if not content_types or 'reddit_post' in content_types:
-        reddit = fetch_all(
-            """SELECT rp.id,
-                      COALESCE(NULLIF(rp.title_translated, ''), rp.title) AS title,
-                      COALESCE(NULLIF(rp.selftext_translated, ''), rp.selftext) AS selftext,
-                      rp.detected_language,
-                      rp.translation_status,
-                      rp.permalink, rp.collected_at, rp.subreddit
-               FROM reddit_posts rp
-               WHERE rp.approval_status = 'pending'
-               ORDER BY rp.collected_at DESC
-               LIMIT ? OFFSET ?""",
-            (limit, offset)
-        )
-        items.extend([{
-            'content_type': 'reddit_post',
-            'content_id': post['id'],
-            'title': post['title'],
-            'summary': post['selftext'][:200] if post['selftext'] else None,
-            'source_name': f"r/{post['subreddit']}",
-            'collected_at': post['collected_at'],
-            'image_url': None,
-            'link': post['permalink'],
-            'detected_language': post['detected_language'],
-            'translation_status': post['translation_status'],
-        } for post in reddit])
-
-    # Fetch pending El Comercio posts
-    if not content_types or 'el_comercio_post' in content_types:
-        el_comercio = fetch_all(
-            """SELECT ecp.id,
-                      COALESCE(NULLIF(ecp.title_translated, ''), ecp.title) AS title,
-                      COALESCE(NULLIF(ecp.excerpt_translated, ''), ecp.excerpt) AS excerpt,
-                      ecp.detected_language,
-                      ecp.translation_status,
-                      ecp.url, ecp.collected_at, ecp.image_url, ecf.display_name
-               FROM el_comercio_posts ecp
-               JOIN el_comercio_feeds ecf ON ecp.el_comercio_feed_id = ecf.id
-               WHERE ecp.approval_status = 'pending'
-               ORDER BY ecp.collected_at DESC
-               LIMIT ? OFFSET ?""",
-            (limit, offset)
-        )
-        items.extend([{
-            'content_type': 'el_comercio_post',
-            'content_id': post['id'],
-            'title': post['title'],
-            'summary': post['excerpt'],
-            'source_name': post['display_name'],
-            'collected_at': post['collected_at'],
-            'image_url': post['image_url'],
-            'link': post['url'],
-            'detected_language': post['detected_language'],
-            'translation_status': post['translation_status'],
-        } for post in el_comercio])
-
-    # Fetch pending Diario Correo posts
-    if not content_types or 'diario_correo_post' in content_types:
-        diario_correo = fetch_all(
-            """SELECT dcp.id,
-                      COALESCE(NULLIF(dcp.title_translated, ''), dcp.title) AS title,
-                      COALESCE(NULLIF(dcp.excerpt_translated, ''), dcp.excerpt) AS excerpt,
-                      dcp.detected_language,
-                      dcp.translation_status,
-                      dcp.url, dcp.collected_at, dcp.image_url, dcf.display_name
-               FROM diario_correo_posts dcp
-               JOIN diario_correo_feeds dcf ON dcp.diario_correo_feed_id = dcf.id
-               WHERE dcp.approval_status = 'pending'
-               ORDER BY dcp.collected_at DESC
-               LIMIT ? OFFSET ?""",
-            (limit, offset)
-        )
-        items.extend([{
-            'content_type': 'diario_correo_post',
-            'content_id': post['id'],
-            'title': post['title'],
-            'summary': post['excerpt'],
-            'source_name': post['display_name'],
-            'collected_at': post['collected_at'],
-            'image_url': post['image_url'],
-            'link': post['url'],
-            'detected_language': post['detected_language'],
-            'translation_status': post['translation_status'],
-        } for post in diario_correo])
-
-    # Sort all items by collected_at descending
-    items.sort(key=lambda x: x['collected_at'], reverse=True)
+    where_sql = "approval_status = 'pending'"
+    params = []
+    if content_types:
+        where_sql += f" AND content_type IN ({', '.join('?' for _ in content_types)})"
+        params.extend(content_types)
+
+    count_row = await fetch_one_async(f"SELECT COUNT(*) AS count FROM content_queue WHERE {where_sql}", tuple(params))
+    items = await fetch_all_async(
+        f"""SELECT content_type, content_id, title, summary, source_name, collected_at,
+                   image_url, link, detected_language, translation_status
+            FROM content_queue
+            WHERE {where_sql}
+            ORDER BY collected_at DESC, content_type DESC, content_id DESC
+            LIMIT ? OFFSET ?""",
+        tuple(params + [limit, offset])
+    )
 
     return {
-        'total_count': len(items),
-        'items': items[:limit]
+        'total_count': count_row['count'] if count_row else 0,
+        'items': items
     }
 
+TABLE_MAP = {
+    'lead': 'leads',
+    'instagram_post': 'instagram_posts',
+    'reddit_post': 'reddit_posts',
+    'el_comercio_post': 'el_comercio_posts',
+    'diario_correo_post': 'diario_correo_posts'
+}
+
+# Ids per UPDATE ... WHERE id IN (...), well below SQLite's variable limit
+BATCH_CHUNK_SIZE = 500
+
+def _apply_approval_groups(groups: dict, approved_at: str) -> set:
+    """Write each (table, status, approved_by, notes) group of ids in one transaction."""
+    updated = set()
+    with transaction():
+        for (table, status, approved_by, notes), ids in groups.items():
+            for start in range(0, len(ids), BATCH_CHUNK_SIZE):
+                chunk = ids[start:start + BATCH_CHUNK_SIZE]
+                rows = fetch_all(
+                    f"""UPDATE {table}
+                       SET approval_status = ?,
+                           approved_by = ?,
+                           approved_at = ?,
+                           approval_notes = ?
+                       WHERE id IN ({', '.join('?' for _ in chunk)})
+                       RETURNING id""",
+                    (status, approved_by, approved_at, notes, *chunk)
+                )
+                updated.update((table, row['id']) for row in rows)
+    return updated
+
 @router.post("/approve")
 async def approve_content(request: ApprovalRequest):
     """Approve or reject a single content item."""
-    table_map = {
-        'lead': 'leads',
-        'instagram_post': 'instagram_posts',
-        'reddit_post': 'reddit_posts',
-        'el_comercio_post': 'el_comercio_posts',
-        'diario_correo_post': 'diario_correo_posts'
-    }
-
-    table = table_map.get(request.content_type)
+    table = TABLE_MAP.get(request.content_type)
     if not table:
         raise HTTPException(400, f"Invalid content_type: {request.content_type}")
 
-    execute_query(
+    await execute_query_async(
         f"""UPDATE {table}
            SET approval_status = ?,
                approved_by = ?,
@@ -219,50 +112,45 @@ async def approve_content(request: ApprovalRequest):
 
 @router.post("/approve/batch")
 async def batch_approve_content(request: BatchApprovalRequest):
-    """Approve or reject multiple content items at once."""
-    results = []
+    """
+    Approve or reject multiple content items at once.
+
+    Items are grouped by table and by the values they set, and each group is
+    written with one UPDATE ... WHERE id IN (...) RETURNING id. All groups
+    run in a single transaction; ids that no row matched are reported as
+    not found. When an item appears more than once, the last occurrence
+    wins, as if the items were applied in order.
+    """
+    approved_at = datetime.utcnow().isoformat()
+    latest = {}
+    errors = {}
+    for index, item in enumerate(request.items):
+        table = TABLE_MAP.get(item.content_type)
+        if not table:
+            errors[index] = f"Invalid content_type: {item.content_type}"
+            continue
+        latest[(table, item.content_id)] = index
 
-    for item in request.items:
-        try:
-            table_map = {
-                'lead': 'leads',
-                'instagram_post': 'instagram_posts',
-                'reddit_post': 'reddit_posts',
-                'el_comercio_post': 'el_comercio_posts',
-                'diario_correo_post': 'diario_correo_posts'
-            }
-
-            table = table_map.get(item.content_type)
-            if not table:
-                results.append({
-                    'content_id': item.content_id,
-                    'success': False,
-                    'error': f"Invalid content_type: {item.content_type}"
-                })
-                continue
-
-            execute_query(
-                f"""UPDATE {table}
-                   SET approval_status = ?,
-                       approved_by = ?,
-                       approved_at = ?,
-                       approval_notes = ?
-                   WHERE id = ?""",
-                (item.status, item.approved_by,
-                 datetime.utcnow().isoformat(), item.approval_notes,
-                 item.content_id)
-            )
-
-            results.append({
-                'content_id': item.content_id,
-                'success': True
-            })
-        except Exception as e:
-            results.append({
-                'content_id': item.content_id,
-                'success': False,
-                'error': str(e)
-            })
+    groups = {}
+    for (table, _), index in latest.items():
+        item = request.items[index]
+        key = (table, item.status, item.approved_by, item.approval_notes)
+        groups.setdefault(key, []).append(index)
+
+    ids = {
+        key: sorted({request.items[index].content_id for index in indexes})
+        for key, indexes in groups.items()
+    }
+    updated = await run_db(_apply_approval_groups, ids, approved_at)
+
+    results = []
+    for index, item in enumerate(request.items):
+        if index in errors:
+            results.append({'content_id': item.content_id, 'success': False, 'error': errors[index]})
+        elif (TABLE_MAP[item.content_type], item.content_id) in updated:
+            results.append({'content_id': item.content_id, 'success': True})
+        else:
+            results.append({'content_id': item.content_id, 'success': False, 'error': 'Content not found'})
 
     return {
         'total': len(request.items),
@@ -271,37 +159,103 @@ async def batch_approve_content(request: BatchApprovalRequest):
         'results': results
     }
 
+@router.post("/approve/filter", response_model=BulkApprovalResponse)
+def bulk_approve_by_filter(request: BulkApprovalRequest):
+    """
+    Approve or reject every item matching a filter, server-side.
+
+    Only pending items are changed unless current_status says otherwise.
+    Rows are written in chunks of BULK_APPROVAL_CHUNK_SIZE, one transaction
+    each; dry_run=true returns the counts without changing anything.
+    """
+    try:
+        return apply_bulk_approval(request)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
 @router.get("/stats")
 async def get_approval_stats():
     """Get counts of pending/approved/rejected items by type."""
-    auto_approve_reddit_posts()
-    stats = {}
-    tables = {
-        'leads': 'lead',
-        'instagram_posts': 'instagram_post',
-        'reddit_posts': 'reddit_post',
-        'el_comercio_posts': 'el_comercio_post',
-        'diario_correo_posts': 'diario_correo_post'
+    counts = await run_db(get_status_counts, 'approval_status')
+    return {
+        content_type: {
+            status: counts.get(content_type, {}).get(status, 0)
+            for status in ('pending', 'approved', 'rejected')
+        }
+        for content_type in QUEUE_CONTENT_TYPES
     }
 
-    for table, content_type in tables.items():
-        pending = fetch_one(
-            f"SELECT COUNT(*) as count FROM {table} WHERE approval_status = 'pending'",
-            ()
-        )
-        approved = fetch_one(
-            f"SELECT COUNT(*) as count FROM {table} WHERE approval_status = 'approved'",
-            ()
-        )
-        rejected = fetch_one(
-            f"SELECT COUNT(*) as count FROM {table} WHERE approval_status = 'rejected'",
-            ()
-        )
+RULE_FIELDS = (
+    'name', 'action', 'content_type', 'source_name', 'country', 'language',
+    'keywords', 'pattern', 'priority', 'is_active',
+)
 
-        stats[content_type] = {
-            'pending': pending['count'] if pending else 0,
-            'approved': approved['count'] if approved else 0,
-            'rejected': rejected['count'] if rejected else 0
-        }
+def _rule_values(rule: dict) -> dict:
+    """Column values for a rule; keywords are stored as a JSON list."""
+    values = dict(rule)
+    if 'keywords' in values:
+        values['keywords'] = json.dumps(values['keywords']) if values['keywords'] else None
+    if 'is_active' in values:
+        values['is_active'] = int(values['is_active'])
+    return values
+
+def _rule_response(row: dict) -> ApprovalRuleResponse:
+    return ApprovalRuleResponse(
+        **{**row, 'keywords': parse_keywords(row.get('keywords')) or None, 'is_active': bool(row['is_active'])}
+    )
+
+@router.get("/rules", response_model=List[ApprovalRuleResponse])
+def get_approval_rules():
+    """List auto-approval rules in evaluation order."""
+    rows = fetch_all("SELECT * FROM approval_rules ORDER BY is_active DESC, priority DESC, id")
+    return [_rule_response(row) for row in rows]
+
+@router.post("/rules", response_model=ApprovalRuleResponse, status_code=201)
+def create_approval_rule(rule: ApprovalRuleCreate):
+    """
+    Create an auto-approval rule.
+
+    Fetchers apply the first matching active rule as they insert new content;
+    content already in the queue is left as is.
+    """
+    values = _rule_values(rule.model_dump())
+    rule_id = execute_query(
+        f"""INSERT INTO approval_rules ({', '.join(RULE_FIELDS)})
+            VALUES ({', '.join('?' for _ in RULE_FIELDS)})""",
+        tuple(values[field] for field in RULE_FIELDS)
+    )
+    invalidate_approval_rules()
+    return _rule_response(fetch_one("SELECT * FROM approval_rules WHERE id = ?", (rule_id,)))
+
+@router.get("/rules/{rule_id}", response_model=ApprovalRuleResponse)
+def get_approval_rule(rule_id: int):
+    row = fetch_one("SELECT * FROM approval_rules WHERE id = ?", (rule_id,))
+    if not row:
+        raise HTTPException(404, "Rule not found")
+    return _rule_response(row)
+
+@router.put("/rules/{rule_id}", response_model=ApprovalRuleResponse)
+def update_approval_rule(rule_id: int, rule: ApprovalRuleUpdate):
+    """Update the fields that are set; send null to clear a condition."""
+    if not fetch_one("SELECT id FROM approval_rules WHERE id = ?", (rule_id,)):
+        raise HTTPException(404, "Rule not found")
+
+    values = _rule_values(rule.model_dump(exclude_unset=True))
+    for field in ('name', 'action', 'priority', 'is_active'):
+        if field in values and values[field] is None:
+            raise HTTPException(400, f"{field} cannot be null")
+    if values:
+        assignments = ", ".join(f"{field} = ?" for field in values)
+        execute_query(
+            f"UPDATE approval_rules SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (*values.values(), rule_id)
+        )
+        invalidate_approval_rules()
+    return _rule_response(fetch_one("SELECT * FROM approval_rules WHERE id = ?", (rule_id,)))
 
-    return stats
+@router.delete("/rules/{rule_id}", status_code=204)
+def delete_approval_rule(rule_id: int):
+    if not fetch_one("SELECT id FROM approval_rules WHERE id = ?", (rule_id,)):
+        raise HTTPException(404, "Rule not found")
+    execute_query("DELETE FROM approval_rules WHERE id = ?", (rule_id,))
+    invalidate_approval_rules()
@@ -1,5 +1,6 @@
+import re
 from typing import Optional, Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 ContentType = Literal[
     'lead',
@@ -19,6 +20,66 @@ class ApprovalRequest(BaseModel):
 class BatchApprovalRequest(BaseModel):
     items: list[ApprovalRequest]
 
+class BulkApprovalRequest(BaseModel):
+    """Set the status of every item matching the filter; unset filters match all."""
+    status: Literal['approved', 'rejected']
+    approved_by: str
+    approval_notes: Optional[str] = None
+    current_status: Optional[Literal['pending', 'approved', 'rejected']] = 'pending'  # None = any status
+    content_types: Optional[list[ContentType]] = None
+    feed_id: Optional[int] = None  # Needs exactly one content type
+    source_name: Optional[str] = None
+    country: Optional[str] = None
+    detected_language: Optional[str] = None
+    collected_after: Optional[str] = None
+    collected_before: Optional[str] = None
+    search: Optional[str] = None
+    dry_run: bool = False
+
+class BulkApprovalResponse(BaseModel):
+    status: str
+    dry_run: bool
+    total: int
+    by_content_type: dict[str, int]
+    transactions: int
+
+class ApprovalRuleBase(BaseModel):
+    """Conditions left unset match anything; keywords match if any one appears."""
+    name: str
+    action: Literal['approved', 'rejected']
+    content_type: Optional[ContentType] = None
+    source_name: Optional[str] = None  # Feed name, '@username' for Instagram
+    country: Optional[str] = None
+    language: Optional[str] = None
+    keywords: Optional[list[str]] = None
+    pattern: Optional[str] = None  # Regex, searched case-insensitively
+    priority: int = 0  # Higher runs first
+    is_active: bool = True
+
+    @field_validator('pattern')
+    @classmethod
+    def check_pattern(cls, value: Optional[str]) -> Optional[str]:
+        if value:
+            try:
+                re.compile(value)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern: {e}")
+        return value or None
+
+class ApprovalRuleCreate(ApprovalRuleBase):
+    pass
+
+class ApprovalRuleUpdate(ApprovalRuleBase):
+    name: Optional[str] = None
+    action: Optional[Literal['approved', 'rejected']] = None
+    priority: Optional[int] = None
+    is_active: Optional[bool] = None
+
+class ApprovalRuleResponse(ApprovalRuleBase):
+    id: int
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
 class PendingContentItem(BaseModel):
     content_type: ContentType
     content_id: int
@@ -0,0 +1 @@
+"""Service layer for content approval."""
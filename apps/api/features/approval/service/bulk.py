@@ -0,0 +1,154 @@
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from lib.database import fetch_all, fetch_one, transaction
+from lib.database.fts import SEARCH_INDEX, build_match_query, fts_available, search_ids_sql
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Per content type: its table, feed foreign key and country column (Reddit
+# posts have no country, so a country filter skips them).
+BULK_SOURCES = {
+    'lead': {'table': 'leads', 'feed': 'feed_id', 'country': 'country'},
+    'instagram_post': {'table': 'instagram_posts', 'feed': 'instagram_feed_id', 'country': 'country'},
+    'reddit_post': {'table': 'reddit_posts', 'feed': 'reddit_feed_id', 'country': None},
+    'el_comercio_post': {'table': 'el_comercio_posts', 'feed': 'el_comercio_feed_id', 'country': 'country'},
+    'diario_correo_post': {'table': 'diario_correo_posts', 'feed': 'diario_correo_feed_id', 'country': 'country'},
+}
+
+
+def get_chunk_size() -> int:
+    raw = os.getenv("BULK_APPROVAL_CHUNK_SIZE", "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        value = DEFAULT_CHUNK_SIZE
+    return value if value > 0 else DEFAULT_CHUNK_SIZE
+
+
+def build_filter(content_type: str, request) -> Optional[Tuple[str, list]]:
+    """
+    WHERE clause (alias t) selecting one content type's rows matching the
+    request filter, or None when the filter cannot match that type.
+    """
+    source = BULK_SOURCES[content_type]
+    clauses = []
+    params = []
+
+    if request.current_status:
+        clauses.append("t.approval_status = ?")
+        params.append(request.current_status)
+    if request.feed_id is not None:
+        clauses.append(f"t.{source['feed']} = ?")
+        params.append(request.feed_id)
+    if request.country:
+        if not source['country']:
+            return None
+        clauses.append(f"t.{source['country']} = ?")
+        params.append(request.country)
+    if request.detected_language:
+        clauses.append("t.detected_language = ?")
+        params.append(request.detected_language)
+    if request.collected_after:
+        clauses.append("t.collected_at >= ?")
+        params.append(request.collected_after)
+    if request.collected_before:
+        clauses.append("t.collected_at < ?")
+        params.append(request.collected_before)
+    # Display names and text are read from content_queue, which has them in
+    # the same columns for every type
+    if request.source_name:
+        clauses.append(
+            "t.id IN (SELECT content_id FROM content_queue WHERE content_type = ? AND source_name = ?)"
+        )
+        params.extend([content_type, request.source_name])
+    if request.search:
+        match_query = build_match_query(request.search)
+        if match_query and fts_available(SEARCH_INDEX):
+            clauses.append(f"t.id IN ({search_ids_sql(content_type)})")
+            params.append(match_query)
+        else:
+            term = f"%{request.search}%"
+            clauses.append(
+                "t.id IN (SELECT content_id FROM content_queue "
+                "WHERE content_type = ? AND (title LIKE ? OR summary LIKE ?))"
+            )
+            params.extend([content_type, term, term])
+
+    return " AND ".join(clauses) or "1=1", params
+
+
+def _update_chunk(table: str, where_sql: str, params: list, last_id: int, chunk_size: int,
+                  values: Tuple) -> List[int]:
+    with transaction():
+        rows = fetch_all(
+            f"""UPDATE {table}
+               SET approval_status = ?,
+                   approved_by = ?,
+                   approved_at = ?,
+                   approval_notes = ?
+               WHERE id IN (
+                   SELECT t.id FROM {table} t
+                   WHERE {where_sql} AND t.id > ?
+                   ORDER BY t.id
+                   LIMIT ?
+               )
+               RETURNING id""",
+            (*values, *params, last_id, chunk_size)
+        )
+    return [row['id'] for row in rows]
+
+
+def apply_bulk_approval(request) -> Dict:
+    """
+    Set the approval status of every row matching the request filter.
+
+    Rows are updated in id order, chunk_size rows per transaction, so the
+    write lock is released between chunks and fetchers can write in between.
+    With dry_run only the matching rows are counted. Raises ValueError when
+    feed_id is combined with more than one content type.
+    """
+    content_types = request.content_types or list(BULK_SOURCES)
+    if request.feed_id is not None and len(content_types) != 1:
+        raise ValueError("feed_id needs exactly one content type")
+
+    values = (request.status, request.approved_by, datetime.utcnow().isoformat(), request.approval_notes)
+    chunk_size = get_chunk_size()
+    counts = {}
+    transactions = 0
+
+    for content_type in content_types:
+        table = BULK_SOURCES[content_type]['table']
+        built = build_filter(content_type, request)
+        if built is None:
+            counts[content_type] = 0
+            continue
+        where_sql, params = built
+
+        if request.dry_run:
+            row = fetch_one(f"SELECT COUNT(*) AS count FROM {table} t WHERE {where_sql}", tuple(params))
+            counts[content_type] = row['count'] if row else 0
+            continue
+
+        updated = 0
+        last_id = 0
+        while True:
+            ids = _update_chunk(table, where_sql, params, last_id, chunk_size, values)
+            transactions += 1
+            if not ids:
+                break
+            updated += len(ids)
+            last_id = max(ids)
+            # Give threads waiting for the write lock a chance to take it
+            time.sleep(0)
+        counts[content_type] = updated
+
+    return {
+        'status': request.status,
+        'dry_run': request.dry_run,
+        'total': sum(counts.values()),
+        'by_content_type': counts,
+        'transactions': transactions,
+    }
@@ -0,0 +1,210 @@
+import json
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from lib.database import execute_many, fetch_all
+
+PENDING = ('pending', None, None)
+
+# Content the translation worker detects languages for: its table and the
+# columns passed as rule text at ingest. source_name is read from
+# content_queue, which holds the same display name the fetchers pass.
+DETECTED_LANGUAGE_SOURCES = {
+    'lead': {'table': 'leads', 'texts': ('title', 'summary', 'content')},
+    'instagram_post': {'table': 'instagram_posts', 'texts': ('caption',)},
+}
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def parse_keywords(raw: Optional[str]) -> List[str]:
+    """Keywords are stored as a JSON list; empty entries are dropped."""
+    if not raw:
+        return []
+    try:
+        values = json.loads(raw)
+    except ValueError:
+        return []
+    if not isinstance(values, list):
+        return []
+    return [str(value).strip() for value in values if str(value).strip()]
+
+
+class CompiledRule:
+    """One approval_rules row with its keywords and pattern compiled."""
+
+    def __init__(self, row: Dict):
+        self.id = row["id"]
+        self.name = row["name"]
+        self.action = row["action"]
+        self.content_type = row.get("content_type") or None
+        self.source_name = _normalize(row.get("source_name")) or None
+        self.country = _normalize(row.get("country")) or None
+        self.language = _normalize(row.get("language")) or None
+
+        keywords = parse_keywords(row.get("keywords"))
+        self.keywords = (
+            # Lookarounds instead of \b so keywords such as @handle, #tag or
+            # c++ that start or end with a non-word character still match
+            re.compile(r"(?<!\w)(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")(?!\w)",
+                       re.IGNORECASE)
+            if keywords else None
+        )
+        self.pattern = re.compile(row["pattern"], re.IGNORECASE) if row.get("pattern") else None
+
+    def matches(self, content_type: str, source_name: str, country: str, language: str, text: str) -> bool:
+        """Every condition the rule sets must hold; unset conditions match anything."""
+        if self.language and self.language != language:
+            return False
+        return self.matches_except_language(content_type, source_name, country, text)
+
+    def matches_except_language(self, content_type: str, source_name: str, country: str, text: str) -> bool:
+        if self.content_type and self.content_type != content_type:
+            return False
+        if self.source_name and self.source_name != source_name:
+            return False
+        if self.country and self.country != country:
+            return False
+        if self.keywords and not self.keywords.search(text):
+            return False
+        if self.pattern and not self.pattern.search(text):
+            return False
+        return True
+
+
+class ApprovalRules:
+    """
+    The active approval rules, compiled once, in evaluation order.
+
+    Rules are tried by priority (highest first, then id) and the first match
+    sets the status; content no rule matches stays pending.
+
+    Content stored before its language is detected also stays pending when a
+    rule with a language condition, whose other conditions hold, comes before
+    any match: a lower-priority rule must not take the row before the
+    language is known. apply_rules_after_detection decides such rows.
+    """
+
+    def __init__(self, rules: List[CompiledRule]):
+        self.rules = rules
+
+    def evaluate(
+        self,
+        content_type: str,
+        source_name: Optional[str] = None,
+        country: Optional[str] = None,
+        language: Optional[str] = None,
+        texts: Tuple[Optional[str], ...] = (),
+        language_final: bool = False,
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        Return (approval_status, approved_by, approved_at) for a row.
+
+        Without a language and with language_final False, the language is
+        taken to be detected later, so a language rule that could still
+        match leaves the row pending. Pass language_final=True once
+        detection has run, even if it found nothing.
+        """
+        if not self.rules:
+            return PENDING
+        text = "\n".join(value for value in texts if value)
+        source_name, country, language = _normalize(source_name), _normalize(country), _normalize(language)
+        for rule in self.rules:
+            if rule.matches(content_type, source_name, country, language, text):
+                return rule.action, f"rule:{rule.name}", datetime.utcnow().isoformat()
+            if (rule.language and not language and not language_final
+                    and rule.matches_except_language(content_type, source_name, country, text)):
+                return PENDING
+        return PENDING
+
+    @property
+    def has_language_rules(self) -> bool:
+        return any(rule.language for rule in self.rules)
+
+
+_rules: Optional[ApprovalRules] = None
+_rules_lock = threading.Lock()
+
+
+def load_approval_rules() -> ApprovalRules:
+    rows = fetch_all(
+        "SELECT * FROM approval_rules WHERE is_active = 1 ORDER BY priority DESC, id"
+    )
+    compiled = []
+    for row in rows:
+        try:
+            compiled.append(CompiledRule(row))
+        except re.error as e:
+            # Patterns are validated on save; skip one broken by a manual edit
+            print(f"⚠️  Skipping approval rule {row['id']}: {e}")
+    return ApprovalRules(compiled)
+
+
+def get_approval_rules() -> ApprovalRules:
+    """The compiled rules, loaded on first use and after every rule change."""
+    global _rules
+    with _rules_lock:
+        if _rules is None:
+            _rules = load_approval_rules()
+        return _rules
+
+
+def invalidate_approval_rules() -> None:
+    global _rules
+    with _rules_lock:
+        _rules = None
+
+
+def apply_rules_after_detection(content_type: str, ids: List[int]) -> int:
+    """
+    Evaluate the rules again for rows whose language detection just ran.
+
+    Most rows reach the fetchers' rule check without a language (Instagram
+    posts always, leads unless the feed language profile supplied one), so
+    language conditions cannot match there and rows a language rule might
+    take are left pending (see ApprovalRules). Once the translation worker
+    has run detection, every rule is tried again, with the language now
+    final, on the rows still pending with approved_by IS NULL, i.e. the ones
+    no rule decided at ingest and nobody has reviewed. Returns rows updated.
+    """
+    source = DETECTED_LANGUAGE_SOURCES.get(content_type)
+    if not source or not ids:
+        return 0
+    rules = get_approval_rules()
+    # Without language rules nothing was left undecided at ingest
+    if not rules.has_language_rules:
+        return 0
+
+    table = source['table']
+    placeholders = ", ".join("?" for _ in ids)
+    rows = fetch_all(
+        f"""SELECT t.id, t.country, t.detected_language, q.source_name,
+                   {", ".join(f"t.{column}" for column in source['texts'])}
+            FROM {table} t
+            JOIN content_queue q ON q.content_type = ? AND q.content_id = t.id
+            WHERE t.id IN ({placeholders})
+              AND t.approval_status = 'pending' AND t.approved_by IS NULL""",
+        (content_type, *ids)
+    )
+    updates = []
+    for row in rows:
+        status, approved_by, approved_at = rules.evaluate(
+            content_type, row['source_name'], row['country'], row['detected_language'],
+            tuple(row[column] for column in source['texts']),
+            language_final=True,
+        )
+        if approved_by:
+            updates.append((status, approved_by, approved_at, row['id']))
+    if updates:
+        # Re-check the status so a review made since the SELECT is kept
+        execute_many(
+            f"""UPDATE {table}
+               SET approval_status = ?, approved_by = ?, approved_at = ?
+               WHERE id = ? AND approval_status = 'pending' AND approved_by IS NULL""",
+            updates
+        )
+    return len(updates)
@@ -3,11 +3,12 @@ import os
 import random
 import time
 from datetime import datetime, timedelta, timezone
-from threading import Thread
+from threading import Lock, Thread
 from typing import Dict, List, Optional
 
 from lib.database import execute_many, execute_query, fetch_all, fetch_one
-from features.feeds.service.fetcher import fetch_feed
+from lib.concurrency import run_with_host_limits
+from features.feeds.service.fetcher import feed_host, fetch_feed, get_fetch_concurrency
 from features.instagram_feeds.service.fetcher import fetch_instagram_feed
 from features.youtube_feeds.service.fetcher import fetch_youtube_feed
 from features.el_comercio_feeds.service.fetcher import fetch_el_comercio_feed
@@ -286,6 +287,129 @@ def start_batch_fetch_job(job_id: int, force: bool = False) -> None:
     thread.start()
 
 
+class _JobProgress:
+    """Step counters shared by the threads working on one job."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.completed_steps = 0
+        self.success_steps = 0
+        self.failed_steps = 0
+        self.skipped_steps = 0
+        self._lock = Lock()
+
+    def record(self, step_status: str) -> None:
+        with self._lock:
+            if step_status == "failed":
+                self.failed_steps += 1
+            elif step_status == "skipped":
+                self.skipped_steps += 1
+            else:
+                self.success_steps += 1
+            self.completed_steps += 1
+            _update_job(
+                self.job_id,
+                completed_steps=self.completed_steps,
+                success_steps=self.success_steps,
+                failed_steps=self.failed_steps,
+                skipped_steps=self.skipped_steps,
+            )
+
+
+def _check_step(step: dict, force: bool, skip_hours: int) -> tuple[Optional[str], Optional[str]]:
+    """Return (status, reason) when a step must not run, else (None, None)."""
+    source_type = step["source_type"]
+    feed_state = _get_feed_state(source_type, step.get("source_id"))
+    if feed_state is None and source_type not in ("el_comercio", "diario_correo"):
+        return "failed", "Source not found."
+    if feed_state and feed_state.get("is_active") == 0:
+        return "skipped", "Feed is inactive."
+    if feed_state and not force:
+        should_skip, reason = _should_skip(feed_state.get("last_fetched"), skip_hours)
+        if should_skip:
+            return "skipped", reason
+    return None, None
+
+
+def _run_step(job_id: int, step: dict, progress: _JobProgress) -> None:
+    step_id = step["id"]
+    source_type = step["source_type"]
+    source_id = step.get("source_id")
+
+    _update_job(job_id, message=f"Processing {_format_step_label(step)}")
+    _update_step(step_id, status="running", started_at=datetime.utcnow().isoformat())
+
+    result: Optional[Dict] = None
+    error_message = None
+    step_status = "success"
+
+    try:
+        if source_type == "rss":
+            result = fetch_feed(int(source_id))
+        elif source_type == "instagram":
+            result = fetch_instagram_feed(int(source_id))
+        elif source_type == "youtube":
+            result = fetch_youtube_feed(int(source_id))
+        elif source_type == "el_comercio":
+            result = fetch_el_comercio_feed(int(source_id))
+        elif source_type == "diario_correo":
+            result = fetch_diario_correo_feed(int(source_id))
+        else:
+            raise ValueError(f"Unsupported source type: {source_type}")
+
+        if result and str(result.get("status", "")).upper() == "FAILED":
+            step_status = "failed"
+            error_message = result.get("error_message")
+        else:
+            step_status = "success"
+            error_message = result.get("error_message") if result else None
+
+    except Exception as exc:
+        step_status = "failed"
+        error_message = str(exc)
+
+    _update_step(
+        step_id,
+        status=step_status,
+        finished_at=datetime.utcnow().isoformat(),
+        result_json=json.dumps(result) if result is not None else None,
+        error_message=error_message,
+    )
+    progress.record(step_status)
+
+
+def _run_rss_steps(job_id: int, steps: List[dict], progress: _JobProgress) -> None:
+    """Fetch RSS steps concurrently, capped globally and per feed host."""
+    if not steps:
+        return
+    feed_ids = [int(step["source_id"]) for step in steps]
+    placeholders = ", ".join("?" for _ in feed_ids)
+    urls = {
+        row["id"]: row["url"]
+        for row in fetch_all(f"SELECT id, url FROM feeds WHERE id IN ({placeholders})", tuple(feed_ids))
+    }
+    max_workers, per_host_limit = get_fetch_concurrency()
+
+    outcomes = run_with_host_limits(
+        steps,
+        host_of=lambda step: feed_host(urls.get(int(step["source_id"]))),
+        work=lambda step: _run_step(job_id, step, progress),
+        max_workers=max_workers,
+        per_host_limit=per_host_limit,
+    )
+    for step, _, error in outcomes:
+        if error is not None:
+            # _run_step handles fetch errors itself; this only fires when the
+            # step bookkeeping failed, so record the step as failed here.
+            _update_step(
+                step["id"],
+                status="failed",
+                finished_at=datetime.utcnow().isoformat(),
+                error_message=str(error),
+            )
+            progress.record("failed")
+
+
 def _run_batch_fetch_job(job_id: int, force: bool = False) -> None:
     started_at = datetime.utcnow().isoformat()
     _update_job(job_id, status="running", started_at=started_at, message="Starting batch fetch")
@@ -311,140 +435,40 @@ def _run_batch_fetch_job(job_id: int, force: bool = False) -> None:
     skip_hours = _get_skip_hours()
     delay_min, delay_max = _get_instagram_delay_range()
 
-    completed_steps = 0
-    success_steps = 0
-    failed_steps = 0
-    skipped_steps = 0
+    progress = _JobProgress(job_id)
     instagram_calls = 0
 
     try:
+        rss_steps: List[dict] = []
+        other_steps: List[dict] = []
         for step in steps:
-            step_id = step["id"]
-            source_type = step["source_type"]
-            source_id = step.get("source_id")
-            label = _format_step_label(step)
-
-            _update_job(job_id, message=f"Processing {label}")
-            _update_step(step_id, status="running", started_at=datetime.utcnow().isoformat())
-
-            feed_state = _get_feed_state(source_type, source_id)
-            if feed_state is None and source_type not in ("el_comercio", "diario_correo"):
-                error_message = "Source not found."
-                _update_step(
-                    step_id,
-                    status="failed",
-                    finished_at=datetime.utcnow().isoformat(),
-                    error_message=error_message,
-                )
-                failed_steps += 1
-                completed_steps += 1
-                _update_job(
-                    job_id,
-                    completed_steps=completed_steps,
-                    success_steps=success_steps,
-                    failed_steps=failed_steps,
-                    skipped_steps=skipped_steps,
-                )
-                continue
-
-            if feed_state and feed_state.get("is_active") == 0:
-                _update_step(
-                    step_id,
-                    status="skipped",
-                    finished_at=datetime.utcnow().isoformat(),
-                    skip_reason="Feed is inactive.",
-                )
-                skipped_steps += 1
-                completed_steps += 1
-                _update_job(
-                    job_id,
-                    completed_steps=completed_steps,
-                    success_steps=success_steps,
-                    failed_steps=failed_steps,
-                    skipped_steps=skipped_steps,
-                )
-                continue
-
-            if feed_state and not force:
-                should_skip, reason = _should_skip(feed_state.get("last_fetched"), skip_hours)
-                if should_skip:
-                    _update_step(
-                        step_id,
-                        status="skipped",
-                        finished_at=datetime.utcnow().isoformat(),
-                        skip_reason=reason,
-                    )
-                    skipped_steps += 1
-                    completed_steps += 1
-                    _update_job(
-                        job_id,
-                        completed_steps=completed_steps,
-                        success_steps=success_steps,
-                        failed_steps=failed_steps,
-                        skipped_steps=skipped_steps,
-                    )
-                    continue
-
-            if source_type == "instagram" and instagram_calls > 0:
-                delay_seconds = random.uniform(delay_min, delay_max)
-                if delay_seconds > 0:
-                    time.sleep(delay_seconds)
-
-            result: Optional[Dict] = None
-            error_message = None
-            step_status = "success"
-
-            try:
-                if source_type == "rss":
-                    result = fetch_feed(int(source_id))
-                elif source_type == "instagram":
-                    instagram_calls += 1
-                    result = fetch_instagram_feed(int(source_id))
-                elif source_type == "youtube":
-                    result = fetch_youtube_feed(int(source_id))
-                elif source_type == "el_comercio":
-                    result = fetch_el_comercio_feed(int(source_id))
-                elif source_type == "diario_correo":
-                    result = fetch_diario_correo_feed(int(source_id))
+            status, reason = _check_step(step, force, skip_hours)
+            if status is None:
+                if step["source_type"] == "rss":
+                    rss_steps.append(step)
                 else:
-                    raise ValueError(f"Unsupported source type: {source_type}")
-
-                if result and str(result.get("status", "")).upper() == "FAILED":
-                    step_status = "failed"
-                    error_message = result.get("error_message")
-                else:
-                    step_status = "success"
-                    error_message = result.get("error_message") if result else None
-
-            except Exception as exc:
-                step_status = "failed"
-                error_message = str(exc)
-
-            if step_status == "failed":
-                failed_steps += 1
+                    other_steps.append(step)
+                continue
+            now = datetime.utcnow().isoformat()
+            if status == "failed":
+                _update_step(step["id"], status="failed", started_at=now, finished_at=now, error_message=reason)
             else:
-                success_steps += 1
+                _update_step(step["id"], status="skipped", started_at=now, finished_at=now, skip_reason=reason)
+            progress.record(status)
 
-            completed_steps += 1
+        _run_rss_steps(job_id, rss_steps, progress)
 
-            _update_step(
-                step_id,
-                status=step_status,
-                finished_at=datetime.utcnow().isoformat(),
-                result_json=json.dumps(result) if result is not None else None,
-                error_message=error_message,
-            )
-
-            _update_job(
-                job_id,
-                completed_steps=completed_steps,
-                success_steps=success_steps,
-                failed_steps=failed_steps,
-                skipped_steps=skipped_steps,
-            )
+        for step in other_steps:
+            if step["source_type"] == "instagram":
+                if instagram_calls > 0:
+                    delay_seconds = random.uniform(delay_min, delay_max)
+                    if delay_seconds > 0:
+                        time.sleep(delay_seconds)
+                instagram_calls += 1
+            _run_step(job_id, step, progress)
 
         finished_at = datetime.utcnow().isoformat()
-        final_status = "completed_with_errors" if failed_steps > 0 else "completed"
+        final_status = "completed_with_errors" if progress.failed_steps > 0 else "completed"
         _update_job(
             job_id,
             status=final_status,
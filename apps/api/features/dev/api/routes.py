@@ -1,5 +1,13 @@
 from fastapi import APIRouter, HTTPException
-from lib.database import execute_query, get_db_connection
+from lib.database import (
+    execute_query,
+    get_db_connection,
+    get_pool_stats,
+    get_query_stats,
+    reset_query_stats,
+)
+from lib.database.counters import rebuild_counters
+from lib.http import get_download_stats, reset_download_stats
 
 router = APIRouter(prefix="/dev", tags=["development"])
 
@@ -145,3 +153,36 @@ def clear_fetched_data():
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/db-stats", status_code=200)
+def get_db_stats():
+    """Report SQLite connection pool and query statistics."""
+    return {"pool": get_pool_stats(), "queries": get_query_stats()}
+
+
+@router.delete("/db-stats", status_code=200)
+def clear_db_stats():
+    """Reset query statistics."""
+    reset_query_stats()
+    return {"message": "Query statistics reset"}
+
+
+@router.get("/http-stats", status_code=200)
+def get_http_stats():
+    """Report feed download counts, bytes and timings."""
+    return get_download_stats()
+
+
+@router.delete("/http-stats", status_code=200)
+def clear_http_stats():
+    """Reset feed download statistics."""
+    reset_download_stats()
+    return {"message": "Download statistics reset"}
+
+
+@router.post("/counters/rebuild", status_code=200)
+def rebuild_content_counters():
+    """Recount approval and translation statuses from the content tables."""
+    corrected = rebuild_counters()
+    return {"message": "Content counters rebuilt", "corrected": corrected}
@@ -7,7 +7,6 @@ Handles scraping orchestration, translation, and database operations.
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-import sqlite3
 import subprocess
 import json
 import sys
@@ -15,11 +14,12 @@ import re
 import urllib.parse
 import requests
 
+from features.approval.service.rules import get_approval_rules
 from features.translation.service.translator import get_translator
+from lib.database import execute_many, execute_query, fetch_all, fetch_one, transaction
 
 DEFAULT_COUNTRY = "Peru"
 
-DATABASE_PATH = Path(__file__).parent.parent.parent.parent / "leads.db"
 FUSION_CONTENT_CACHE_PATTERN = re.compile(
     r"Fusion\.contentCache=({.*?});(?:\s*Fusion\.|\s*$)",
     re.S,
@@ -27,37 +27,6 @@ FUSION_CONTENT_CACHE_PATTERN = re.compile(
 DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; LeadsManager/1.0)"
 
 
-def fetch_one(query: str, params: tuple) -> dict | None:
-    """Helper to fetch one row from database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    result = cursor.execute(query, params).fetchone()
-    conn.close()
-    return dict(result) if result else None
-
-
-def fetch_all(query: str, params: tuple) -> list:
-    """Helper to fetch all rows from database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    results = cursor.execute(query, params).fetchall()
-    conn.close()
-    return [dict(row) for row in results]
-
-
-def execute_query(query: str, params: tuple) -> int:
-    """Helper to execute query and return lastrowid."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    lastrowid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return lastrowid
-
-
 def fetch_html(url: str) -> str:
     """Fetch raw HTML for a page using a stable user-agent."""
     try:
@@ -258,76 +227,82 @@ def fetch_diario_correo_feed(feed_id: int) -> Dict:
         if not scraped_items:
             scraped_items = fetch_items_via_html(feed["url"], feed.get("section") or "gastronomia")
 
-        post_count = 0
         errors = []
+        rows = []
+        seen_urls = set()
         translator = get_translator()
+        rules = get_approval_rules()
 
         if not scraped_items:
             errors.append("No items scraped; check the source HTML or scraper settings.")
 
-        execute_query(
-            "DELETE FROM diario_correo_posts WHERE diario_correo_feed_id = ?",
-            (feed_id,)
-        )
-
+        articles = []
         for article in scraped_items[:15]:
-            try:
-                if not article.get("url") or not article.get("title"):
-                    errors.append("Skipping article - missing URL or title")
-                    continue
-
-                title_translated = None
-                excerpt_translated = None
-                detected_language = "es"
-                translation_status = "pending"
-                translated_at = None
-
-                if article.get("title"):
-                    title_translated, trans_status = translator.translate_text(
-                        article["title"], source="es", target="en"
-                    )
-                    if trans_status == "translated":
-                        translation_status = "translated"
-                        translated_at = datetime.utcnow().isoformat()
-
-                if article.get("excerpt"):
-                    excerpt_translated, _ = translator.translate_text(
-                        article["excerpt"], source="es", target="en"
-                    )
-
-                execute_query(
-                    """INSERT INTO diario_correo_posts
-                       (diario_correo_feed_id, url, title, published_at, section,
-                        country, image_url, excerpt, language, source, approval_status,
-                        title_translated, excerpt_translated, detected_language,
-                        translation_status, translated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?, ?)""",
-                    (
-                        feed_id,
-                        article["url"],
-                        article["title"],
-                        article.get("published_at"),
-                        article.get("section") or feed.get("section"),
-                        DEFAULT_COUNTRY,
-                        article.get("image_url"),
-                        article.get("excerpt"),
-                        "es",
-                        "diariocorreo",
-                        title_translated,
-                        excerpt_translated,
-                        detected_language,
-                        translation_status,
-                        translated_at,
-                    )
+            if not article.get("url") or not article.get("title"):
+                errors.append("Skipping article - missing URL or title")
+                continue
+            if article["url"] in seen_urls:
+                errors.append(f"Skipping article {article['url']} - duplicate URL")
+                continue
+            seen_urls.add(article["url"])
+            articles.append(article)
+
+        # Translate every title and excerpt in batched requests
+        titles = translator.translate_texts([a["title"] for a in articles], source="es", target="en")
+        excerpts = translator.translate_texts([a.get("excerpt") or "" for a in articles], source="es", target="en")
+
+        for article, (title_translated, title_status), (excerpt_translated, _) in zip(articles, titles, excerpts):
+            translation_status = "pending"
+            translated_at = None
+            if title_status == "translated":
+                translation_status = "translated"
+                translated_at = datetime.utcnow().isoformat()
+
+            approval = rules.evaluate(
+                "diario_correo_post", feed.get("display_name"), DEFAULT_COUNTRY, "es",
+                (article["title"], article.get("excerpt"), title_translated, excerpt_translated)
+            )
+            rows.append(
+                (
+                    feed_id,
+                    article["url"],
+                    article["title"],
+                    article.get("published_at"),
+                    article.get("section") or feed.get("section"),
+                    DEFAULT_COUNTRY,
+                    article.get("image_url"),
+                    article.get("excerpt"),
+                    "es",
+                    "diariocorreo",
+                    *approval,
+                    title_translated,
+                    excerpt_translated,
+                    "es",
+                    translation_status,
+                    translated_at,
                 )
-                post_count += 1
-            except Exception as e:
-                errors.append(f"Article {article.get('url', 'unknown')}: {str(e)}")
-
-        execute_query(
-            "UPDATE diario_correo_feeds SET last_fetched = ? WHERE id = ?",
-            (datetime.utcnow().isoformat(), feed_id)
-        )
+            )
+
+        with transaction():
+            execute_query(
+                "DELETE FROM diario_correo_posts WHERE diario_correo_feed_id = ?",
+                (feed_id,)
+            )
+            # A URL already stored under another feed is skipped instead of
+            # aborting the swap; post_count counts the rows actually inserted
+            post_count = execute_many(
+                """INSERT OR IGNORE INTO diario_correo_posts
+                   (diario_correo_feed_id, url, title, published_at, section,
+                    country, image_url, excerpt, language, source, approval_status, approved_by, approved_at,
+                    title_translated, excerpt_translated, detected_language,
+                    translation_status, translated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            execute_query(
+                "UPDATE diario_correo_feeds SET last_fetched = ? WHERE id = ?",
+                (datetime.utcnow().isoformat(), feed_id)
+            )
 
         status = "SUCCESS" if post_count == 15 else "PARTIAL" if post_count > 0 else "FAILED"
         error_message = "; ".join(errors) if errors else None
@@ -2,7 +2,7 @@
 FastAPI routes for El Comercio feeds.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional, Dict
 
 from features.el_comercio_feeds.schema.models import (
@@ -15,9 +15,19 @@ from features.el_comercio_feeds.service.fetcher import (
     fetch_all,
     execute_query
 )
+from lib.pagination import (
+    decode_cursor,
+    keyset_condition,
+    keyset_order,
+    paginate,
+    set_next_cursor,
+)
 
 router = APIRouter(prefix="/el-comercio-feeds", tags=["el-comercio-feeds"])
 
+# Keyset sort for /posts, backed by idx_el_comercio_posts_keyset
+POST_SORT = "COALESCE(published_at, '')"
+
 DEFAULT_CATEGORY_NAME = "Peru"
 DEFAULT_FEED_URL = "https://elcomercio.pe/archivo/gastronomia/"
 DEFAULT_DISPLAY_NAME = "El Comercio Gastronomia"
@@ -61,12 +71,14 @@ def ensure_feed() -> dict:
 
 @router.get("/posts", response_model=List[ElComercioPostResponse])
 def get_posts(
+    response: Response,
     search: Optional[str] = Query(None),
     el_comercio_feed_id: Optional[int] = Query(None),
     approval_status: Optional[str] = Query(None),
     country: Optional[str] = Query(None),
     limit: Optional[int] = Query(15, ge=1, le=1000),
-    offset: Optional[int] = Query(0, ge=0)
+    offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
 ):
     """
     Get El Comercio posts with filters.
@@ -76,7 +88,8 @@ def get_posts(
         el_comercio_feed_id: Filter by feed ID
         approval_status: Filter by approval status (pending, approved, rejected)
         limit: Max results (default 15, max 1000)
-        offset: Pagination offset
+        offset: Pagination offset (legacy; prefer cursor)
+        cursor: X-Next-Cursor header from the previous page
     """
     query = """
         SELECT * FROM el_comercio_posts
@@ -101,10 +114,24 @@ def get_posts(
         query += " AND country = ?"
         params.append(country)
 
-    query += " ORDER BY published_at DESC LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
-
-    posts = fetch_all(query, tuple(params))
+    if cursor:
+        try:
+            sort_value, last_id = decode_cursor(cursor, "published_at", 2)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        condition, condition_params = keyset_condition(POST_SORT, "id", sort_value, last_id)
+        query += f" AND {condition}"
+        params.extend(condition_params)
+        offset = 0
+
+    query += f" ORDER BY {keyset_order(POST_SORT, 'id')} LIMIT ? OFFSET ?"
+    params.extend([limit + 1, offset])
+
+    posts, next_cursor = paginate(
+        fetch_all(query, tuple(params)), limit, "published_at",
+        lambda row: (row["published_at"] or "", row["id"])
+    )
+    set_next_cursor(response, next_cursor)
     return [ElComercioPostResponse(**p) for p in posts]
 
 
@@ -7,49 +7,17 @@ Handles scraping orchestration, translation, and database operations.
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
-import sqlite3
 import subprocess
 import json
 import sys
 import os
 
+from features.approval.service.rules import get_approval_rules
 from features.translation.service.translator import get_translator
+from lib.database import execute_many, execute_query, fetch_all, fetch_one, transaction
 
 DEFAULT_COUNTRY = "Peru"
 
-DATABASE_PATH = Path(__file__).parent.parent.parent.parent / "leads.db"
-
-
-def fetch_one(query: str, params: tuple) -> dict | None:
-    """Helper to fetch one row from database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    result = cursor.execute(query, params).fetchone()
-    conn.close()
-    return dict(result) if result else None
-
-
-def fetch_all(query: str, params: tuple) -> list:
-    """Helper to fetch all rows from database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    results = cursor.execute(query, params).fetchall()
-    conn.close()
-    return [dict(row) for row in results]
-
-
-def execute_query(query: str, params: tuple) -> int:
-    """Helper to execute query and return lastrowid."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    lastrowid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return lastrowid
-
 
 def run_spider() -> List[Dict]:
     """
@@ -115,69 +83,73 @@ def fetch_el_comercio_feed(feed_id: int) -> Dict:
         # Run spider to scrape articles
         scraped_items = run_spider()
 
-        post_count = 0
         errors = []
+        rows = []
+        seen_urls = set()
         translator = get_translator()
+        rules = get_approval_rules()
 
-        # DELETE all existing posts for this feed
-        execute_query(
-            "DELETE FROM el_comercio_posts WHERE el_comercio_feed_id = ?",
-            (feed_id,)
-        )
-
-        # INSERT fresh articles (limit to 15)
+        # Keep valid fresh articles (limit to 15) before touching the database
+        articles = []
         for article in scraped_items[:15]:
-            try:
-                # Skip if missing required fields
-                if not article.get('url') or not article.get('title'):
-                    errors.append(f"Skipping article - missing URL or title")
-                    continue
-
-                # Auto-translate title and excerpt
-                title_translated = None
-                excerpt_translated = None
-                detected_language = 'es'
-                translation_status = 'pending'
-                translated_at = None
-
-                if article.get('title'):
-                    title_translated, trans_status = translator.translate_text(
-                        article['title'], source='es', target='en'
-                    )
-                    if trans_status == 'translated':
-                        translation_status = 'translated'
-                        translated_at = datetime.utcnow().isoformat()
-
-                if article.get('excerpt'):
-                    excerpt_translated, _ = translator.translate_text(
-                        article['excerpt'], source='es', target='en'
-                    )
-
-                # Insert article with translation and approval fields
-                execute_query(
-                    """INSERT INTO el_comercio_posts
-                       (el_comercio_feed_id, url, title, published_at, section,
-                        country, image_url, excerpt, language, source, approval_status,
-                        title_translated, excerpt_translated, detected_language,
-                        translation_status, translated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?, ?)""",
-                    (feed_id, article['url'], article['title'],
-                     article.get('published_at'), 'gastronomia',
-                     DEFAULT_COUNTRY, article.get('image_url'), article.get('excerpt'),
-                     'es', 'elcomercio',
-                     title_translated, excerpt_translated, detected_language,
-                     translation_status, translated_at)
-                )
-                post_count += 1
-
-            except Exception as e:
-                errors.append(f"Article {article.get('url', 'unknown')}: {str(e)}")
-
-        # Update feed metadata
-        execute_query(
-            "UPDATE el_comercio_feeds SET last_fetched = ? WHERE id = ?",
-            (datetime.utcnow().isoformat(), feed_id)
-        )
+            # Skip if missing required fields
+            if not article.get('url') or not article.get('title'):
+                errors.append(f"Skipping article - missing URL or title")
+                continue
+            if article['url'] in seen_urls:
+                errors.append(f"Skipping article {article['url']} - duplicate URL")
+                continue
+            seen_urls.add(article['url'])
+            articles.append(article)
+
+        # Translate every title and excerpt in batched requests
+        titles = translator.translate_texts([a['title'] for a in articles], source='es', target='en')
+        excerpts = translator.translate_texts([a.get('excerpt') or '' for a in articles], source='es', target='en')
+
+        for article, (title_translated, title_status), (excerpt_translated, _) in zip(articles, titles, excerpts):
+            translation_status = 'pending'
+            translated_at = None
+            if title_status == 'translated':
+                translation_status = 'translated'
+                translated_at = datetime.utcnow().isoformat()
+
+            approval = rules.evaluate(
+                'el_comercio_post', feed.get('display_name'), DEFAULT_COUNTRY, 'es',
+                (article['title'], article.get('excerpt'), title_translated, excerpt_translated)
+            )
+            rows.append(
+                (feed_id, article['url'], article['title'],
+                 article.get('published_at'), 'gastronomia',
+                 DEFAULT_COUNTRY, article.get('image_url'), article.get('excerpt'),
+                 'es', 'elcomercio', *approval,
+                 title_translated, excerpt_translated, 'es',
+                 translation_status, translated_at)
+            )
+
+        # Swap the feed's posts atomically: DELETE existing, INSERT fresh
+        with transaction():
+            execute_query(
+                "DELETE FROM el_comercio_posts WHERE el_comercio_feed_id = ?",
+                (feed_id,)
+            )
+            # Insert articles with translation and approval fields
+            # A URL already stored under another feed is skipped instead of
+            # aborting the swap; post_count counts the rows actually inserted
+            post_count = execute_many(
+                """INSERT OR IGNORE INTO el_comercio_posts
+                   (el_comercio_feed_id, url, title, published_at, section,
+                    country, image_url, excerpt, language, source, approval_status, approved_by, approved_at,
+                    title_translated, excerpt_translated, detected_language,
+                    translation_status, translated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+
+            # Update feed metadata
+            execute_query(
+                "UPDATE el_comercio_feeds SET last_fetched = ? WHERE id = ?",
+                (datetime.utcnow().isoformat(), feed_id)
+            )
 
         # Create fetch log
         status = "SUCCESS" if post_count == 15 else "PARTIAL" if post_count > 0 else "FAILED"
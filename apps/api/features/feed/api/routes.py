@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Query
 
 from features.feed.schema.models import FeedResponse
 from features.feed.service.parser import parse_feed
+from lib.http import FeedDownloadError
 from utils.validation import InvalidUrlError, validate_feed_url
 
 router = APIRouter(prefix="/feed", tags=["feed"])
@@ -14,4 +15,7 @@ def get_feed(url: str = Query(..., description="Feed URL to parse")) -> FeedResp
     except InvalidUrlError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    return parse_feed(validated_url)
+    try:
+        return parse_feed(validated_url)
+    except FeedDownloadError as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
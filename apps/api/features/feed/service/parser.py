@@ -1,10 +1,12 @@
-from typing import Optional
+import hashlib
+from typing import Dict, Optional
 from urllib.parse import urljoin
 
 import feedparser
 
 from features.feed.schema.models import FeedEntry, FeedMeta, FeedResponse
 from lib.dates import to_isoformat
+from lib.http import download
 from utils.html_cleaning import extract_first_image_url
 
 
@@ -72,9 +74,70 @@ def _entry_image(entry) -> Optional[str]:
     return None
 
 
+def download_feed(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict:
+    """
+    Download a feed document with a conditional GET.
+
+    Sends If-None-Match / If-Modified-Since when validators from a previous
+    fetch are given. Returns a dict with not_modified, content (None on 304),
+    content_hash, the response headers and final url, and the
+    etag/last_modified to store for the next fetch.
+
+    Raises:
+        FeedDownloadError: if the download fails or exceeds the limits in lib.http.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = download(url, headers=headers)
+    if response["status_code"] == 304:
+        return {
+            "not_modified": True,
+            "content": None,
+            "content_hash": None,
+            # Servers may omit validators on 304; keep the ones we sent.
+            "etag": response["headers"].get("etag") or etag,
+            "last_modified": response["headers"].get("last-modified") or last_modified,
+            "headers": response["headers"],
+            "url": response["url"],
+        }
+
+    content = response["content"]
+    return {
+        "not_modified": False,
+        "content": content,
+        "content_hash": hashlib.sha256(content).hexdigest(),
+        "etag": response["headers"].get("etag"),
+        "last_modified": response["headers"].get("last-modified"),
+        "headers": response["headers"],
+        "url": response["url"],
+    }
+
+
+def parse_feed_content(content: bytes, url: Optional[str] = None,
+                       headers: Optional[Dict[str, str]] = None) -> FeedResponse:
+    """
+    Parse an already downloaded feed document.
+
+    Pass the response headers and final URL so encoding detection and relative
+    link/GUID resolution match feedparser fetching the URL itself.
+    """
+    response_headers = dict(headers or {})
+    if url:
+        response_headers.setdefault("content-location", url)
+    return _build_feed_response(feedparser.parse(content, response_headers=response_headers))
+
+
 def parse_feed(url: str) -> FeedResponse:
-    feed = feedparser.parse(url)
+    """Download (through lib.http) and parse a feed."""
+    response = download(url)
+    return parse_feed_content(response["content"], response["url"], response["headers"])
+
 
+def _build_feed_response(feed) -> FeedResponse:
     meta = FeedMeta(
         title=_get_field(feed.feed, "title"),
         link=_get_field(feed.feed, "link"),
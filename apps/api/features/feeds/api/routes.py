@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional, Dict
 
-from features.feeds.schema import FeedCreate, FeedUpdate, FeedResponse
+from features.feeds.schema import FeedCreate, FeedUpdate, FeedResponse, FeedLanguageProfile
 from features.feeds.service.fetcher import fetch_feed, fetch_all_active_feeds
+from features.feeds.service.language_profile import get_feed_language_profile
 from lib.database import fetch_all, fetch_one, execute_query
 
 router = APIRouter(prefix="/feeds", tags=["feeds"])
@@ -109,6 +110,15 @@ def get_feed(feed_id: int) -> FeedResponse:
     return FeedResponse(**result)
 
 
+@router.get("/{feed_id}/language-profile", response_model=FeedLanguageProfile)
+def get_language_profile(feed_id: int) -> FeedLanguageProfile:
+    """Get the language profile used to skip per-entry detection for a feed."""
+    existing = fetch_one("SELECT * FROM feeds WHERE id = ?", (feed_id,))
+    if not existing:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    return FeedLanguageProfile(**get_feed_language_profile(feed_id, existing.get("language")))
+
+
 @router.put("/{feed_id}", response_model=FeedResponse)
 def update_feed(feed_id: int, feed: FeedUpdate) -> FeedResponse:
     """Update a feed."""
@@ -137,6 +147,9 @@ def update_feed(feed_id: int, feed: FeedUpdate) -> FeedResponse:
     if feed.url is not None:
         updates.append("url = ?")
         params.append(feed.url)
+        if feed.url != existing["url"]:
+            # Validators belong to the old document
+            updates.append("etag = NULL, last_modified = NULL, content_hash = NULL")
     if feed.source_name is not None:
         updates.append("source_name = ?")
         params.append(feed.source_name)
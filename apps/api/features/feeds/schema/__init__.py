@@ -1,3 +1,3 @@
-from .models import FeedCreate, FeedUpdate, FeedResponse
+from .models import FeedCreate, FeedUpdate, FeedResponse, FeedLanguageProfile
 
-__all__ = ["FeedCreate", "FeedUpdate", "FeedResponse"]
+__all__ = ["FeedCreate", "FeedUpdate", "FeedResponse", "FeedLanguageProfile"]
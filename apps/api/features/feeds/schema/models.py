@@ -30,8 +30,20 @@ class FeedResponse(BaseModel):
     source_name: str
     website: Optional[str] = None
     country: Optional[str] = None
+    language: Optional[str] = None
     fetch_interval: int
     last_fetched: Optional[str] = None
     is_active: int
     created_at: str
     tags: Optional[List[str]] = []
+
+
+class FeedLanguageProfile(BaseModel):
+    feed_id: int
+    language: Optional[str] = None
+    dominant_language: Optional[str] = None
+    declared_language: Optional[str] = None
+    share: float
+    samples: int
+    confident: bool
+    sample_rate: float
@@ -1,15 +1,160 @@
+import os
 from datetime import datetime
-from typing import Dict, List
-from features.feed.service.parser import parse_feed
-from lib.database import fetch_one, execute_query
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from features.approval.service.rules import ApprovalRules, get_approval_rules
+from features.feed.service.parser import download_feed, parse_feed_content
+from features.feeds.service.language_profile import (
+    assign_languages,
+    get_feed_language_profile,
+    normalize_language,
+)
+from lib.concurrency import run_with_host_limits
+from lib.database import UnitOfWork, execute_query, fetch_all, fetch_one
 from utils.html_cleaning import clean_feed_content
-from features.translation.service.translator import get_translator
+from features.translation.service.worker import notify_translation_worker
+
+
+INSERT_LEAD_SQL = """INSERT OR IGNORE INTO leads
+   (feed_id, guid, title, link, country, author, summary, content, published,
+    detected_language, language_source, translation_status, image_url,
+    approval_status, approved_by, approved_at,
+    title_translated, summary_translated, content_translated, translated_at)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+UPDATE_LEAD_IMAGE_SQL = """UPDATE leads
+   SET image_url = ?
+   WHERE feed_id = ? AND guid = ?
+     AND (image_url IS NULL OR image_url = '')"""
+
+GUID_LOOKUP_CHUNK_SIZE = 500
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_FETCH_PER_HOST_LIMIT = 2
+
+INSERT_FETCH_LOG_SQL = """INSERT INTO fetch_logs
+   (feed_id, status, lead_count, error_message)
+   VALUES (?, ?, ?, ?)"""
+
+UPDATE_FEED_FETCHED_SQL = """UPDATE feeds
+   SET last_fetched = ?, etag = ?, last_modified = ?, content_hash = ?
+   WHERE id = ?"""
+
+UPDATE_FEED_LANGUAGE_SQL = "UPDATE feeds SET language = ? WHERE id = ?"
+
+
+def _partition_entries(feed_id: int, entries: List) -> Tuple[List, List[tuple]]:
+    """
+    Split parsed entries into new entries and image_url backfills.
+
+    Existing GUIDs for the whole entry set are loaded with one indexed query
+    per chunk (see idx_leads_feed_guid) instead of one SELECT per entry.
+    Entries repeating a GUID within the same document are dropped.
+    Returns (new_entries, image_updates).
+    """
+    guids = list({entry.id for entry in entries if entry.id})
+    existing: Dict[str, Optional[str]] = {}
+    for start in range(0, len(guids), GUID_LOOKUP_CHUNK_SIZE):
+        chunk = guids[start:start + GUID_LOOKUP_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = fetch_all(
+            f"SELECT guid, image_url FROM leads WHERE feed_id = ? AND guid IN ({placeholders})",
+            (feed_id, *chunk)
+        )
+        existing.update({row["guid"]: row["image_url"] for row in rows})
+
+    new_entries = []
+    image_updates = []
+    seen = set()
+    for entry in entries:
+        if entry.id and entry.id in seen:
+            continue
+        if entry.id:
+            seen.add(entry.id)
+        if not entry.id or entry.id not in existing:
+            new_entries.append(entry)
+        elif entry.image_url and not existing[entry.id]:
+            image_updates.append((entry.image_url, feed_id, entry.id))
+
+    return new_entries, image_updates
+
+
+def _build_lead_row(
+    feed: Dict,
+    feed_country: str,
+    entry,
+    rules: ApprovalRules,
+    language: Optional[str] = None,
+) -> tuple:
+    """
+    Clean one entry into an INSERT parameter tuple.
+
+    Leads are stored untranslated with translation_status 'pending'; the
+    translation worker detects the language (unless the feed language
+    profile supplied it) and translates them afterwards. The first matching
+    approval rule sets the approval status, otherwise the lead is pending.
+    """
+    # Clean HTML from summary and content before storing
+    clean_summary = clean_feed_content(entry.summary)
+    clean_content = clean_feed_content(entry.content)
+    approval = rules.evaluate(
+        'lead', feed.get("source_name"), feed_country, language,
+        (entry.title, clean_summary, clean_content)
+    )
+
+    return (
+        feed["id"], entry.id, entry.title, entry.link, feed_country, entry.author,
+        clean_summary, clean_content, entry.published,
+        language, 'feed' if language else None, 'pending', entry.image_url, *approval,
+        None, None, None, None,
+    )
+
+
+def _detection_text(entry) -> str:
+    """Text the translation worker detects on (summary > content > title)."""
+    return clean_feed_content(entry.summary) or clean_feed_content(entry.content) or entry.title or ""
+
+
+def _record_not_modified(feed: Dict, download: Dict) -> Dict:
+    """Log an unchanged feed (304 or identical body) without parsing it."""
+    with UnitOfWork() as uow:
+        uow.add(
+            UPDATE_FEED_FETCHED_SQL,
+            (
+                datetime.utcnow().isoformat(),
+                download["etag"],
+                download["last_modified"],
+                download["content_hash"] or feed.get("content_hash"),
+                feed["id"],
+            )
+        )
+        log_id = uow.execute(
+            INSERT_FETCH_LOG_SQL,
+            (feed["id"], "NOT_MODIFIED", 0, None)
+        )
+
+    return {
+        "log_id": log_id,
+        "status": "NOT_MODIFIED",
+        "lead_count": 0,
+        "new_count": 0,
+        "updated_count": 0,
+        "unchanged_count": 0,
+        "error_message": None
+    }
 
 
 def fetch_feed(feed_id: int) -> Dict:
     """
     Fetch RSS feed and create leads.
     Returns a dict with status, lead_count, and error_message.
+
+    The document is requested with the stored ETag/Last-Modified validators;
+    a 304 or a body identical to the last one is logged as NOT_MODIFIED and
+    not parsed. Otherwise all writes for the feed (leads, image backfills,
+    last_fetched and validators, fetch log) are committed as one unit of
+    work. New leads are left 'pending' for the translation worker; when the
+    feed's language profile is confident they get its language up front
+    (except a re-validation sample) so the worker skips detecting them.
     """
     feed = fetch_one("SELECT * FROM feeds WHERE id = ?", (feed_id,))
     if not feed:
@@ -19,111 +164,81 @@ def fetch_feed(feed_id: int) -> Dict:
         raise ValueError("Feed country is required. Set country on the feed before fetching.")
 
     try:
+        download = download_feed(
+            feed["url"],
+            etag=feed.get("etag"),
+            last_modified=feed.get("last_modified")
+        )
+        if download["not_modified"] or download["content_hash"] == feed.get("content_hash"):
+            return _record_not_modified(feed, download)
+
         # Parse the RSS feed
-        feed_data = parse_feed(feed["url"])
+        feed_data = parse_feed_content(download["content"], download["url"], download["headers"])
 
-        # Get translator for language detection
-        translator = get_translator()
+        new_entries, image_updates = _partition_entries(feed_id, feed_data.entries)
+        declared_language = normalize_language(feed_data.feed.language)
+        profile = get_feed_language_profile(feed_id, declared_language) if new_entries else None
 
-        lead_count = 0
+        new_rows = []
         errors = []
+        rules = get_approval_rules()
+
+        languages = assign_languages(
+            profile,
+            [lambda entry=entry: _detection_text(entry) for entry in new_entries]
+        )
 
-        # Create leads from entries
-        for entry in feed_data.entries:
+        for entry, language in zip(new_entries, languages):
             try:
-                # Check if lead already exists
-                existing = fetch_one(
-                    "SELECT id FROM leads WHERE feed_id = ? AND guid = ?",
-                    (feed_id, entry.id)
-                )
-
-                if not existing:
-                    # Clean HTML from summary and content before storing
-                    clean_summary = clean_feed_content(entry.summary)
-                    clean_content = clean_feed_content(entry.content)
-
-                    # Detect language immediately - use longest available text for accuracy
-                    # Prefer summary > content > title (more text = better detection)
-                    text_for_detection = clean_summary or clean_content or entry.title
-                    detected_language = translator.detect_language(text_for_detection)
-
-                    # Auto-translate if not English
-                    title_translated = None
-                    summary_translated = None
-                    content_translated = None
-                    translation_status = 'already_english'
-                    translated_at = None
-
-                    if detected_language and detected_language != 'en':
-                        # Translate title
-                        if entry.title:
-                            title_translated, title_status = translator.translate_text(entry.title, source=detected_language, target='en')
-
-                        # Translate summary
-                        if clean_summary:
-                            summary_translated, summary_status = translator.translate_text(clean_summary, source=detected_language, target='en')
-
-                        # Translate content
-                        if clean_content:
-                            content_translated, content_status = translator.translate_text(clean_content, source=detected_language, target='en')
-
-                        translation_status = 'translated'
-                        translated_at = datetime.utcnow().isoformat()
-
-                    execute_query(
-                        """INSERT INTO leads
-                           (feed_id, guid, title, link, country, author, summary, content, published,
-                            detected_language, translation_status, image_url, approval_status,
-                            title_translated, summary_translated, content_translated, translated_at)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                        (feed_id, entry.id, entry.title, entry.link, feed_country, entry.author,
-                         clean_summary, clean_content, entry.published,
-                         detected_language, translation_status, entry.image_url, 'pending',
-                         title_translated, summary_translated, content_translated, translated_at)
-                    )
-                    lead_count += 1
-                elif entry.image_url:
-                    execute_query(
-                        """UPDATE leads
-                           SET image_url = ?
-                           WHERE feed_id = ? AND guid = ?
-                             AND (image_url IS NULL OR image_url = '')""",
-                        (entry.image_url, feed_id, entry.id)
-                    )
+                new_rows.append(_build_lead_row(feed, feed_country, entry, rules, language))
             except Exception as e:
                 errors.append(f"Entry '{entry.title}': {str(e)}")
 
-        # Update last_fetched timestamp
-        execute_query(
-            "UPDATE feeds SET last_fetched = ? WHERE id = ?",
-            (datetime.utcnow().isoformat(), feed_id)
-        )
-
-        # Create fetch log
         status = "SUCCESS" if not errors else "FAILED"
         error_message = "; ".join(errors) if errors else None
 
-        log_id = execute_query(
-            """INSERT INTO fetch_logs
-               (feed_id, status, lead_count, error_message)
-               VALUES (?, ?, ?, ?)""",
-            (feed_id, status, lead_count, error_message)
-        )
+        # Only remember the validators when every entry was stored, so a
+        # partially failed document is downloaded and retried next time.
+        if errors:
+            validators = (None, None, None)
+        else:
+            validators = (download["etag"], download["last_modified"], download["content_hash"])
+
+        with UnitOfWork() as uow:
+            uow.add_many(INSERT_LEAD_SQL, new_rows)
+            uow.add_many(UPDATE_LEAD_IMAGE_SQL, image_updates)
+            uow.add(
+                UPDATE_FEED_FETCHED_SQL,
+                (datetime.utcnow().isoformat(), *validators, feed_id)
+            )
+            if declared_language != feed.get("language"):
+                uow.add(UPDATE_FEED_LANGUAGE_SQL, (declared_language, feed_id))
+            uow.flush()
+            lead_count = uow.rowcount(INSERT_LEAD_SQL)
+            updated_count = uow.rowcount(UPDATE_LEAD_IMAGE_SQL)
+            log_id = uow.execute(
+                INSERT_FETCH_LOG_SQL,
+                (feed_id, status, lead_count, error_message)
+            )
+
+        if lead_count:
+            notify_translation_worker()
 
         return {
             "log_id": log_id,
             "status": status,
             "lead_count": lead_count,
+            "new_count": lead_count,
+            "updated_count": updated_count,
+            "unchanged_count": len(feed_data.entries) - lead_count - updated_count - len(errors),
             "error_message": error_message
         }
 
     except Exception as e:
-        # Create failed fetch log
+        # The unit of work rolled back; record the failure on its own
         error_message = str(e)
         log_id = execute_query(
-            """INSERT INTO fetch_logs
-               (feed_id, status, lead_count, error_message)
-               VALUES (?, ?, ?, ?)""",
+            INSERT_FETCH_LOG_SQL,
             (feed_id, "FAILED", 0, error_message)
         )
 
@@ -131,33 +246,62 @@ def fetch_feed(feed_id: int) -> Dict:
             "log_id": log_id,
             "status": "FAILED",
             "lead_count": 0,
+            "new_count": 0,
+            "updated_count": 0,
+            "unchanged_count": 0,
             "error_message": error_message
         }
 
 
+def get_fetch_concurrency() -> Tuple[int, int]:
+    """Return (max concurrent feed fetches, max concurrent fetches per host)."""
+    def _read(name: str, default: int) -> int:
+        try:
+            value = int(os.getenv(name, ""))
+        except (TypeError, ValueError):
+            value = default
+        return max(1, value)
+
+    return (
+        _read("RSS_FETCH_CONCURRENCY", DEFAULT_FETCH_CONCURRENCY),
+        _read("RSS_FETCH_PER_HOST_LIMIT", DEFAULT_FETCH_PER_HOST_LIMIT),
+    )
+
+
+def feed_host(url: Optional[str]) -> str:
+    """Hostname used to bucket feeds for the per-host concurrency cap."""
+    return (urlparse(url or "").hostname or "").lower()
+
+
 def fetch_all_active_feeds() -> List[Dict]:
     """
-    Fetch all active feeds.
-    Returns a list of fetch results.
+    Fetch all active feeds concurrently.
+    Returns a list of fetch results, in feed order.
     """
-    from lib.database import fetch_all
+    feeds = fetch_all("SELECT id, url FROM feeds WHERE is_active = 1 ORDER BY id", ())
+    max_workers, per_host_limit = get_fetch_concurrency()
 
-    feeds = fetch_all("SELECT id FROM feeds WHERE is_active = 1", ())
-    results = []
+    outcomes = run_with_host_limits(
+        feeds,
+        host_of=lambda feed: feed_host(feed["url"]),
+        work=lambda feed: fetch_feed(feed["id"]),
+        max_workers=max_workers,
+        per_host_limit=per_host_limit,
+    )
 
-    for feed in feeds:
-        try:
-            result = fetch_feed(feed["id"])
-            results.append({
+    results_by_id = {}
+    for feed, result, error in outcomes:
+        if error is None:
+            results_by_id[feed["id"]] = {
                 "feed_id": feed["id"],
                 **result
-            })
-        except Exception as e:
-            results.append({
+            }
+        else:
+            results_by_id[feed["id"]] = {
                 "feed_id": feed["id"],
                 "status": "FAILED",
                 "lead_count": 0,
-                "error_message": str(e)
-            })
+                "error_message": str(error)
+            }
 
-    return results
+    return [results_by_id[feed["id"]] for feed in feeds]
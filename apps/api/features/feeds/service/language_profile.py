@@ -0,0 +1,118 @@
+import os
+import random
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from features.translation.service.detector import (
+    get_language_detector,
+    get_min_confidence,
+    is_local_detection_enabled,
+)
+from lib.database import fetch_all
+
+PROFILE_WINDOW = 500
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_MIN_SHARE = 0.95
+DEFAULT_SAMPLE_RATE = 0.1
+# The newest detections must all agree with the profile, so a feed that
+# switches language loses its profile after a few sampled entries instead of
+# after the whole window has turned over.
+RECENT_AGREEMENT = 5
+
+
+def _get_number_env(name: str, default: float, cast=int):
+    raw = os.getenv(name, "")
+    try:
+        value = cast(raw)
+    except (TypeError, ValueError):
+        value = default
+    return value if value > 0 else default
+
+
+def normalize_language(code: Optional[str]) -> Optional[str]:
+    """Reduce a declared language tag ('es-PE', 'en_US') to its primary code."""
+    if not code:
+        return None
+    primary = code.strip().lower().replace("_", "-").split("-")[0]
+    return primary if primary.isalpha() and 2 <= len(primary) <= 3 else None
+
+
+def get_feed_language_profile(feed_id: int, declared: Optional[str] = None) -> Dict:
+    """
+    Summarize the languages detected for a feed's most recent leads.
+
+    Only detections that passed the local detector's out-of-distribution
+    test or came from LibreTranslate count (language_source 'local' or
+    'remote'). Rows that were assigned the profile language are ignored so the
+    profile cannot confirm itself, and so are rows detected before the source
+    was recorded, which may hold confident guesses for languages the local
+    detector does not know. The profile is confident when the dominant language covers
+    FEED_LANGUAGE_MIN_SHARE of the last PROFILE_WINDOW detections, there are at
+    least FEED_LANGUAGE_MIN_SAMPLES of them (a quarter as many when the feed
+    declares the same language) and the newest detections all agree.
+    """
+    rows = fetch_all(
+        """SELECT detected_language FROM leads
+           WHERE feed_id = ? AND language_source IN ('local', 'remote') AND detected_language IS NOT NULL
+           ORDER BY id DESC
+           LIMIT ?""",
+        (feed_id, PROFILE_WINDOW)
+    )
+    languages = [row["detected_language"] for row in rows]
+    counts = Counter(languages)
+    dominant, dominant_count = counts.most_common(1)[0] if counts else (None, 0)
+    samples = len(languages)
+    share = dominant_count / samples if samples else 0.0
+
+    declared = normalize_language(declared)
+    min_samples = _get_number_env("FEED_LANGUAGE_MIN_SAMPLES", DEFAULT_MIN_SAMPLES)
+    if declared and declared == dominant:
+        min_samples = max(1, min_samples // 4)
+    confident = (
+        dominant is not None
+        and samples >= min_samples
+        and share >= _get_number_env("FEED_LANGUAGE_MIN_SHARE", DEFAULT_MIN_SHARE, float)
+        and all(language == dominant for language in languages[:RECENT_AGREEMENT])
+    )
+
+    return {
+        "feed_id": feed_id,
+        "language": dominant if confident else None,
+        "dominant_language": dominant,
+        "declared_language": declared,
+        "share": round(share, 4),
+        "samples": samples,
+        "confident": confident,
+        "sample_rate": get_sample_rate(),
+    }
+
+
+def get_sample_rate() -> float:
+    rate = _get_number_env("FEED_LANGUAGE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE, float)
+    return min(rate, 1.0)
+
+
+def assign_languages(profile: Optional[Dict], texts: List[Callable[[], str]]) -> List[Optional[str]]:
+    """
+    Languages to store on new leads without detecting them; None means detect.
+
+    texts holds one callable per lead returning its detection text, so only
+    the sampled entries are cleaned and scored.
+
+    A sample of entries (FEED_LANGUAGE_SAMPLE_RATE) is always left for the
+    translation worker to detect, which keeps re-validating the profile. The
+    sample is also scored right away with the local detector: if any
+    confident result disagrees, the profile is not used for this document.
+    """
+    if not profile or not profile["language"]:
+        return [None] * len(texts)
+    language = profile["language"]
+    sampled = {i for i in range(len(texts)) if random.random() < profile["sample_rate"]}
+
+    if sampled and is_local_detection_enabled():
+        min_confidence = get_min_confidence()
+        scores = get_language_detector().score_many([texts[i]() for i in sorted(sampled)])
+        if any(code and code != language and confidence >= min_confidence for code, confidence in scores):
+            return [None] * len(texts)
+
+    return [None if i in sampled else language for i in range(len(texts))]
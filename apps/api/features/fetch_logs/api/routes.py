@@ -1,21 +1,48 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 
 from features.fetch_logs.schema import FetchLogResponse
 from lib.database import fetch_all, fetch_one, execute_query
+from lib.pagination import (
+    decode_cursor,
+    keyset_condition,
+    keyset_order,
+    paginate,
+    set_next_cursor,
+)
 
 router = APIRouter(prefix="/logs", tags=["fetch_logs"])
 
+LOG_SORT = "COALESCE(fetched_at, '')"
+
+
+def _page_logs(query: str, params: list, limit: int, offset: int, cursor: Optional[str]):
+    """Run a log query newest first, from the cursor when one is given."""
+    if cursor:
+        try:
+            sort_value, last_id = decode_cursor(cursor, "fetched_at", 2)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        condition, condition_params = keyset_condition(LOG_SORT, "id", sort_value, last_id)
+        query += f" AND {condition}"
+        params = params + condition_params
+        offset = 0
+    query += f" ORDER BY {keyset_order(LOG_SORT, 'id')} LIMIT ? OFFSET ?"
+    rows = fetch_all(query, tuple(params) + (limit + 1, offset))
+    return paginate(rows, limit, "fetched_at", lambda row: (row["fetched_at"] or "", row["id"]))
+
 
 @router.get("", response_model=List[FetchLogResponse])
 def get_logs(
+    response: Response,
     feed_id: Optional[int] = Query(None),
-    status: Optional[str] = Query(None, regex="^(SUCCESS|FAILED)$"),
+    status: Optional[str] = Query(None, regex="^(SUCCESS|FAILED|NOT_MODIFIED)$"),
     limit: Optional[int] = Query(100, ge=1, le=1000),
     offset: Optional[int] = Query(0, ge=0),
-    sort: Optional[str] = Query("fetched_at", regex="^fetched_at$")
+    sort: Optional[str] = Query("fetched_at", regex="^fetched_at$"),
+    cursor: Optional[str] = Query(None)
 ) -> List[FetchLogResponse]:
-    """Get fetch logs with optional filters."""
+    """Get fetch logs with optional filters; pass X-Next-Cursor back as cursor for the next page."""
     query = "SELECT * FROM fetch_logs WHERE 1=1"
     params = []
 
@@ -27,28 +54,26 @@ def get_logs(
         query += " AND status = ?"
         params.append(status)
 
-    query += f" ORDER BY {sort} DESC LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
-
-    results = fetch_all(query, tuple(params))
+    results, next_cursor = _page_logs(query, params, limit, offset, cursor)
+    set_next_cursor(response, next_cursor)
     return [FetchLogResponse(**row) for row in results]
 
 
 @router.get("/feed/{feed_id}", response_model=List[FetchLogResponse])
 def get_logs_by_feed(
     feed_id: int,
+    response: Response,
     limit: Optional[int] = Query(100, ge=1, le=1000),
-    offset: Optional[int] = Query(0, ge=0)
+    offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None)
 ) -> List[FetchLogResponse]:
     """Get all fetch logs for a specific feed."""
     feed = fetch_one("SELECT * FROM feeds WHERE id = ?", (feed_id,))
     if not feed:
         raise HTTPException(status_code=404, detail="Feed not found")
 
-    logs = fetch_all(
-        "SELECT * FROM fetch_logs WHERE feed_id = ? ORDER BY fetched_at DESC LIMIT ? OFFSET ?",
-        (feed_id, limit, offset)
-    )
+    logs, next_cursor = _page_logs("SELECT * FROM fetch_logs WHERE feed_id = ?", [feed_id], limit, offset, cursor)
+    set_next_cursor(response, next_cursor)
     return [FetchLogResponse(**log) for log in logs]
 
 
@@ -12,9 +12,19 @@ from features.instagram_feeds.service.fetcher import (
     fetch_all_active_instagram_feeds
 )
 from lib.database import fetch_all, fetch_one, execute_query
+from lib.database.fts import SEARCH_INDEX, build_match_query, fts_available, search_ids_sql
+from lib.pagination import (
+    decode_cursor,
+    keyset_condition,
+    keyset_order,
+    paginate,
+    set_next_cursor,
+)
 
 router = APIRouter(prefix="/instagram-feeds", tags=["instagram-feeds"])
 ALLOWED_MEDIA_HOSTS = ("cdninstagram.com", "fbcdn.net")
+# Keyset sort for /posts, backed by idx_instagram_posts_keyset
+INSTAGRAM_POST_SORT = "COALESCE(ip.posted_at, '')"
 
 def _is_allowed_media_url(url: str) -> bool:
     parsed = urlparse(url)
@@ -114,15 +124,17 @@ def trigger_fetch_all_instagram() -> List[Dict]:
 # Instagram Posts Routes (must come before /{feed_id} routes)
 @router.get("/posts", response_model=List[InstagramPostResponse])
 def get_instagram_posts(
+    response: Response,
     search: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     tag: Optional[str] = Query(None),
     country: Optional[str] = Query(None),
     instagram_feed_id: Optional[int] = Query(None),
     limit: Optional[int] = Query(None, ge=1),
-    offset: Optional[int] = Query(0, ge=0)
+    offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None)
 ) -> List[InstagramPostResponse]:
-    """Get Instagram posts with filters."""
+    """Get Instagram posts with filters; pass X-Next-Cursor back as cursor for the next page."""
     query = """
         SELECT ip.* FROM instagram_posts ip
         JOIN instagram_feeds if ON ip.instagram_feed_id = if.id
@@ -130,7 +142,11 @@ def get_instagram_posts(
     """
     params = []
 
-    if search:
+    match_query = build_match_query(search) if search else None
+    if match_query and fts_available(SEARCH_INDEX):
+        query += f" AND ip.id IN ({search_ids_sql('instagram_post')})"
+        params.append(match_query)
+    elif search:
         query += " AND (ip.caption LIKE ? OR ip.username LIKE ?)"
         search_term = f"%{search}%"
         params.extend([search_term, search_term])
@@ -157,13 +173,28 @@ def get_instagram_posts(
         query += " AND ip.country = ?"
         params.append(country)
 
-    query += " ORDER BY ip.posted_at DESC"
+    if cursor:
+        try:
+            sort_value, last_id = decode_cursor(cursor, "posted_at", 2)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        condition, condition_params = keyset_condition(INSTAGRAM_POST_SORT, "ip.id", sort_value, last_id)
+        query += f" AND {condition}"
+        params.extend(condition_params)
+        offset = 0
+
+    query += f" ORDER BY {keyset_order(INSTAGRAM_POST_SORT, 'ip.id')}"
 
     if limit is not None:
         query += " LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        params.extend([limit + 1, offset])
 
     posts = fetch_all(query, tuple(params))
+    if limit is not None:
+        posts, next_cursor = paginate(
+            posts, limit, "posted_at", lambda row: (row["posted_at"] or "", row["id"])
+        )
+        set_next_cursor(response, next_cursor)
     return [InstagramPostResponse(**post) for post in posts]
 
 @router.get("/posts/{post_id}/image")
@@ -1,48 +1,36 @@
 from datetime import datetime
 from typing import Dict, List
-from pathlib import Path
-import sqlite3
 
 from features.instagram_feeds.service.instagram_client import (
     fetch_instagram_posts,
     InstagramAPIError
 )
-from features.translation.service.translator import get_translator
-
-DATABASE_PATH = Path(__file__).parent.parent.parent.parent / "leads.db"
-
-def fetch_one(query: str, params: tuple) -> dict | None:
-    """Helper to fetch one row from database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    result = cursor.execute(query, params).fetchone()
-    conn.close()
-    return dict(result) if result else None
-
-def fetch_all(query: str, params: tuple) -> list:
-    """Helper to fetch all rows from database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    results = cursor.execute(query, params).fetchall()
-    conn.close()
-    return [dict(row) for row in results]
-
-def execute_query(query: str, params: tuple) -> int:
-    """Helper to execute query and return lastrowid."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    lastrowid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return lastrowid
+from features.approval.service.rules import get_approval_rules
+from features.translation.service.worker import notify_translation_worker
+from lib.database import UnitOfWork, execute_query, fetch_all, fetch_one
+
+
+INSERT_POST_SQL = """INSERT OR IGNORE INTO instagram_posts
+   (instagram_feed_id, post_id, username, country, caption, media_type,
+    media_url, thumbnail_url, like_count, comment_count,
+    view_count, posted_at, permalink,
+    approval_status, approved_by, approved_at,
+    caption_translated, detected_language, translation_status, translated_at)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+INSERT_FETCH_LOG_SQL = """INSERT INTO instagram_fetch_logs
+   (instagram_feed_id, status, post_count, max_id, error_message)
+   VALUES (?, ?, ?, ?, ?)"""
+
 
 def fetch_instagram_feed(feed_id: int) -> Dict:
     """
     Fetch Instagram posts for a feed and save new posts to database.
 
+    New posts, the feed's last_fetched/last_max_id and the fetch log are
+    written as one unit of work; posts already stored are skipped by the
+    unique post_id instead of a SELECT per post.
+
     Returns:
         Dict with status, post_count, next_max_id, error_message
     """
@@ -62,73 +50,49 @@ def fetch_instagram_feed(feed_id: int) -> Dict:
 
         posts = result["posts"]
         next_max_id = result["next_max_id"]
-        post_count = 0
+        rows = []
         errors = []
+        rules = get_approval_rules()
 
-        # Get translator for language detection and translation
-        translator = get_translator()
-
-        # Insert new posts into database
         for post in posts:
             try:
-                # Check if post already exists
-                existing = fetch_one(
-                    "SELECT id FROM instagram_posts WHERE post_id = ?",
-                    (post.post_id,)
+                # Captions are translated later by the translation worker
+                translation_status = 'pending' if post.caption else 'skipped'
+                # Captionless posts are never detected, so their language is final
+                approval = rules.evaluate(
+                    'instagram_post', f"@{feed['username']}", feed_country, None, (post.caption,),
+                    language_final=not post.caption,
                 )
-
-                if not existing:
-                    # Auto-detect language and translate caption if not English
-                    caption_translated = None
-                    detected_language = None
-                    translation_status = 'already_english'
-                    translated_at = None
-
-                    if post.caption:
-                        detected_language = translator.detect_language(post.caption)
-
-                        if detected_language and detected_language != 'en':
-                            caption_translated, trans_status = translator.translate_text(
-                                post.caption, source=detected_language, target='en'
-                            )
-                            translation_status = 'translated'
-                            translated_at = datetime.utcnow().isoformat()
-
-                    execute_query(
-                        """INSERT INTO instagram_posts
-                           (instagram_feed_id, post_id, username, country, caption, media_type,
-                            media_url, thumbnail_url, like_count, comment_count,
-                            view_count, posted_at, permalink, approval_status,
-                            caption_translated, detected_language, translation_status, translated_at)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                        (feed_id, post.post_id, post.username, feed_country, post.caption,
-                         post.media_type, post.media_url, post.thumbnail_url,
-                         post.like_count, post.comment_count, post.view_count,
-                         post.posted_at, post.permalink, 'pending',
-                         caption_translated, detected_language, translation_status, translated_at)
-                    )
-                    post_count += 1
+                rows.append((
+                    feed_id, post.post_id, post.username, feed_country, post.caption,
+                    post.media_type, post.media_url, post.thumbnail_url,
+                    post.like_count, post.comment_count, post.view_count,
+                    post.posted_at, post.permalink, *approval,
+                    None, None, translation_status, None,
+                ))
             except Exception as e:
                 errors.append(f"Post {post.post_id}: {str(e)}")
 
-        # Update feed metadata
-        execute_query(
-            """UPDATE instagram_feeds
-               SET last_fetched = ?, last_max_id = ?
-               WHERE id = ?""",
-            (datetime.utcnow().isoformat(), next_max_id, feed_id)
-        )
-
-        # Create fetch log
         status = "SUCCESS" if not errors else "PARTIAL"
         error_message = "; ".join(errors) if errors else None
 
-        log_id = execute_query(
-            """INSERT INTO instagram_fetch_logs
-               (instagram_feed_id, status, post_count, max_id, error_message)
-               VALUES (?, ?, ?, ?, ?)""",
-            (feed_id, status, post_count, next_max_id, error_message)
-        )
+        with UnitOfWork() as uow:
+            uow.add_many(INSERT_POST_SQL, rows)
+            uow.add(
+                """UPDATE instagram_feeds
+                   SET last_fetched = ?, last_max_id = ?
+                   WHERE id = ?""",
+                (datetime.utcnow().isoformat(), next_max_id, feed_id)
+            )
+            uow.flush()
+            post_count = uow.rowcount(INSERT_POST_SQL)
+            log_id = uow.execute(
+                INSERT_FETCH_LOG_SQL,
+                (feed_id, status, post_count, next_max_id, error_message)
+            )
+
+        if post_count:
+            notify_translation_worker()
 
         return {
             "log_id": log_id,
@@ -142,9 +106,7 @@ def fetch_instagram_feed(feed_id: int) -> Dict:
         # Create failed fetch log
         error_message = str(e)
         log_id = execute_query(
-            """INSERT INTO instagram_fetch_logs
-               (instagram_feed_id, status, post_count, max_id, error_message)
-               VALUES (?, ?, ?, ?, ?)""",
+            INSERT_FETCH_LOG_SQL,
             (feed_id, "FAILED", 0, None, error_message)
         )
 
@@ -1,11 +1,37 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 
 from features.leads.schema import LeadCreate, LeadUpdate, LeadResponse
 from lib.database import fetch_all, fetch_one, execute_query
+from lib.database.fts import (
+    SEARCH_INDEX,
+    SEARCH_TYPE_CODES,
+    SEARCH_WEIGHTS,
+    build_match_query,
+    fts_available,
+    get_snippets,
+)
+from lib.pagination import (
+    decode_cursor,
+    keyset_condition,
+    keyset_order,
+    paginate,
+    set_next_cursor,
+)
 
 router = APIRouter(prefix="/leads", tags=["leads"])
 
+# Keyset sort expressions; NULLs sort as '' so every row has a comparable key.
+# Matching (…, expression, id) indexes are created by add_index_packs.
+LEAD_SORTS = {
+    "published": "COALESCE(l.published, '')",
+    "collected_at": "COALESCE(l.collected_at, '')",
+}
+
+
+def _lead_key(sort: str):
+    return lambda row: (row[sort] or "", row["id"])
+
 
 @router.post("", response_model=LeadResponse, status_code=201)
 def create_lead(lead: LeadCreate) -> LeadResponse:
@@ -35,20 +61,36 @@ def create_lead(lead: LeadCreate) -> LeadResponse:
 
 @router.get("", response_model=List[LeadResponse])
 def get_leads(
+    response: Response,
     feed_id: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     tag: Optional[str] = Query(None),
     country: Optional[str] = Query(None),
-    sort: Optional[str] = Query("published", regex="^(published|collected_at)$"),
+    sort: Optional[str] = Query(None, regex="^(published|collected_at|relevance)$"),
     limit: Optional[int] = Query(100, ge=1, le=1000),
-    offset: Optional[int] = Query(0, ge=0)
+    offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
 ) -> List[LeadResponse]:
-    """Get all leads with optional filters."""
-    query = "SELECT DISTINCT l.* FROM leads l"
+    """
+    Get all leads with optional filters.
+
+    search uses the shared search_index: words match as prefixes,
+    quoted text as a phrase, and each lead gets a highlighted snippet.
+    Searches sort by BM25 relevance unless sort is given; otherwise the
+    default sort is published.
+
+    Pass the X-Next-Cursor response header back as cursor to get the next
+    page; offset is still accepted but deep offsets get slower. Relevance
+    cursors carry an offset, since BM25 ranks every match anyway.
+    """
     joins = []
     conditions = []
     params = []
+    match_query = build_match_query(search) if search else None
+    use_fts = match_query is not None and fts_available(SEARCH_INDEX)
+    if sort is None or (sort == "relevance" and not use_fts):
+        sort = "relevance" if use_fts else "published"
 
     if category:
         joins.append("JOIN feeds f ON l.feed_id = f.id")
@@ -57,17 +99,26 @@ def get_leads(
         params.append(category)
 
     if tag:
-        joins.append("JOIN feeds f ON l.feed_id = f.id")
-        joins.append("JOIN feed_tag_map ftm ON f.id = ftm.feed_id")
-        joins.append("JOIN feed_tags ft ON ftm.tag_id = ft.id")
-        conditions.append("ft.name = ?")
+        # EXISTS instead of a join so a feed with several tags cannot
+        # duplicate rows (which used to need DISTINCT over whole leads)
+        conditions.append(
+            """EXISTS (SELECT 1 FROM feed_tag_map ftm
+                       JOIN feed_tags ft ON ftm.tag_id = ft.id
+                       WHERE ftm.feed_id = l.feed_id AND ft.name = ?)"""
+        )
         params.append(tag)
 
     if feed_id is not None:
         conditions.append("l.feed_id = ?")
         params.append(feed_id)
 
-    if search:
+    if use_fts:
+        # The index drives the join; each match maps back to a lead by rowid
+        joins.append(f"JOIN {SEARCH_INDEX} ON l.id = {SEARCH_INDEX}.rowid >> 3")
+        conditions.append(f"{SEARCH_INDEX}.rowid & 7 = {SEARCH_TYPE_CODES['lead']}")
+        conditions.append(f"{SEARCH_INDEX} MATCH ?")
+        params.append(match_query)
+    elif search:
         conditions.append("(l.title LIKE ? OR l.summary LIKE ? OR l.content LIKE ?)")
         search_param = f"%{search}%"
         params.extend([search_param, search_param, search_param])
@@ -79,55 +130,109 @@ def get_leads(
     # Always filter by approved status
     conditions.append("l.approval_status = 'approved'")
 
+    if cursor and sort == "relevance":
+        try:
+            offset = decode_cursor(cursor, sort, 1)[0]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if not isinstance(offset, int) or offset < 0:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    elif cursor:
+        try:
+            sort_value, last_id = decode_cursor(cursor, sort, 2)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        condition, condition_params = keyset_condition(LEAD_SORTS[sort], "l.id", sort_value, last_id)
+        conditions.append(condition)
+        params.extend(condition_params)
+        offset = 0
+
+    query = "SELECT l.* FROM leads l"
     if joins:
-        query += " " + " ".join(set(joins))
+        query += " " + " ".join(dict.fromkeys(joins))
 
     if conditions:
         query += " WHERE " + " AND ".join(conditions)
 
-    query += f" ORDER BY l.{sort} DESC"
+    if sort == "relevance":
+        query += f" ORDER BY bm25({SEARCH_INDEX}, {SEARCH_WEIGHTS}), l.published DESC"
+    else:
+        query += f" ORDER BY {keyset_order(LEAD_SORTS[sort], 'l.id')}"
     query += " LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
+    params.extend([limit + 1, offset])
 
-    results = fetch_all(query, tuple(params))
+    if sort == "relevance":
+        results, next_cursor = paginate(
+            fetch_all(query, tuple(params)), limit, sort, lambda row: (offset + limit,)
+        )
+    else:
+        results, next_cursor = paginate(fetch_all(query, tuple(params)), limit, sort, _lead_key(sort))
+    set_next_cursor(response, next_cursor)
+    if use_fts and results:
+        # Snippets only for the page being returned, not for every match
+        snippets = get_snippets(match_query, "lead", [row["id"] for row in results])
+        for row in results:
+            row["snippet"] = snippets.get(row["id"])
     return [LeadResponse(**row) for row in results]
 
 
 @router.get("/feed/{feed_id}", response_model=List[LeadResponse])
 def get_leads_by_feed(
     feed_id: int,
+    response: Response,
     limit: Optional[int] = Query(100, ge=1, le=1000),
-    offset: Optional[int] = Query(0, ge=0)
+    offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
 ) -> List[LeadResponse]:
-    """Get all leads for a specific feed."""
+    """Get all leads for a specific feed (cursor pagination as in GET /leads)."""
     feed = fetch_one("SELECT * FROM feeds WHERE id = ?", (feed_id,))
     if not feed:
         raise HTTPException(status_code=404, detail="Feed not found")
 
-    leads = fetch_all(
-        "SELECT * FROM leads WHERE feed_id = ? AND approval_status = 'approved' ORDER BY published DESC LIMIT ? OFFSET ?",
-        (feed_id, limit, offset)
+    query = "SELECT l.* FROM leads l WHERE l.feed_id = ? AND l.approval_status = 'approved'"
+    params = [feed_id]
+    query, params, offset = _apply_published_cursor(query, params, cursor, offset)
+    leads, next_cursor = paginate(
+        fetch_all(query, tuple(params) + (limit + 1, offset)), limit, "published", _lead_key("published")
     )
+    set_next_cursor(response, next_cursor)
     return [LeadResponse(**lead) for lead in leads]
 
 
+def _apply_published_cursor(query: str, params: list, cursor: Optional[str], offset: int):
+    """Add the cursor condition, newest-first ordering and LIMIT/OFFSET placeholders."""
+    if cursor:
+        try:
+            sort_value, last_id = decode_cursor(cursor, "published", 2)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        condition, condition_params = keyset_condition(LEAD_SORTS["published"], "l.id", sort_value, last_id)
+        query += f" AND {condition}"
+        params = params + condition_params
+        offset = 0
+    query += f" ORDER BY {keyset_order(LEAD_SORTS['published'], 'l.id')} LIMIT ? OFFSET ?"
+    return query, params, offset
+
+
 @router.get("/tag/{tag_name}", response_model=List[LeadResponse])
 def get_leads_by_tag(
     tag_name: str,
+    response: Response,
     limit: Optional[int] = Query(100, ge=1, le=1000),
-    offset: Optional[int] = Query(0, ge=0)
+    offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
 ) -> List[LeadResponse]:
-    """Get all leads that match a specific tag."""
-    leads = fetch_all(
-        """SELECT DISTINCT l.* FROM leads l
-           JOIN feeds f ON l.feed_id = f.id
-           JOIN feed_tag_map ftm ON f.id = ftm.feed_id
-           JOIN feed_tags ft ON ftm.tag_id = ft.id
-           WHERE ft.name = ? AND l.approval_status = 'approved'
-           ORDER BY l.published DESC
-           LIMIT ? OFFSET ?""",
-        (tag_name, limit, offset)
+    """Get all leads that match a specific tag (cursor pagination as in GET /leads)."""
+    query = """SELECT l.* FROM leads l
+               WHERE l.approval_status = 'approved'
+                 AND EXISTS (SELECT 1 FROM feed_tag_map ftm
+                             JOIN feed_tags ft ON ftm.tag_id = ft.id
+                             WHERE ftm.feed_id = l.feed_id AND ft.name = ?)"""
+    query, params, offset = _apply_published_cursor(query, [tag_name], cursor, offset)
+    leads, next_cursor = paginate(
+        fetch_all(query, tuple(params) + (limit + 1, offset)), limit, "published", _lead_key("published")
     )
+    set_next_cursor(response, next_cursor)
     return [LeadResponse(**lead) for lead in leads]
 
 
@@ -52,3 +52,5 @@ class LeadResponse(BaseModel):
     approved_by: Optional[str] = None
     approved_at: Optional[str] = None
     approval_notes: Optional[str] = None
+    # Highlighted match (HTML-escaped, <mark> around hits) when searching
+    snippet: Optional[str] = None
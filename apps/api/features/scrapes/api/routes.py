@@ -2,10 +2,12 @@
 Unified API routes for scraped content across sources.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional, Tuple
 
 from lib.database import fetch_all, fetch_one
+from lib.database.fts import SEARCH_INDEX, build_match_query, fts_available, search_ids_sql
+from lib.pagination import decode_cursor, keyset_condition, keyset_order, paginate, set_next_cursor
 from features.scrapes.schema.models import ScrapeResponse
 
 router = APIRouter(prefix="/scrapes", tags=["scrapes"])
@@ -15,6 +17,7 @@ CONTENT_TYPES = ("el_comercio_post", "diario_correo_post")
 
 def build_where_clause(
     alias: str,
+    content_type: str,
     search: Optional[str],
     approval_status: Optional[str],
     country: Optional[str],
@@ -26,7 +29,11 @@ def build_where_clause(
         clauses.append(f"{alias}.approval_status = ?")
         params.append(approval_status)
 
-    if search:
+    match_query = build_match_query(search) if search else None
+    if match_query and fts_available(SEARCH_INDEX):
+        clauses.append(f"{alias}.id IN ({search_ids_sql(content_type)})")
+        params.append(match_query)
+    elif search:
         term = f"%{search}%"
         clauses.append(
             f"({alias}.title LIKE ? OR {alias}.title_translated LIKE ? "
@@ -43,106 +50,157 @@ def build_where_clause(
     return "", params
 
 
+def build_cursor_clause(alias: str, content_type: str, after: Optional[List]) -> Tuple[str, list]:
+    """
+    Restrict one source to the rows after the cursor row.
+
+    Pages are ordered by (collected_at, content_type, id), all descending;
+    for a single source that reduces to a range on its (collected_at, id)
+    index.
+    """
+    if not after:
+        return "", []
+    sort_value, cursor_type, last_id = after
+    sort_sql = f"COALESCE({alias}.collected_at, '')"
+    if content_type < cursor_type:
+        return f" AND {sort_sql} <= ?", [sort_value]
+    if content_type > cursor_type:
+        return f" AND {sort_sql} < ?", [sort_value]
+    condition, params = keyset_condition(sort_sql, f"{alias}.id", sort_value, last_id)
+    return f" AND {condition}", params
+
+
 def build_el_comercio_queries(
     search: Optional[str],
     approval_status: Optional[str],
     country: Optional[str],
+    after: Optional[List] = None,
+    branch_limit: int = -1,
 ) -> Tuple[str, list, str, list]:
-    where_sql, params = build_where_clause("ecp", search, approval_status, country)
+    where_sql, params = build_where_clause("ecp", "el_comercio_post", search, approval_status, country)
+    cursor_sql, cursor_params = build_cursor_clause("ecp", "el_comercio_post", after)
     select_sql = f"""
-        SELECT
-            'el_comercio_post' AS content_type,
-            ecp.id AS content_id,
-            COALESCE(NULLIF(ecp.title_translated, ''), ecp.title) AS title,
-            COALESCE(NULLIF(ecp.excerpt_translated, ''), ecp.excerpt) AS summary,
-            ecf.display_name AS source_name,
-            ecp.collected_at AS collected_at,
-            ecp.country AS country,
-            ecp.image_url AS image_url,
-            ecp.url AS link,
-            ecp.detected_language AS detected_language,
-            ecp.translation_status AS translation_status,
-            ecp.approval_status AS approval_status
-        FROM el_comercio_posts ecp
-        JOIN el_comercio_feeds ecf ON ecp.el_comercio_feed_id = ecf.id
-        WHERE 1=1{where_sql}
+        SELECT * FROM (
+            SELECT
+                'el_comercio_post' AS content_type,
+                ecp.id AS content_id,
+                COALESCE(NULLIF(ecp.title_translated, ''), ecp.title) AS title,
+                COALESCE(NULLIF(ecp.excerpt_translated, ''), ecp.excerpt) AS summary,
+                ecf.display_name AS source_name,
+                ecp.collected_at AS collected_at,
+                ecp.country AS country,
+                ecp.image_url AS image_url,
+                ecp.url AS link,
+                ecp.detected_language AS detected_language,
+                ecp.translation_status AS translation_status,
+                ecp.approval_status AS approval_status
+            FROM el_comercio_posts ecp
+            JOIN el_comercio_feeds ecf ON ecp.el_comercio_feed_id = ecf.id
+            WHERE 1=1{where_sql}{cursor_sql}
+            ORDER BY {keyset_order("COALESCE(ecp.collected_at, '')", "ecp.id")}
+            LIMIT ?
+        )
     """
     count_sql = f"""
         SELECT COUNT(*) AS count
         FROM el_comercio_posts ecp
         WHERE 1=1{where_sql}
     """
-    return select_sql, list(params), count_sql, list(params)
+    return select_sql, params + cursor_params + [branch_limit], count_sql, list(params)
 
 
 def build_diario_correo_queries(
     search: Optional[str],
     approval_status: Optional[str],
     country: Optional[str],
+    after: Optional[List] = None,
+    branch_limit: int = -1,
 ) -> Tuple[str, list, str, list]:
-    where_sql, params = build_where_clause("dcp", search, approval_status, country)
+    where_sql, params = build_where_clause("dcp", "diario_correo_post", search, approval_status, country)
+    cursor_sql, cursor_params = build_cursor_clause("dcp", "diario_correo_post", after)
     select_sql = f"""
-        SELECT
-            'diario_correo_post' AS content_type,
-            dcp.id AS content_id,
-            COALESCE(NULLIF(dcp.title_translated, ''), dcp.title) AS title,
-            COALESCE(NULLIF(dcp.excerpt_translated, ''), dcp.excerpt) AS summary,
-            dcf.display_name AS source_name,
-            dcp.collected_at AS collected_at,
-            dcp.country AS country,
-            dcp.image_url AS image_url,
-            dcp.url AS link,
-            dcp.detected_language AS detected_language,
-            dcp.translation_status AS translation_status,
-            dcp.approval_status AS approval_status
-        FROM diario_correo_posts dcp
-        JOIN diario_correo_feeds dcf ON dcp.diario_correo_feed_id = dcf.id
-        WHERE 1=1{where_sql}
+        SELECT * FROM (
+            SELECT
+                'diario_correo_post' AS content_type,
+                dcp.id AS content_id,
+                COALESCE(NULLIF(dcp.title_translated, ''), dcp.title) AS title,
+                COALESCE(NULLIF(dcp.excerpt_translated, ''), dcp.excerpt) AS summary,
+                dcf.display_name AS source_name,
+                dcp.collected_at AS collected_at,
+                dcp.country AS country,
+                dcp.image_url AS image_url,
+                dcp.url AS link,
+                dcp.detected_language AS detected_language,
+                dcp.translation_status AS translation_status,
+                dcp.approval_status AS approval_status
+            FROM diario_correo_posts dcp
+            JOIN diario_correo_feeds dcf ON dcp.diario_correo_feed_id = dcf.id
+            WHERE 1=1{where_sql}{cursor_sql}
+            ORDER BY {keyset_order("COALESCE(dcp.collected_at, '')", "dcp.id")}
+            LIMIT ?
+        )
     """
     count_sql = f"""
         SELECT COUNT(*) AS count
         FROM diario_correo_posts dcp
         WHERE 1=1{where_sql}
     """
-    return select_sql, list(params), count_sql, list(params)
+    return select_sql, params + cursor_params + [branch_limit], count_sql, list(params)
 
 
 @router.get("", response_model=ScrapeResponse)
 def get_scrapes(
+    response: Response,
     content_type: Optional[str] = Query(None),
     approval_status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     country: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
 ):
     """
     Get scraped content across sources.
+
+    Pass the X-Next-Cursor response header back as cursor for the next page.
+    total_count is only computed for the first page (no cursor) and is null
+    on later pages, so those stay constant-time.
     """
     if content_type and content_type not in CONTENT_TYPES:
         raise HTTPException(status_code=400, detail="Invalid content_type")
 
+    try:
+        after = decode_cursor(cursor, "collected_at", 3) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if after:
+        offset = 0
+    # Each source only needs enough rows to fill this page
+    branch_limit = offset + limit + 1
+
     query_parts = []
     params = []
     total_count = 0
 
     if content_type in (None, "el_comercio_post"):
         select_sql, select_params, count_sql, count_params = build_el_comercio_queries(
-            search, approval_status, country
+            search, approval_status, country, after, branch_limit
         )
         query_parts.append(select_sql)
         params.extend(select_params)
-        count_row = fetch_one(count_sql, tuple(count_params))
-        total_count += count_row["count"] if count_row else 0
+        if not after:
+            count_row = fetch_one(count_sql, tuple(count_params))
+            total_count += count_row["count"] if count_row else 0
 
     if content_type in (None, "diario_correo_post"):
         select_sql, select_params, count_sql, count_params = build_diario_correo_queries(
-            search, approval_status, country
+            search, approval_status, country, after, branch_limit
         )
         query_parts.append(select_sql)
         params.extend(select_params)
-        count_row = fetch_one(count_sql, tuple(count_params))
-        total_count += count_row["count"] if count_row else 0
+        if not after:
+            count_row = fetch_one(count_sql, tuple(count_params))
+            total_count += count_row["count"] if count_row else 0
 
     if not query_parts:
         return {"total_count": 0, "items": []}
@@ -151,13 +209,17 @@ def get_scrapes(
     final_sql = f"""
         SELECT *
         FROM ({union_sql})
-        ORDER BY collected_at DESC
+        ORDER BY COALESCE(collected_at, '') DESC, content_type DESC, content_id DESC
         LIMIT ? OFFSET ?
     """
-    params.extend([limit, offset])
-    items = fetch_all(final_sql, tuple(params))
+    params.extend([limit + 1, offset])
+    items, next_cursor = paginate(
+        fetch_all(final_sql, tuple(params)), limit, "collected_at",
+        lambda row: (row["collected_at"] or "", row["content_type"], row["content_id"])
+    )
+    set_next_cursor(response, next_cursor)
 
     return {
-        "total_count": total_count,
+        "total_count": None if after else total_count,
         "items": items,
     }
@@ -22,5 +22,5 @@ class ScrapeItem(BaseModel):
 
 
 class ScrapeResponse(BaseModel):
-    total_count: int
+    total_count: Optional[int] = None
     items: list[ScrapeItem]
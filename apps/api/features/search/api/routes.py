@@ -0,0 +1,98 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from features.search.schema import SearchResponse
+from lib.database import fetch_all
+from lib.database.fts import (
+    SEARCH_INDEX,
+    SEARCH_TYPE_CODES,
+    SEARCH_WEIGHTS,
+    build_match_query,
+    fts_available,
+    get_snippets_by_rowid,
+)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1),
+    content_type: Optional[str] = Query(None),
+    country: Optional[str] = Query(None),
+    approval_status: str = Query("approved", regex="^(approved|pending|rejected|any)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> SearchResponse:
+    """
+    Search leads, Instagram, Reddit, scraped articles and YouTube videos
+    (including transcripts) at once, ranked by BM25.
+
+    content_type takes a comma-separated list. facets counts the matches per
+    content type with the other filters applied, so the client can show how
+    many results each type would return.
+    """
+    content_types = [value.strip() for value in content_type.split(",") if value.strip()] if content_type else []
+    unknown = [value for value in content_types if value not in SEARCH_TYPE_CODES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Invalid content_type: {', '.join(unknown)}")
+    if not fts_available(SEARCH_INDEX):
+        raise HTTPException(status_code=503, detail="Search index not available; run migrations")
+
+    match_query = build_match_query(q)
+    if match_query is None:
+        return {"query": q, "total_count": 0, "facets": {}, "items": []}
+
+    conditions = [f"{SEARCH_INDEX} MATCH ?"]
+    params = [match_query]
+    if approval_status != "any":
+        conditions.append("m.approval_status = ?")
+        params.append(approval_status)
+    if country:
+        conditions.append("country = ?")
+        params.append(country)
+    where_sql = " AND ".join(conditions)
+
+    facet_rows = fetch_all(
+        f"""SELECT content_type, COUNT(*) AS count
+            FROM {SEARCH_INDEX}
+            JOIN search_index_meta m ON m.rowid = {SEARCH_INDEX}.rowid
+            WHERE {where_sql}
+            GROUP BY content_type""",
+        tuple(params)
+    )
+    facets = {row["content_type"]: row["count"] for row in facet_rows}
+    total_count = sum(
+        count for value, count in facets.items()
+        if not content_types or value in content_types
+    )
+
+    if content_types:
+        # rowid & 7 is the content type code, so this filter never reads the row
+        codes = ", ".join(str(SEARCH_TYPE_CODES[value]) for value in content_types)
+        where_sql += f" AND ({SEARCH_INDEX}.rowid & 7) IN ({codes})"
+
+    items = fetch_all(
+        f"""SELECT {SEARCH_INDEX}.rowid AS rowid, content_type, content_id,
+                   COALESCE(NULLIF(title_translated, ''), title) AS title,
+                   country, m.approval_status, m.published, url,
+                   bm25({SEARCH_INDEX}, {SEARCH_WEIGHTS}) AS score
+            FROM {SEARCH_INDEX}
+            JOIN search_index_meta m ON m.rowid = {SEARCH_INDEX}.rowid
+            WHERE {where_sql}
+            ORDER BY score, m.published DESC
+            LIMIT ? OFFSET ?""",
+        tuple(params) + (limit, offset)
+    )
+
+    # Snippets only for the page being returned, not for every match
+    snippets = get_snippets_by_rowid(match_query, [item["rowid"] for item in items])
+    for item in items:
+        item["snippet"] = snippets.get(item["rowid"])
+
+    return {
+        "query": q,
+        "total_count": total_count,
+        "facets": facets,
+        "items": items,
+    }
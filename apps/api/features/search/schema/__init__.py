@@ -0,0 +1,3 @@
+from .models import SearchResult, SearchResponse
+
+__all__ = ["SearchResult", "SearchResponse"]
@@ -0,0 +1,21 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    content_type: str
+    content_id: int
+    title: Optional[str] = None
+    snippet: Optional[str] = None
+    country: Optional[str] = None
+    approval_status: Optional[str] = None
+    published: Optional[str] = None
+    url: Optional[str] = None
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    total_count: int
+    facets: Dict[str, int]
+    items: List[SearchResult]
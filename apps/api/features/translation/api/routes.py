@@ -1,13 +1,25 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from typing import List, Optional
 
 from features.translation.schema import (
     TranslationRequest,
     TranslationResponse,
     TranslationStats,
-    OverallStats
+    OverallStats,
+    TranslationWorkerStatus,
+    LanguageDetectionJobResponse
 )
 from features.translation.service.content_translator import ContentTranslator
+from features.translation.service.detection_jobs import (
+    DetectionJobActiveError,
+    create_language_detection_job,
+    get_current_job,
+    get_job,
+    list_jobs,
+    resume_language_detection_job,
+    start_language_detection_job,
+)
+from features.translation.service.worker import get_translation_worker
 
 router = APIRouter(prefix="/translate", tags=["translation"])
 
@@ -98,20 +110,73 @@ def get_translation_stats() -> OverallStats:
     return OverallStats(**stats)
 
 
-@router.post("/detect-languages")
-def detect_missing_languages(force: bool = False):
+@router.get("/worker", response_model=TranslationWorkerStatus)
+def get_translation_worker_status() -> TranslationWorkerStatus:
+    """Get background translation worker state, queue depth and progress."""
+    return TranslationWorkerStatus(**get_translation_worker().status())
+
+
+@router.post("/worker/wake", response_model=TranslationWorkerStatus)
+def wake_translation_worker() -> TranslationWorkerStatus:
+    """Start the worker if needed and make it drain pending rows now."""
+    worker = get_translation_worker()
+    worker.start()
+    worker.notify()
+    return TranslationWorkerStatus(**worker.status())
+
+
+@router.post("/detect-languages", response_model=LanguageDetectionJobResponse)
+def detect_missing_languages(force: bool = False) -> LanguageDetectionJobResponse:
     """
-    Detect language for all content that has NULL detected_language.
+    Start a background job detecting language for all content with NULL detected_language.
     Set force=true to re-detect ALL content (useful for fixing incorrect detections).
+    Poll GET /translate/detect-languages/current for progress.
     """
-    translator = ContentTranslator()
-    if force:
-        result = translator.redetect_all_languages()
-    else:
-        result = translator.detect_missing_languages()
-    return {
-        "message": "Language detection complete",
-        "leads_updated": result["leads_updated"],
-        "instagram_updated": result["instagram_updated"],
-        "reddit_updated": result["reddit_updated"]
-    }
+    try:
+        job_id = create_language_detection_job(force=force)
+    except DetectionJobActiveError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    start_language_detection_job(job_id)
+    return LanguageDetectionJobResponse(**get_job(job_id))
+
+
+@router.get("/detect-languages/jobs", response_model=List[LanguageDetectionJobResponse])
+def get_language_detection_jobs(
+    limit: Optional[int] = Query(20, ge=1, le=200),
+    offset: Optional[int] = Query(0, ge=0),
+) -> List[LanguageDetectionJobResponse]:
+    """List language detection jobs."""
+    return [LanguageDetectionJobResponse(**job) for job in list_jobs(limit=limit or 20, offset=offset or 0)]
+
+
+@router.get("/detect-languages/current", response_model=Optional[LanguageDetectionJobResponse])
+def get_current_language_detection_job() -> Optional[LanguageDetectionJobResponse]:
+    """Get the running language detection job, or the latest finished one."""
+    job = get_current_job()
+    if not job:
+        return None
+    return LanguageDetectionJobResponse(**job)
+
+
+@router.get("/detect-languages/jobs/{job_id}", response_model=LanguageDetectionJobResponse)
+def get_language_detection_job(job_id: int) -> LanguageDetectionJobResponse:
+    """Get a language detection job with progress, rate and ETA."""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Language detection job not found")
+    return LanguageDetectionJobResponse(**job)
+
+
+@router.post("/detect-languages/jobs/{job_id}/resume", response_model=LanguageDetectionJobResponse)
+def resume_language_detection(job_id: int) -> LanguageDetectionJobResponse:
+    """Resume a failed language detection job from its saved cursor."""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Language detection job not found")
+    if job["status"] != "failed":
+        raise HTTPException(status_code=400, detail=f"Job is {job['status']}, only failed jobs can be resumed")
+    try:
+        resume_language_detection_job(job_id)
+    except DetectionJobActiveError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return LanguageDetectionJobResponse(**get_job(job_id))
@@ -2,12 +2,16 @@ from .models import (
     TranslationRequest,
     TranslationStats,
     TranslationResponse,
-    OverallStats
+    OverallStats,
+    TranslationWorkerStatus,
+    LanguageDetectionJobResponse
 )
 
 __all__ = [
     "TranslationRequest",
     "TranslationStats",
     "TranslationResponse",
-    "OverallStats"
+    "OverallStats",
+    "TranslationWorkerStatus",
+    "LanguageDetectionJobResponse"
 ]
@@ -1,4 +1,4 @@
-from typing import Optional, Literal
+from typing import Dict, Optional, Literal
 from pydantic import BaseModel
 
 
@@ -30,3 +30,45 @@ class OverallStats(BaseModel):
     leads: dict
     instagram_posts: dict
     reddit_posts: dict
+    cache: Optional[dict] = None
+    detection: Optional[dict] = None
+
+
+class TranslationWorkerStatus(BaseModel):
+    """State and progress of the background translation worker."""
+    running: bool
+    concurrency: int
+    batch_size: int
+    max_retries: int
+    started_at: Optional[str] = None
+    last_activity_at: Optional[str] = None
+    in_flight: int
+    pending: Dict[str, int]
+    processed: int
+    translated: int
+    already_english: int
+    skipped: int
+    errors: int
+    retries: int
+    rows_per_second: float
+
+
+class LanguageDetectionJobResponse(BaseModel):
+    """A resumable language detection job with its progress."""
+    id: int
+    mode: str
+    status: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    current_table: Optional[str] = None
+    last_id: int
+    total_rows: int
+    processed_rows: int
+    updated_rows: int
+    run_seconds: float
+    percent: float
+    rows_per_second: float
+    eta_seconds: Optional[float] = None
+    message: Optional[str] = None
+    error_message: Optional[str] = None
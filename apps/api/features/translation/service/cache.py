@@ -0,0 +1,240 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lib.database import execute_many, execute_query, fetch_all, fetch_one, transaction
+
+DEFAULT_MEMORY_ITEMS = 5000
+DEFAULT_MAX_ROWS = 200000
+# Share of rows dropped when the table outgrows its limit, so eviction runs
+# once per batch of inserts instead of on every insert.
+EVICTION_FRACTION = 0.1
+LOOKUP_CHUNK_SIZE = 500
+# A table hit only moves created_at forward when it is older than this, so
+# repeated reads of a hot entry do not each take the write lock.
+TOUCH_INTERVAL = timedelta(hours=1)
+
+# Target used for language detection results (value is the language code)
+DETECT_TARGET = "detect"
+
+
+def _get_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name, "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        value = default
+    return max(0, value)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    Translation and detection results keyed by (text hash, source, target).
+
+    An in-process LRU sits in front of the translation_cache table. The table
+    is capped at max_rows; when it grows past the cap the least recently used
+    entries are evicted (a row read from the table gets created_at moved
+    forward, at most once per TOUCH_INTERVAL). The table's row count is kept
+    in memory, so stats never count the table. A memory_items or max_rows of
+    0 disables that layer.
+    """
+
+    def __init__(self, memory_items: Optional[int] = None, max_rows: Optional[int] = None):
+        self.memory_items = (
+            memory_items if memory_items is not None
+            else _get_int_env("TRANSLATION_CACHE_MEMORY_ITEMS", DEFAULT_MEMORY_ITEMS)
+        )
+        self.max_rows = (
+            max_rows if max_rows is not None
+            else _get_int_env("TRANSLATION_CACHE_MAX_ROWS", DEFAULT_MAX_ROWS)
+        )
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._row_count: Optional[int] = None
+        self._counts = {"memory_hits": 0, "db_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _remember(self, key: Tuple[str, str, str], value: str) -> None:
+        if not self.memory_items:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: Iterable[str], source: str, target: str) -> Dict[str, str]:
+        """Return cached values for the given texts, keyed by text."""
+        found: Dict[str, str] = {}
+        missing: Dict[str, str] = {}
+        with self._lock:
+            for text in texts:
+                if text in found or text in missing:
+                    continue
+                key = (text_hash(text), source, target)
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    self._counts["memory_hits"] += 1
+                    found[text] = value
+                else:
+                    missing[key[0]] = text
+
+        stale: List[str] = []
+        if missing and self.max_rows:
+            touch_before = (datetime.utcnow() - TOUCH_INTERVAL).isoformat()
+            hashes = list(missing.keys())
+            for start in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+                chunk = hashes[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                try:
+                    rows = fetch_all(
+                        f"""SELECT text_hash, value, created_at FROM translation_cache
+                            WHERE source = ? AND target = ? AND text_hash IN ({placeholders})""",
+                        (source, target, *chunk)
+                    )
+                except sqlite3.Error as e:
+                    # A cache failure must never block translation
+                    print(f"Translation cache lookup error: {e}")
+                    break
+                with self._lock:
+                    for row in rows:
+                        text = missing.pop(row["text_hash"])
+                        found[text] = row["value"]
+                        self._remember((row["text_hash"], source, target), row["value"])
+                        self._counts["db_hits"] += 1
+                stale.extend(row["text_hash"] for row in rows if (row["created_at"] or "") < touch_before)
+        if stale:
+            self._touch(stale, source, target)
+
+        with self._lock:
+            self._counts["misses"] += len(missing)
+        return found
+
+    def _touch(self, hashes: List[str], source: str, target: str) -> None:
+        """Mark rows as just used so eviction keeps them; one executemany per call."""
+        now = datetime.utcnow().isoformat()
+        try:
+            execute_many(
+                """UPDATE translation_cache SET created_at = ?
+                   WHERE text_hash = ? AND source = ? AND target = ?""",
+                [(now, text_hash, source, target) for text_hash in hashes]
+            )
+        except sqlite3.Error as e:
+            print(f"Translation cache touch error: {e}")
+
+    def get(self, text: str, source: str, target: str) -> Optional[str]:
+        return self.get_many([text], source, target).get(text)
+
+    def put_many(self, items: List[Tuple[str, str]], source: str, target: str) -> None:
+        """Store (text, value) pairs for one source/target pair."""
+        if not items:
+            return
+        now = datetime.utcnow().isoformat()
+        rows = []
+        with self._lock:
+            for text, value in items:
+                key = (text_hash(text), source, target)
+                self._remember(key, value)
+                rows.append((key[0], source, target, value, now))
+        if not self.max_rows:
+            return
+
+        try:
+            with transaction():
+                # Inserted and updated separately so the row count only grows
+                # by the keys that were not stored yet
+                inserted = execute_many(
+                    """INSERT OR IGNORE INTO translation_cache
+                       (text_hash, source, target, value, created_at)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    rows
+                )
+                if inserted < len(rows):
+                    execute_many(
+                        """UPDATE translation_cache SET value = ?, created_at = ?
+                           WHERE text_hash = ? AND source = ? AND target = ?""",
+                        [(value, created_at, key, source, target)
+                         for key, source, target, value, created_at in rows]
+                    )
+                # Under the write lock, so eviction's recount cannot interleave
+                with self._lock:
+                    self._counts["writes"] += len(rows)
+                    if self._row_count is not None:
+                        self._row_count += inserted
+            self._evict_if_needed()
+        except sqlite3.Error as e:
+            print(f"Translation cache write error: {e}")
+
+    def put(self, text: str, value: str, source: str, target: str) -> None:
+        self.put_many([(text, value)], source, target)
+
+    def _count_rows(self) -> int:
+        """The table's row count, counted once and then kept by put_many and eviction."""
+        with self._lock:
+            if self._row_count is not None:
+                return self._row_count
+        row = fetch_one("SELECT COUNT(*) AS total FROM translation_cache")
+        with self._lock:
+            if self._row_count is None:
+                self._row_count = row["total"] if row else 0
+            return self._row_count
+
+    def _evict_if_needed(self) -> None:
+        if self._count_rows() <= self.max_rows:
+            return
+        # Count and delete in one write transaction, so concurrent writers
+        # that both saw the table over the cap evict only once
+        with transaction():
+            row = fetch_one("SELECT COUNT(*) AS total FROM translation_cache")
+            total = row["total"] if row else 0
+            excess = 0
+            if total > self.max_rows:
+                excess = total - self.max_rows + int(self.max_rows * EVICTION_FRACTION)
+                execute_query(
+                    """DELETE FROM translation_cache WHERE rowid IN (
+                           SELECT rowid FROM translation_cache ORDER BY created_at LIMIT ?
+                       )""",
+                    (excess,)
+                )
+            with self._lock:
+                self._counts["evictions"] += excess
+                self._row_count = total - excess
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self._counts)
+            memory_size = len(self._memory)
+        lookups = counts["memory_hits"] + counts["db_hits"] + counts["misses"]
+        try:
+            rows = self._count_rows() if self.max_rows else 0
+        except sqlite3.Error:
+            rows = 0
+        return {
+            **counts,
+            "hits": counts["memory_hits"] + counts["db_hits"],
+            "hit_rate": round((counts["memory_hits"] + counts["db_hits"]) / lookups, 4) if lookups else 0.0,
+            "memory_size": memory_size,
+            "memory_items": self.memory_items,
+            "rows": rows,
+            "max_rows": self.max_rows,
+        }
+
+
+_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    """Get or create the translation cache singleton."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TranslationCache()
+        return _cache
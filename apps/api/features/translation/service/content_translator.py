@@ -1,8 +1,29 @@
 from datetime import datetime
-from typing import Dict, Optional
-from lib.database.db import fetch_all, fetch_one, execute_query
+from typing import Callable, Dict, List, Optional, Tuple
+from lib.database.db import fetch_all, fetch_one, execute_many, transaction
+from lib.database.counters import get_table_status_counts
+from features.approval.service.rules import apply_rules_after_detection
+from .cache import get_translation_cache
 from .translator import get_translator
 
+# Rows translated together; their fields share batched LibreTranslate requests
+ROWS_PER_BATCH = 25
+# Rows per detect_languages call and UPDATE batch during language backfills
+DETECTION_CHUNK_SIZE = 500
+
+# table -> (columns loaded, text used for detection)
+DETECTION_SOURCES = {
+    # Use longest available text (summary > content > title)
+    "leads": (
+        "title, summary, content",
+        lambda lead: lead.get("summary") or lead.get("content") or lead.get("title"),
+    ),
+    "instagram_posts": ("caption", lambda post: post.get("caption")),
+    "reddit_posts": ("title", lambda post: post.get("title")),
+}
+# Tables whose approval rules wait for the detected language
+RULE_CONTENT_TYPES = {"leads": "lead", "instagram_posts": "instagram_post"}
+
 
 class ContentTranslator:
     """Business logic for translating content across all data sources."""
@@ -10,6 +31,203 @@ class ContentTranslator:
     def __init__(self):
         self.translator = get_translator()
 
+    @staticmethod
+    def _count_status(stats: Dict, status: str) -> None:
+        if status == "translated":
+            stats["translated"] += 1
+        elif status == "already_english":
+            stats["already_english"] += 1
+        elif status == "skipped":
+            stats["skipped"] += 1
+        else:
+            stats["errors"] += 1
+
+    @staticmethod
+    def _apply_language_rules(content_type: str, ids: List[int]) -> None:
+        """Decide approval rules for rows whose language detection just ran."""
+        try:
+            apply_rules_after_detection(content_type, ids)
+        except Exception as e:
+            # The detection is stored either way; the rows stay pending
+            print(f"Error applying approval rules to {content_type} {ids}: {e}")
+
+    @staticmethod
+    def _overall_status(statuses) -> str:
+        """Combine per-field statuses into the row status."""
+        # If ANY field was translated, mark the whole row as translated.
+        # If ALL fields were already English (or empty), mark as already_english.
+        if "translated" in statuses:
+            return "translated"
+        if all(s in ["already_english", "empty"] for s in statuses):
+            return "already_english"
+        return "error"
+
+    def _translate_rows(self, rows: List[Dict], fields: Tuple[str, ...],
+                        detection_text: Callable[[Dict], str]
+                        ) -> List[Tuple[List[Optional[str]], Optional[str], Optional[str], str]]:
+        """
+        Detect and translate the given fields of many rows in batched requests.
+
+        Languages missing on the rows are detected in one batched call; every
+        field of every row is then grouped by source language and translated
+        with translate_texts. Returns (translated values, detected language,
+        detection source, overall status) per row, in input order; the source
+        is None for rows that already had a language.
+        """
+        missing = [i for i, row in enumerate(rows) if not row.get("detected_language")]
+        detected = self.translator.detect_languages_with_source(
+            [detection_text(rows[i]) or "" for i in missing]
+        )
+        languages = [row.get("detected_language") for row in rows]
+        sources: List[Optional[str]] = [None] * len(rows)
+        for i, (language, source) in zip(missing, detected):
+            languages[i] = language
+            sources[i] = source
+
+        values: List[List[Optional[str]]] = [[None] * len(fields) for _ in rows]
+        statuses: List[List[str]] = [["empty"] * len(fields) for _ in rows]
+        groups: Dict[str, List[Tuple[int, int, str]]] = {}
+        for i, row in enumerate(rows):
+            for j, field in enumerate(fields):
+                text = row.get(field) or ""
+                if text.strip():
+                    # Use explicit source language for more accurate translation
+                    # (not auto-detect); English short-circuits in translate_texts
+                    groups.setdefault(languages[i] or "auto", []).append((i, j, text))
+
+        for language, items in groups.items():
+            translated = self.translator.translate_texts([text for _, _, text in items], source=language)
+            for (i, j, _), (value, status) in zip(items, translated):
+                values[i][j] = value
+                statuses[i][j] = status
+
+        return [
+            (values[i], languages[i], sources[i], self._overall_status(statuses[i]))
+            for i in range(len(rows))
+        ]
+
+    def translate_lead_rows(self, leads: List[Dict]) -> List[str]:
+        """
+        Detect (if needed) and translate leads in batched requests, store the
+        results and return each lead's translation status.
+
+        Expects the id, title, summary, content and detected_language columns.
+        """
+        if not leads:
+            return []
+        try:
+            results = self._translate_rows(
+                leads,
+                ("title", "summary", "content"),
+                # Longest available text gives the best detection
+                lambda lead: lead.get("summary") or lead.get("content") or lead.get("title")
+            )
+            now = datetime.utcnow().isoformat()
+            updates = []
+            for lead, (values, detected_lang, source, overall_status) in zip(leads, results):
+                if overall_status == "already_english":
+                    # Originals are shown when nothing needed translating
+                    values = [None, None, None]
+                updates.append((*values, detected_lang, source, overall_status, now, lead["id"]))
+
+            execute_many(
+                """UPDATE leads
+                   SET title_translated = ?,
+                       summary_translated = ?,
+                       content_translated = ?,
+                       detected_language = ?,
+                       language_source = COALESCE(?, language_source),
+                       translation_status = ?,
+                       translated_at = ?
+                   WHERE id = ?""",
+                updates
+            )
+            self._apply_language_rules(
+                "lead", [lead["id"] for lead in leads if not lead.get("detected_language")]
+            )
+            return [result[3] for result in results]
+
+        except Exception as e:
+            print(f"Error translating leads {[lead['id'] for lead in leads]}: {e}")
+            execute_many(
+                "UPDATE leads SET translation_status = ? WHERE id = ?",
+                [("error", lead["id"]) for lead in leads]
+            )
+            return ["error"] * len(leads)
+
+    def translate_instagram_post_rows(self, posts: List[Dict]) -> List[str]:
+        """Detect and translate Instagram captions in batched requests; returns statuses."""
+        statuses = ["skipped"] * len(posts)
+        captioned = [i for i, post in enumerate(posts) if post.get("caption")]
+        skipped = [("skipped", post["id"]) for post in posts if not post.get("caption")]
+        if skipped:
+            execute_many("UPDATE instagram_posts SET translation_status = ? WHERE id = ?", skipped)
+        if not captioned:
+            return statuses
+
+        rows = [posts[i] for i in captioned]
+        try:
+            results = self._translate_rows(rows, ("caption",), lambda post: post.get("caption"))
+            now = datetime.utcnow().isoformat()
+            updates = []
+            for i, post, (values, detected_lang, _, status) in zip(captioned, rows, results):
+                translated = None if status == "already_english" else values[0]
+                updates.append((translated, detected_lang, status, now, post["id"]))
+                statuses[i] = status
+
+            execute_many(
+                """UPDATE instagram_posts
+                   SET caption_translated = ?,
+                       detected_language = ?,
+                       translation_status = ?,
+                       translated_at = ?
+                   WHERE id = ?""",
+                updates
+            )
+            self._apply_language_rules(
+                "instagram_post", [post["id"] for post in rows if not post.get("detected_language")]
+            )
+        except Exception as e:
+            print(f"Error translating Instagram posts {[post['id'] for post in rows]}: {e}")
+            execute_many(
+                "UPDATE instagram_posts SET translation_status = ? WHERE id = ?",
+                [("error", post["id"]) for post in rows]
+            )
+            for i in captioned:
+                statuses[i] = "error"
+        return statuses
+
+    def translate_reddit_post_rows(self, posts: List[Dict]) -> List[str]:
+        """Translate Reddit titles and selftext in batched requests; returns statuses."""
+        if not posts:
+            return []
+        try:
+            # Detect language from original title for display purposes
+            results = self._translate_rows(posts, ("title", "selftext"), lambda post: post.get("title"))
+            now = datetime.utcnow().isoformat()
+            updates = [
+                (*values, detected_lang, overall_status, now, post["id"])
+                for post, (values, detected_lang, _, overall_status) in zip(posts, results)
+            ]
+            execute_many(
+                """UPDATE reddit_posts
+                   SET title_translated = ?,
+                       selftext_translated = ?,
+                       detected_language = ?,
+                       translation_status = ?,
+                       translated_at = ?
+                   WHERE id = ?""",
+                updates
+            )
+            return [result[3] for result in results]
+        except Exception as e:
+            print(f"Error translating Reddit posts {[post['id'] for post in posts]}: {e}")
+            execute_many(
+                "UPDATE reddit_posts SET translation_status = ? WHERE id = ?",
+                [("error", post["id"]) for post in posts]
+            )
+            return ["error"] * len(posts)
+
     def translate_leads(self, feed_id: Optional[int] = None, limit: Optional[int] = None) -> Dict:
         """
         Translate RSS leads (title, summary, content).
@@ -47,77 +265,16 @@ class ContentTranslator:
             "skipped": 0
         }
 
-        for lead in leads:
-            try:
-                # Get stored detected language, or detect if missing (for backward compatibility)
-                detected_lang = lead.get("detected_language")
-                if not detected_lang:
-                    detected_lang = self.translator.detect_language(lead.get("title", ""))
-
-                # Use explicit source language for more accurate translation (not auto-detect)
-                source_lang = detected_lang if detected_lang and detected_lang != "en" else "auto"
-
-                # Translate title
-                title_result, title_status = self.translator.translate_text(
-                    lead.get("title", ""),
-                    source=source_lang
-                )
-
-                # Translate summary
-                summary_result, summary_status = self.translator.translate_text(
-                    lead.get("summary") or "",
-                    source=source_lang
-                )
-
-                # Translate content
-                content_result, content_status = self.translator.translate_text(
-                    lead.get("content") or "",
-                    source=source_lang
-                )
-
-                # Determine overall status based on actual translation results
-                # If ANY field was translated, mark the whole lead as translated
-                # If ALL fields were already English, mark as already_english
-                translation_statuses = [title_status, summary_status, content_status]
-
-                if "translated" in translation_statuses:
-                    overall_status = "translated"
-                    stats["translated"] += 1
-                elif all(s in ["already_english", "empty"] for s in translation_statuses):
-                    overall_status = "already_english"
-                    stats["already_english"] += 1
-                else:
-                    overall_status = "error"
-                    stats["errors"] += 1
-
-                # Update database
-                execute_query(
-                    """UPDATE leads
-                       SET title_translated = ?,
-                           summary_translated = ?,
-                           content_translated = ?,
-                           detected_language = ?,
-                           translation_status = ?,
-                           translated_at = ?
-                       WHERE id = ?""",
-                    (title_result, summary_result, content_result, detected_lang,
-                     overall_status, datetime.utcnow().isoformat(), lead["id"])
-                )
-
-            except Exception as e:
-                print(f"Error translating lead {lead['id']}: {e}")
-                stats["errors"] += 1
-                execute_query(
-                    "UPDATE leads SET translation_status = ? WHERE id = ?",
-                    ("error", lead["id"])
-                )
+        for start in range(0, len(leads), ROWS_PER_BATCH):
+            for status in self.translate_lead_rows(leads[start:start + ROWS_PER_BATCH]):
+                self._count_status(stats, status)
 
         return stats
 
     def translate_instagram_posts(self, feed_id: Optional[int] = None, limit: Optional[int] = None) -> Dict:
         """Translate Instagram post captions."""
         query = """
-            SELECT id, caption
+            SELECT id, caption, detected_language
             FROM instagram_posts
             WHERE (translation_status IS NULL OR translation_status = 'pending')
         """
@@ -135,39 +292,9 @@ class ContentTranslator:
 
         stats = {"total": len(posts), "translated": 0, "already_english": 0, "errors": 0, "skipped": 0}
 
-        for post in posts:
-            caption = post.get("caption")
-            if not caption:
-                execute_query(
-                    "UPDATE instagram_posts SET translation_status = ? WHERE id = ?",
-                    ("skipped", post["id"])
-                )
-                stats["skipped"] += 1
-                continue
-
-            try:
-                detected_lang = self.translator.detect_language(caption)
-                translated, status = self.translator.translate_text(caption)
-
-                if status == "already_english":
-                    stats["already_english"] += 1
-                elif status == "translated":
-                    stats["translated"] += 1
-                else:
-                    stats["errors"] += 1
-
-                execute_query(
-                    """UPDATE instagram_posts
-                       SET caption_translated = ?,
-                           detected_language = ?,
-                           translation_status = ?,
-                           translated_at = ?
-                       WHERE id = ?""",
-                    (translated, detected_lang, status, datetime.utcnow().isoformat(), post["id"])
-                )
-            except Exception as e:
-                print(f"Error translating Instagram post {post['id']}: {e}")
-                stats["errors"] += 1
+        for start in range(0, len(posts), ROWS_PER_BATCH):
+            for status in self.translate_instagram_post_rows(posts[start:start + ROWS_PER_BATCH]):
+                self._count_status(stats, status)
 
         return stats
 
@@ -192,41 +319,9 @@ class ContentTranslator:
 
         stats = {"total": len(posts), "translated": 0, "already_english": 0, "errors": 0, "skipped": 0}
 
-        for post in posts:
-            try:
-                title_result, title_status = self.translator.translate_text(post.get("title", ""))
-                selftext_result, selftext_status = self.translator.translate_text(post.get("selftext") or "")
-
-                # Detect language from original title for display purposes
-                detected_lang = self.translator.detect_language(post.get("title", ""))
-
-                # Determine overall status based on actual translation results
-                translation_statuses = [title_status, selftext_status]
-
-                if "translated" in translation_statuses:
-                    overall_status = "translated"
-                    stats["translated"] += 1
-                elif all(s in ["already_english", "empty"] for s in translation_statuses):
-                    overall_status = "already_english"
-                    stats["already_english"] += 1
-                else:
-                    overall_status = "error"
-                    stats["errors"] += 1
-
-                execute_query(
-                    """UPDATE reddit_posts
-                       SET title_translated = ?,
-                           selftext_translated = ?,
-                           detected_language = ?,
-                           translation_status = ?,
-                           translated_at = ?
-                       WHERE id = ?""",
-                    (title_result, selftext_result, detected_lang,
-                     overall_status, datetime.utcnow().isoformat(), post["id"])
-                )
-            except Exception as e:
-                print(f"Error translating Reddit post {post['id']}: {e}")
-                stats["errors"] += 1
+        for start in range(0, len(posts), ROWS_PER_BATCH):
+            for status in self.translate_reddit_post_rows(posts[start:start + ROWS_PER_BATCH]):
+                self._count_status(stats, status)
 
         return stats
 
@@ -235,114 +330,98 @@ class ContentTranslator:
         stats = {
             "leads": self._get_table_stats("leads"),
             "instagram_posts": self._get_table_stats("instagram_posts"),
-            "reddit_posts": self._get_table_stats("reddit_posts")
+            "reddit_posts": self._get_table_stats("reddit_posts"),
+            "cache": get_translation_cache().stats(),
+            "detection": self.translator.detection_stats()
         }
         return stats
 
     def _get_table_stats(self, table: str) -> Dict:
-        """Get translation stats for a specific table."""
-        result = fetch_one(f"""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN translation_status = 'translated' THEN 1 ELSE 0 END) as translated,
-                SUM(CASE WHEN translation_status = 'already_english' THEN 1 ELSE 0 END) as already_english,
-                SUM(CASE WHEN translation_status = 'pending' OR translation_status IS NULL THEN 1 ELSE 0 END) as pending,
-                SUM(CASE WHEN translation_status = 'error' THEN 1 ELSE 0 END) as errors
-            FROM {table}
-        """)
-        return result or {}
+        """Get translation stats for a specific table from the status counters."""
+        counts = get_table_status_counts(table, "translation_status")
+        return {
+            "total": sum(counts.values()),
+            "translated": counts.get("translated", 0),
+            "already_english": counts.get("already_english", 0),
+            "pending": counts.get("pending", 0) + counts.get("", 0),
+            "skipped": counts.get("skipped", 0),
+            "errors": counts.get("error", 0),
+        }
+
+    def detect_table_languages(self, table: str, only_missing: bool, start_id: int = 0,
+                               on_chunk: Optional[Callable[[int, int, int], None]] = None) -> int:
+        """
+        Detect and store languages for one DETECTION_SOURCES table.
+
+        Rows after start_id are read by keyset in DETECTION_CHUNK_SIZE chunks;
+        each chunk is detected with one detect_languages call (local model
+        first, batched LibreTranslate requests for the rest) and written with
+        one executemany. on_chunk(last_id, rows_read, rows_updated) runs in
+        the same transaction as the chunk's writes, so a job cursor saved
+        there never gets ahead of the data. Returns the rows updated.
+        """
+        columns, detection_text = DETECTION_SOURCES[table]
+        updated = 0
+        last_id = start_id
+        missing_clause = "AND detected_language IS NULL" if only_missing else ""
+        assignments = "detected_language = ?"
+        if table == "leads":
+            # Record where each detection came from; leads that took their
+            # feed's profile language now have a real detection
+            assignments += ", language_source = ?"
+        while True:
+            rows = fetch_all(
+                f"""SELECT id, {columns} FROM {table}
+                    WHERE id > ? {missing_clause}
+                    ORDER BY id LIMIT ?""",
+                (last_id, DETECTION_CHUNK_SIZE)
+            )
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            detectable = [row for row in rows if detection_text(row)]
+            detected = self.translator.detect_languages_with_source([detection_text(row) for row in detectable])
+            if table == "leads":
+                updates = [(language, source, row["id"]) for row, (language, source) in zip(detectable, detected)]
+            else:
+                updates = [(language, row["id"]) for row, (language, _) in zip(detectable, detected)]
+            with transaction():
+                execute_many(f"UPDATE {table} SET {assignments} WHERE id = ?", updates)
+                if on_chunk:
+                    on_chunk(last_id, len(rows), len(detectable))
+            if only_missing and table in RULE_CONTENT_TYPES:
+                # Rows that had no language yet, as at ingest
+                self._apply_language_rules(RULE_CONTENT_TYPES[table], [row["id"] for row in detectable])
+            updated += len(detectable)
+        return updated
+
+    @staticmethod
+    def count_detection_rows(table: str, only_missing: bool, after_id: int = 0) -> int:
+        """Count the rows detect_table_languages would read after after_id."""
+        missing_clause = "AND detected_language IS NULL" if only_missing else ""
+        row = fetch_one(
+            f"SELECT COUNT(*) AS total FROM {table} WHERE id > ? {missing_clause}",
+            (after_id,)
+        )
+        return row["total"] if row else 0
+
+    def _detect_languages(self, only_missing: bool) -> Dict:
+        return {
+            f"{key}_updated": self.detect_table_languages(table, only_missing)
+            for table, key in (("leads", "leads"), ("instagram_posts", "instagram"), ("reddit_posts", "reddit"))
+        }
 
     def detect_missing_languages(self) -> Dict:
         """
         Detect language for all content across all sources that have NULL detected_language.
         This is useful for backfilling existing data.
         """
-        stats = {
-            "leads_updated": 0,
-            "instagram_updated": 0,
-            "reddit_updated": 0
-        }
-
-        # Detect language for RSS leads - use summary/content for better accuracy
-        leads = fetch_all("SELECT id, title, summary, content FROM leads WHERE detected_language IS NULL", ())
-        for lead in leads:
-            # Use longest available text (summary > content > title)
-            text_for_detection = lead.get("summary") or lead.get("content") or lead.get("title")
-            if text_for_detection:
-                detected_lang = self.translator.detect_language(text_for_detection)
-                execute_query(
-                    "UPDATE leads SET detected_language = ? WHERE id = ?",
-                    (detected_lang, lead["id"])
-                )
-                stats["leads_updated"] += 1
-
-        # Detect language for Instagram posts
-        instagram_posts = fetch_all("SELECT id, caption FROM instagram_posts WHERE detected_language IS NULL", ())
-        for post in instagram_posts:
-            if post.get("caption"):
-                detected_lang = self.translator.detect_language(post["caption"])
-                execute_query(
-                    "UPDATE instagram_posts SET detected_language = ? WHERE id = ?",
-                    (detected_lang, post["id"])
-                )
-                stats["instagram_updated"] += 1
-
-        # Detect language for Reddit posts
-        reddit_posts = fetch_all("SELECT id, title FROM reddit_posts WHERE detected_language IS NULL", ())
-        for post in reddit_posts:
-            if post.get("title"):
-                detected_lang = self.translator.detect_language(post["title"])
-                execute_query(
-                    "UPDATE reddit_posts SET detected_language = ? WHERE id = ?",
-                    (detected_lang, post["id"])
-                )
-                stats["reddit_updated"] += 1
-
-        return stats
+        return self._detect_languages(only_missing=True)
 
     def redetect_all_languages(self) -> Dict:
         """
         Force re-detect language for ALL content across all sources.
         Useful for fixing incorrect detections from previous runs.
         """
-        stats = {
-            "leads_updated": 0,
-            "instagram_updated": 0,
-            "reddit_updated": 0
-        }
-
-        # Re-detect language for ALL RSS leads using summary/content
-        leads = fetch_all("SELECT id, title, summary, content FROM leads", ())
-        for lead in leads:
-            text_for_detection = lead.get("summary") or lead.get("content") or lead.get("title")
-            if text_for_detection:
-                detected_lang = self.translator.detect_language(text_for_detection)
-                execute_query(
-                    "UPDATE leads SET detected_language = ? WHERE id = ?",
-                    (detected_lang, lead["id"])
-                )
-                stats["leads_updated"] += 1
-
-        # Re-detect language for ALL Instagram posts
-        instagram_posts = fetch_all("SELECT id, caption FROM instagram_posts", ())
-        for post in instagram_posts:
-            if post.get("caption"):
-                detected_lang = self.translator.detect_language(post["caption"])
-                execute_query(
-                    "UPDATE instagram_posts SET detected_language = ? WHERE id = ?",
-                    (detected_lang, post["id"])
-                )
-                stats["instagram_updated"] += 1
-
-        # Re-detect language for ALL Reddit posts
-        reddit_posts = fetch_all("SELECT id, title FROM reddit_posts", ())
-        for post in reddit_posts:
-            if post.get("title"):
-                detected_lang = self.translator.detect_language(post["title"])
-                execute_query(
-                    "UPDATE reddit_posts SET detected_language = ? WHERE id = ?",
-                    (detected_lang, post["id"])
-                )
-                stats["reddit_updated"] += 1
-
-        return stats
+        return self._detect_languages(only_missing=False)
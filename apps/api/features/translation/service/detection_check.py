@@ -0,0 +1,163 @@
+"""
+Check the local language detector on text it was not built from.
+
+IN_SET holds news sentences in the sample languages, OUT_OF_SET sentences in
+languages the samples do not cover (several of which score as a sample
+language with high confidence unless the out-of-distribution test rejects
+them). Run from apps/api:
+
+    python -m features.translation.service.detection_check
+
+Exits with status 1 when an out-of-set text gets a confident local answer,
+an in-set text or a SHORT_HEADLINES entry is detected as the wrong language,
+or fewer than MIN_LOCAL_SHARE of the in-set texts are answered locally.
+Short headlines may fall back to LibreTranslate, so they do not count
+toward the local share.
+
+Close relatives of a sample language (Catalan, Galician) are not listed:
+with samples this small they can still score as Spanish or Portuguese.
+"""
+
+import sys
+
+from .detector import LanguageDetector, get_min_confidence
+
+MIN_LOCAL_SHARE = 0.9
+
+IN_SET = {
+    "en": [
+        "The city council approved a new budget on Tuesday that increases spending on public transport and road repairs.",
+        "Heavy rain caused flooding in several neighbourhoods, and emergency services evacuated dozens of families overnight.",
+        "Shares of the technology company fell sharply after it warned that sales would be lower than expected.",
+        "The minister resigned after weeks of pressure over his handling of the health crisis.",
+    ],
+    "es": [
+        "El gobierno anunció este martes un nuevo paquete de medidas para frenar el aumento de los precios de los alimentos.",
+        "El chef peruano presentó su nuevo restaurante en Lima, con una carta basada en productos de la costa y la sierra.",
+        "Miles de personas salieron a las calles para protestar contra la reforma de las pensiones.",
+        "La empresa minera suspendió sus operaciones tras el accidente ocurrido el fin de semana.",
+    ],
+    "pt": [
+        "O governo anunciou nesta terça-feira um novo pacote de medidas para conter a alta dos preços dos alimentos.",
+        "As chuvas fortes provocaram enchentes em vários bairros e centenas de famílias precisaram deixar suas casas.",
+        "A seleção brasileira venceu a partida por dois a zero e continua na briga pela classificação.",
+        "Milhares de pessoas saíram às ruas para protestar contra a reforma da previdência.",
+    ],
+    "fr": [
+        "Le gouvernement a annoncé mardi un nouveau plan pour freiner la hausse des prix de l'alimentation.",
+        "Le restaurant, ouvert l'année dernière, est devenu l'une des adresses les plus prisées de la ville.",
+        "Les scientifiques avertissent que le réchauffement des océans aura des conséquences sur la pêche.",
+        "Des milliers de personnes ont manifesté dans les rues contre la réforme des retraites.",
+    ],
+    "it": [
+        "Il governo ha annunciato martedì un nuovo pacchetto di misure per frenare l'aumento dei prezzi dei generi alimentari.",
+        "Il ristorante, aperto l'anno scorso, è diventato uno dei locali più frequentati della città.",
+        "Il sindaco ha promesso di migliorare i trasporti pubblici prima della fine del suo mandato.",
+        "L'azienda ha sospeso le attività dopo l'incidente avvenuto nel fine settimana.",
+    ],
+    "de": [
+        "Die Regierung hat am Dienstag ein neues Maßnahmenpaket angekündigt, um den Anstieg der Lebensmittelpreise zu bremsen.",
+        "Die Nationalmannschaft gewann das Spiel mit zwei zu null und bleibt im Rennen um die Qualifikation.",
+        "Der Bürgermeister versprach, den öffentlichen Nahverkehr vor dem Ende seiner Amtszeit zu verbessern.",
+        "Tausende Menschen gingen auf die Straße, um gegen die Rentenreform zu protestieren.",
+    ],
+}
+
+# Headline-length texts in the sample languages of the food feeds; several
+# scored as Italian with high confidence before short texts needed a wider
+# margin.
+SHORT_HEADLINES = {
+    "es": [
+        "Receta de ceviche peruano con leche de tigre",
+        "Chef peruano gana premio internacional",
+        "Tres postres limeños para el fin de semana",
+        "Festival del cacao reúne a productores de la selva",
+        "Arroz con pato: el secreto está en el culantro",
+        "Ganadores del concurso nacional de panadería",
+    ],
+    "pt": [
+        "Receita de feijoada completa para o domingo",
+        "Chef brasileiro ganha prêmio internacional",
+        "Três sobremesas mineiras para o fim de semana",
+        "Festival do cacau reúne produtores da Bahia",
+        "Pão de queijo: o segredo está no polvilho",
+        "Vencedores do concurso nacional de padarias",
+    ],
+}
+
+OUT_OF_SET = {
+    "nl": [
+        "De regering heeft dinsdag een nieuw pakket maatregelen aangekondigd om de stijging van de voedselprijzen af te remmen.",
+        "Het restaurant, dat vorig jaar openging, is uitgegroeid tot een van de populairste adressen van de stad.",
+        "De burgemeester beloofde het openbaar vervoer te verbeteren voor het einde van zijn ambtstermijn.",
+    ],
+    "ro": [
+        "Guvernul a anunțat marți un nou pachet de măsuri pentru a frâna creșterea prețurilor la alimente.",
+        "Restaurantul, deschis anul trecut, a devenit unul dintre cele mai căutate locuri din oraș.",
+        "Oamenii de știință avertizează că încălzirea oceanelor va afecta pescuitul în următorii ani.",
+    ],
+    "sv": [
+        "Regeringen presenterade på tisdagen ett nytt åtgärdspaket för att bromsa de stigande matpriserna.",
+        "Forskare varnar för att uppvärmningen av haven kommer att påverka fisket under de kommande åren.",
+        "Borgmästaren lovade att förbättra kollektivtrafiken innan mandatperioden är slut.",
+    ],
+    "da": [
+        "Regeringen præsenterede tirsdag en ny pakke af tiltag for at bremse de stigende fødevarepriser.",
+        "Kraftig regn skabte oversvømmelser i flere bydele, og hundredvis af familier måtte forlade deres hjem.",
+    ],
+    "pl": [
+        "Rząd ogłosił we wtorek nowy pakiet działań, które mają zahamować wzrost cen żywności.",
+        "Restauracja, otwarta w zeszłym roku, stała się jednym z najpopularniejszych miejsc w mieście.",
+    ],
+}
+
+
+def run_check() -> int:
+    detector = LanguageDetector()
+    min_confidence = get_min_confidence()
+    failures = 0
+
+    local = 0
+    total = 0
+    for expected, texts in IN_SET.items():
+        for text in texts:
+            total += 1
+            language, confidence = detector.score(text)
+            if not language or confidence < min_confidence:
+                continue
+            if language != expected:
+                failures += 1
+                print(f"❌ {expected} text detected as {language} ({confidence:.3f}): {text[:60]}")
+            else:
+                local += 1
+
+    for expected, texts in SHORT_HEADLINES.items():
+        for text in texts:
+            language, confidence = detector.score(text)
+            if language and confidence >= min_confidence and language != expected:
+                failures += 1
+                print(f"❌ {expected} headline detected as {language} ({confidence:.3f}): {text}")
+
+    for actual, texts in OUT_OF_SET.items():
+        for text in texts:
+            language, confidence = detector.score(text)
+            if language and confidence >= min_confidence:
+                failures += 1
+                print(f"❌ {actual} text answered locally as {language} ({confidence:.3f}): {text[:60]}")
+
+    share = local / total if total else 0.0
+    print(f"In-set texts answered locally: {local}/{total} "
+          f"(trigram threshold {detector.min_trigram_log_likelihood:.3f})")
+    if share < MIN_LOCAL_SHARE:
+        failures += 1
+        print(f"❌ Local share {share:.2f} is below {MIN_LOCAL_SHARE}")
+
+    if failures:
+        print(f"❌ {failures} problem(s) found")
+        return 1
+    print("✅ Out-of-set languages fall back to LibreTranslate")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_check())
@@ -0,0 +1,195 @@
+import sqlite3
+import time
+from datetime import datetime
+from threading import Lock, Thread
+from typing import List, Optional
+
+from lib.database import execute_query, fetch_all, fetch_one, transaction
+from .content_translator import DETECTION_SOURCES, ContentTranslator
+
+_running_jobs = set()
+_running_lock = Lock()
+
+
+class DetectionJobActiveError(Exception):
+    """A language detection job is already queued or running."""
+
+    def __init__(self, job_id: int):
+        super().__init__(f"Language detection already running (job_id={job_id}).")
+        self.job_id = job_id
+
+
+def _update_job(job_id: int, **fields: object) -> None:
+    if not fields:
+        return
+    columns = ", ".join([f"{key} = ?" for key in fields.keys()])
+    params = list(fields.values()) + [job_id]
+    execute_query(f"UPDATE language_detection_jobs SET {columns} WHERE id = ?", tuple(params))
+
+
+def _with_progress(job: Optional[dict]) -> Optional[dict]:
+    """Add percent, rows_per_second and eta_seconds to a job row."""
+    if not job:
+        return None
+    total = job["total_rows"] or 0
+    processed = job["processed_rows"] or 0
+    run_seconds = job["run_seconds"] or 0.0
+    rate = processed / run_seconds if run_seconds else 0.0
+    remaining = max(total - processed, 0)
+    if total:
+        job["percent"] = round(min(processed / total, 1.0) * 100, 1)
+    else:
+        job["percent"] = 100.0 if job["status"] == "completed" else 0.0
+    job["rows_per_second"] = round(rate, 2)
+    job["eta_seconds"] = round(remaining / rate, 1) if rate and job["status"] in ("queued", "running") else None
+    return job
+
+
+def _raise_if_active() -> None:
+    """Raise DetectionJobActiveError for a queued or running job; call inside the write transaction."""
+    active = fetch_one(
+        "SELECT id FROM language_detection_jobs WHERE status IN ('queued', 'running') ORDER BY id DESC LIMIT 1"
+    )
+    if active:
+        raise DetectionJobActiveError(active["id"])
+
+
+def create_language_detection_job(force: bool = False) -> int:
+    """
+    Queue a detection job; force re-detects every row instead of NULL ones.
+
+    The active-job check and the INSERT share one BEGIN IMMEDIATE
+    transaction, so two concurrent requests cannot both queue a job.
+    """
+    only_missing = not force
+    total = sum(
+        ContentTranslator.count_detection_rows(table, only_missing)
+        for table in DETECTION_SOURCES
+    )
+    with transaction():
+        _raise_if_active()
+        return execute_query(
+            """INSERT INTO language_detection_jobs (mode, status, total_rows, message)
+               VALUES (?, 'queued', ?, ?)""",
+            ("all" if force else "missing", total, "Queued")
+        )
+
+
+def get_job(job_id: int) -> Optional[dict]:
+    return _with_progress(fetch_one("SELECT * FROM language_detection_jobs WHERE id = ?", (job_id,)))
+
+
+def list_jobs(limit: int = 20, offset: int = 0) -> List[dict]:
+    jobs = fetch_all(
+        "SELECT * FROM language_detection_jobs ORDER BY id DESC LIMIT ? OFFSET ?",
+        (limit, offset),
+    )
+    return [_with_progress(job) for job in jobs]
+
+
+def get_active_job() -> Optional[dict]:
+    return _with_progress(fetch_one(
+        "SELECT * FROM language_detection_jobs WHERE status IN ('queued', 'running') ORDER BY id DESC LIMIT 1",
+        (),
+    ))
+
+
+def get_current_job() -> Optional[dict]:
+    """Get the active job, or the latest finished one."""
+    job = get_active_job()
+    if job:
+        return job
+    return _with_progress(fetch_one("SELECT * FROM language_detection_jobs ORDER BY id DESC LIMIT 1", ()))
+
+
+def start_language_detection_job(job_id: int) -> bool:
+    """Run a job in a background thread; returns False if it is already running here."""
+    with _running_lock:
+        if job_id in _running_jobs:
+            return False
+        _running_jobs.add(job_id)
+    thread = Thread(target=_run_language_detection_job, args=(job_id,), daemon=True)
+    thread.start()
+    return True
+
+
+def resume_language_detection_jobs() -> List[int]:
+    """
+    Restart jobs left queued or running by a previous process.
+
+    Called on startup; each job continues from its saved table and id cursor.
+    """
+    try:
+        jobs = fetch_all(
+            "SELECT id FROM language_detection_jobs WHERE status IN ('queued', 'running') ORDER BY id",
+            (),
+        )
+    except sqlite3.Error as e:
+        # Table missing until migrations run; nothing to resume
+        print(f"Could not resume language detection jobs: {e}")
+        return []
+    return [job["id"] for job in jobs if start_language_detection_job(job["id"])]
+
+
+def resume_language_detection_job(job_id: int) -> None:
+    """Queue a failed job again from its saved cursor."""
+    with transaction():
+        _raise_if_active()
+        _update_job(job_id, status="queued", error_message=None, finished_at=None, message="Resuming")
+    start_language_detection_job(job_id)
+
+
+def _run_language_detection_job(job_id: int) -> None:
+    try:
+        job = fetch_one("SELECT * FROM language_detection_jobs WHERE id = ?", (job_id,))
+        if not job:
+            return
+        only_missing = job["mode"] == "missing"
+        tables = list(DETECTION_SOURCES)
+        start_index = tables.index(job["current_table"]) if job["current_table"] in tables else 0
+        _update_job(
+            job_id,
+            status="running",
+            started_at=job["started_at"] or datetime.utcnow().isoformat(),
+            message="Detecting languages",
+        )
+
+        translator = ContentTranslator()
+        for table in tables[start_index:]:
+            start_id = (job["last_id"] or 0) if table == job["current_table"] else 0
+            _update_job(job_id, current_table=table, last_id=start_id, message=f"Detecting {table}")
+            checkpoint = [time.perf_counter()]
+
+            def save_progress(last_id: int, rows_read: int, rows_updated: int) -> None:
+                now = time.perf_counter()
+                execute_query(
+                    """UPDATE language_detection_jobs
+                       SET last_id = ?,
+                           processed_rows = processed_rows + ?,
+                           updated_rows = updated_rows + ?,
+                           run_seconds = run_seconds + ?
+                       WHERE id = ?""",
+                    (last_id, rows_read, rows_updated, now - checkpoint[0], job_id)
+                )
+                checkpoint[0] = now
+
+            translator.detect_table_languages(table, only_missing, start_id, save_progress)
+
+        _update_job(
+            job_id,
+            status="completed",
+            finished_at=datetime.utcnow().isoformat(),
+            message="Language detection complete",
+        )
+    except Exception as e:
+        print(f"Language detection job {job_id} failed: {e}")
+        _update_job(
+            job_id,
+            status="failed",
+            finished_at=datetime.utcnow().isoformat(),
+            error_message=str(e),
+            message="Language detection failed",
+        )
+    finally:
+        with _running_lock:
+            _running_jobs.discard(job_id)
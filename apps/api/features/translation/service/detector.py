@@ -0,0 +1,212 @@
+import math
+import os
+from itertools import repeat
+from operator import mul
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SAMPLES_DIR = Path(__file__).parent / "language_samples"
+NGRAM_SIZES = (1, 2, 3)
+SMOOTHING = 0.5
+DEFAULT_MIN_CONFIDENCE = 0.9
+# Posteriors are computed on at most this many n-grams' worth of evidence;
+# a plain naive Bayes posterior saturates at 1.0 for any paragraph, which
+# would make the confidence threshold meaningless.
+EVIDENCE_CAP = 24
+# Below this share of n-grams seen in the samples (other scripts, code, URLs)
+# the text is handed to LibreTranslate regardless of the scores.
+MIN_COVERAGE = 0.6
+MIN_LETTERS = 12
+# Out-of-distribution test: a language outside the samples still gets a
+# confident winner (Dutch scores as German), so the winner must also explain
+# the text. Its mean trigram log-likelihood under the winning language alone
+# must reach the CALIBRATION_QUANTILE of the same measure over held-out
+# sample lines, and the winner must beat the runner-up by MIN_MARGIN nats per
+# n-gram. Texts failing either are left to LibreTranslate.
+CALIBRATION_QUANTILE = 0.02
+MIN_MARGIN = 0.1
+# A headline-length text can favour the wrong language by a wide per-n-gram
+# margin ("Chef peruano gana premio internacional" scores as Italian), so
+# below SHORT_TEXT_LETTERS letters the required margin grows in proportion:
+# MIN_MARGIN * SHORT_TEXT_LETTERS / letters.
+SHORT_TEXT_LETTERS = 100
+
+_WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+_URL_RE = re.compile(r"https?://\S+|www\.\S+|[@#]\w+")
+
+
+def _get_float_env(name: str, default: float) -> float:
+    raw = os.getenv(name, "")
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        value = default
+    return value if 0 < value <= 1 else default
+
+
+def is_local_detection_enabled() -> bool:
+    return os.getenv("LOCAL_LANGUAGE_DETECTION", "true").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _ngrams(text: str) -> Counter:
+    """Count character n-grams of the lower-cased words, padded with spaces."""
+    counts: Counter = Counter()
+    for word in _WORD_RE.findall(_URL_RE.sub(" ", text.lower())):
+        padded = f" {word} "
+        for size in NGRAM_SIZES:
+            for start in range(len(padded) - size + 1):
+                gram = padded[start:start + size]
+                if gram != " " * size:
+                    counts[gram] += 1
+    return counts
+
+
+class LanguageDetector:
+    """
+    In-process character n-gram language detector.
+
+    A multinomial naive Bayes model over 1-3 character n-grams is built from
+    the sample texts in language_samples/ (one <code>.txt per language).
+    Each language has a table of log probabilities over the shared n-gram
+    vocabulary, so scoring a text is one sparse sum per language over the
+    n-grams it contains; no network call is made. Texts in languages the
+    samples do not cover are rejected by the out-of-distribution test above.
+    """
+
+    def __init__(self, samples_dir: Path = SAMPLES_DIR):
+        self.languages: List[str] = []
+        self._vocabulary: set = set()
+        self._tables: List[Dict[str, float]] = []
+        self._trigram_tables: List[Dict[str, float]] = []
+        self._trigram_unseen: List[float] = []
+        self.min_trigram_log_likelihood = -math.inf
+        self._build(samples_dir)
+
+    def _build(self, samples_dir: Path) -> None:
+        lines: Dict[str, List[str]] = {}
+        counts: Dict[str, Counter] = {}
+        for path in sorted(samples_dir.glob("*.txt")):
+            text = path.read_text(encoding="utf-8")
+            lines[path.stem] = [line for line in text.splitlines() if line.strip()]
+            counts[path.stem] = _ngrams(text)
+        self.languages = list(counts)
+
+        vocabulary = set()
+        for language_counts in counts.values():
+            vocabulary.update(language_counts)
+        self._vocabulary = vocabulary
+        self._tables = []
+        for language in self.languages:
+            total = sum(counts[language].values()) + SMOOTHING * len(vocabulary)
+            self._tables.append({
+                gram: math.log((counts[language][gram] + SMOOTHING) / total)
+                for gram in vocabulary
+            })
+
+        # Trigram-only model per language (plus one slot for unseen trigrams)
+        trigram_slots = sum(1 for gram in vocabulary if len(gram) == 3) + 1
+        trigram_totals = []
+        for language in self.languages:
+            trigrams = {gram: count for gram, count in counts[language].items() if len(gram) == 3}
+            total = sum(trigrams.values()) + SMOOTHING * trigram_slots
+            trigram_totals.append(total)
+            self._trigram_tables.append({
+                gram: math.log((count + SMOOTHING) / total) for gram, count in trigrams.items()
+            })
+            self._trigram_unseen.append(math.log(SMOOTHING / total))
+
+        self.min_trigram_log_likelihood = self._calibrate(lines, counts, trigram_totals)
+
+    def _calibrate(self, lines: Dict[str, List[str]], counts: Dict[str, Counter], totals: List[float]) -> float:
+        """
+        Threshold for _trigram_log_likelihood, from held-out sample lines.
+
+        Each line is scored against its own language with the line's trigrams
+        taken out of the counts, as if it were new text.
+        """
+        values = []
+        for index, language in enumerate(self.languages):
+            for line in lines[language]:
+                trigrams = {gram: count for gram, count in _ngrams(line).items() if len(gram) == 3}
+                size = sum(trigrams.values())
+                if not size:
+                    continue
+                total = totals[index] - size
+                values.append(sum(
+                    count * math.log((counts[language][gram] - count + SMOOTHING) / total)
+                    for gram, count in trigrams.items()
+                ) / size)
+        if not values:
+            return -math.inf
+        values.sort()
+        return values[int(len(values) * CALIBRATION_QUANTILE)]
+
+    def _trigram_log_likelihood(self, index: int, grams: Counter) -> float:
+        """Mean log-likelihood of the text's trigrams under one language."""
+        trigrams = [(gram, count) for gram, count in grams.items() if len(gram) == 3]
+        if not trigrams:
+            return -math.inf
+        keys, counts = zip(*trigrams)
+        table = self._trigram_tables[index]
+        total = sum(map(mul, counts, map(table.get, keys, repeat(self._trigram_unseen[index]))))
+        return total / sum(counts)
+
+    def score(self, text: str) -> Tuple[Optional[str], float]:
+        """Return (language code, confidence) for one text; (None, 0.0) when undecidable."""
+        return self.score_many([text])[0]
+
+    def score_many(self, texts: List[str]) -> List[Tuple[Optional[str], float]]:
+        """
+        Score several texts; returns (language code, confidence) per text.
+
+        (None, 0.0) means the text is too short, mostly unknown n-grams, too
+        close between two languages or unlike any sample language.
+        """
+        return [self._score(text) for text in texts]
+
+    def _score(self, text: str) -> Tuple[Optional[str], float]:
+        grams = _ngrams(text or "")
+        letters = sum(count for gram, count in grams.items() if len(gram) == 1)
+        if not self.languages or letters < MIN_LETTERS:
+            return None, 0.0
+
+        known = [(gram, count) for gram, count in grams.items() if gram in self._vocabulary]
+        known_count = sum(count for _, count in known)
+        if not known or known_count < sum(grams.values()) * MIN_COVERAGE:
+            return None, 0.0
+
+        keys, counts = zip(*known)
+        totals = [sum(map(mul, counts, map(table.__getitem__, keys))) for table in self._tables]
+        ranked = sorted(range(len(totals)), key=totals.__getitem__, reverse=True)
+        best = ranked[0]
+        min_margin = MIN_MARGIN * max(1.0, SHORT_TEXT_LETTERS / letters)
+        if len(ranked) > 1 and (totals[best] - totals[ranked[1]]) / known_count < min_margin:
+            return None, 0.0
+        if self._trigram_log_likelihood(best, grams) < self.min_trigram_log_likelihood:
+            return None, 0.0
+
+        # Per-n-gram average scaled to capped evidence, then softmax
+        weight = min(known_count, EVIDENCE_CAP) / known_count
+        scaled = [total * weight for total in totals]
+        exps = [math.exp(value - scaled[best]) for value in scaled]
+        return self.languages[best], exps[best] / sum(exps)
+
+
+_detector: Optional[LanguageDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_language_detector() -> LanguageDetector:
+    """Get or create the language detector singleton (built on first use)."""
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = LanguageDetector()
+        return _detector
+
+
+def get_min_confidence() -> float:
+    return _get_float_env("LOCAL_DETECTION_MIN_CONFIDENCE", DEFAULT_MIN_CONFIDENCE)
@@ -1,10 +1,84 @@
 import os
-from typing import Optional, Dict, Tuple
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
 from dotenv import load_dotenv
 import requests
 
+from .cache import DETECT_TARGET, get_translation_cache
+from .detector import get_language_detector, get_min_confidence, is_local_detection_enabled
+
 load_dotenv()
 
+DEFAULT_BATCH_MAX_ITEMS = 25
+DEFAULT_BATCH_MAX_CHARS = 10000
+DEFAULT_CHUNK_MAX_CHARS = 2000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT_SECONDS = 60
+
+# Boundaries tried in order when splitting long texts: paragraphs, lines,
+# sentences (keeping closing quotes/brackets with the sentence), words
+_SPLIT_PATTERNS = [
+    re.compile(r"\n\s*\n"),
+    re.compile(r"\n"),
+    re.compile(r"(?<=[.!?…;])[\"'”’»)\]]*\s+"),
+    re.compile(r"\s+"),
+]
+_EDGE_WHITESPACE_RE = re.compile(r"^(\s*)(.*?)(\s*)$", re.DOTALL)
+
+
+def _get_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name, "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        value = default
+    return value if value > 0 else default
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into pieces of at most max_chars at the coarsest boundary
+    available. Separators stay attached to the preceding piece, so the
+    pieces concatenate back to the original text.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    for pattern in _SPLIT_PATTERNS:
+        parts = []
+        start = 0
+        for match in pattern.finditer(text):
+            if match.end() > start:
+                parts.append(text[start:match.end()])
+                start = match.end()
+        if start < len(text):
+            parts.append(text[start:])
+        if len(parts) < 2:
+            continue
+
+        pieces = []
+        current = ""
+        for part in parts:
+            if len(part) > max_chars:
+                if current:
+                    pieces.append(current)
+                pieces.extend(split_text(part, max_chars))
+                # Let following short parts (often just the separator) join the last piece
+                current = pieces.pop()
+            elif len(current) + len(part) > max_chars:
+                pieces.append(current)
+                current = part
+            else:
+                current += part
+        if current:
+            pieces.append(current)
+        return pieces
+
+    # No boundary at all (e.g. one huge token): cut at the limit
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
 
 class TranslationService:
     """Service for translating text using LibreTranslate API."""
@@ -13,18 +87,97 @@ class TranslationService:
         """Initialize with LibreTranslate host URL."""
         self.host = host or os.getenv("LIBRETRANSLATE_URL", "http://localhost:5001")
         self.api_key = os.getenv("LIBRETRANSLATE_API_KEY")
+        self.batch_max_items = _get_int_env("LIBRETRANSLATE_BATCH_MAX_ITEMS", DEFAULT_BATCH_MAX_ITEMS)
+        self.batch_max_chars = _get_int_env("LIBRETRANSLATE_BATCH_MAX_CHARS", DEFAULT_BATCH_MAX_CHARS)
+        self.chunk_max_chars = _get_int_env("LIBRETRANSLATE_CHUNK_MAX_CHARS", DEFAULT_CHUNK_MAX_CHARS)
+        self.max_concurrency = _get_int_env("LIBRETRANSLATE_CONCURRENCY", DEFAULT_CONCURRENCY)
+        self.timeout = _get_int_env("LIBRETRANSLATE_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS)
+        self.cache = get_translation_cache()
+        self.local_detection = is_local_detection_enabled()
+        self.min_confidence = get_min_confidence()
+        self._detection_lock = threading.Lock()
+        self._detection_counts = {"local": 0, "remote": 0}
+
+    def _chunks(self, indexed_texts: List[Tuple[int, str]]) -> List[List[Tuple[int, str]]]:
+        """Split (index, text) pairs into requests bounded by item count and characters."""
+        chunks = []
+        current: List[Tuple[int, str]] = []
+        current_chars = 0
+        for item in indexed_texts:
+            length = len(item[1])
+            if current and (len(current) >= self.batch_max_items
+                            or current_chars + length > self.batch_max_chars):
+                chunks.append(current)
+                current = []
+                current_chars = 0
+            current.append(item)
+            current_chars += length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _detect_locally(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Score texts with the bundled n-gram detector.
+
+        Returns a code for every text detected with at least min_confidence
+        and None for the rest, which callers send to LibreTranslate.
+        """
+        if not self.local_detection or not texts:
+            return [None] * len(texts)
+        scores = get_language_detector().score_many(texts)
+        results = [
+            language if language and confidence >= self.min_confidence else None
+            for language, confidence in scores
+        ]
+        local = sum(1 for language in results if language)
+        with self._detection_lock:
+            self._detection_counts["local"] += local
+            self._detection_counts["remote"] += len(texts) - local
+        return results
+
+    def detection_stats(self) -> Dict:
+        """Return how many detections were answered locally vs by LibreTranslate."""
+        with self._detection_lock:
+            counts = dict(self._detection_counts)
+        total = counts["local"] + counts["remote"]
+        return {
+            "local_enabled": self.local_detection,
+            "min_confidence": self.min_confidence,
+            **counts,
+            "local_rate": round(counts["local"] / total, 4) if total else 0.0,
+        }
 
     def detect_language(self, text: str) -> Optional[str]:
-        """Detect language of text. Returns language code or None."""
+        """
+        Detect language of text. Returns language code or None.
+
+        The local detector answers when it is confident; otherwise the cache
+        and then LibreTranslate are used.
+        """
         if not text or not text.strip():
             return None
 
+        local = self._detect_locally([text])[0]
+        if local:
+            return local
+
+        cached = self.cache.get(text, "auto", DETECT_TARGET)
+        if cached:
+            return cached
+
+        detected = self._request_detect(text)
+        if detected:
+            self.cache.put(text, detected, "auto", DETECT_TARGET)
+        return detected
+
+    def _request_detect(self, text: str) -> Optional[str]:
         try:
             payload = {"q": text}
             if self.api_key:
                 payload["api_key"] = self.api_key
 
-            response = requests.post(f"{self.host}/detect", json=payload)
+            response = requests.post(f"{self.host}/detect", json=payload, timeout=self.timeout)
             response.raise_for_status()
             result = response.json()
             # Result format: [{"confidence": 0.99, "language": "en"}]
@@ -38,6 +191,10 @@ class TranslationService:
         """
         Translate text to target language.
 
+        Translations with an explicit source language are served from and
+        stored in the translation cache. Long texts are split and translated
+        piece by piece (see translate_texts).
+
         Returns:
             Tuple of (translated_text, status)
             status: "translated", "already_english", "error", "empty"
@@ -45,15 +202,29 @@ class TranslationService:
         if not text or not text.strip():
             return None, "empty"
 
+        # If explicit source language is provided and it's English, skip translation
+        if source == "en":
+            return text, "already_english"
+
+        if len(text) > self.chunk_max_chars:
+            return self.translate_texts([text], source, target)[0]
+
+        if source != "auto":
+            cached = self.cache.get(text, source, target)
+            if cached is not None:
+                return cached, "translated"
+
+        translated, status = self._translate_uncached(text, source, target)
+        if status == "translated" and source != "auto":
+            self.cache.put(text, translated, source, target)
+        return translated, status
+
+    def _translate_uncached(self, text: str, source: str, target: str) -> Tuple[Optional[str], str]:
         # Only detect language if source is "auto" (not explicitly provided)
         if source == "auto":
             detected_lang = self.detect_language(text)
             if detected_lang == "en":
                 return text, "already_english"
-        else:
-            # If explicit source language is provided and it's English, skip translation
-            if source == "en":
-                return text, "already_english"
 
         try:
             payload = {
@@ -65,7 +236,7 @@ class TranslationService:
             if self.api_key:
                 payload["api_key"] = self.api_key
 
-            response = requests.post(f"{self.host}/translate", json=payload)
+            response = requests.post(f"{self.host}/translate", json=payload, timeout=self.timeout)
             response.raise_for_status()
             result = response.json()
             translated = result.get("translatedText", text)
@@ -74,40 +245,242 @@ class TranslationService:
             print(f"Translation error: {e}")
             return None, "error"
 
+    def detect_languages(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Detect the language of several texts with as few requests as possible.
+
+        Texts the local detector is confident about never leave the process.
+        The rest go to LibreTranslate with q as an array. LibreTranslate versions that only accept a single
+        string for /detect answer with an error or a flat list; those chunks
+        fall back to one request per text. Returns codes in input order.
+        """
+        return [language for language, _ in self.detect_languages_with_source(texts)]
+
+    def detect_languages_with_source(self, texts: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Like detect_languages, but returns (code, source) pairs.
+
+        source is 'local' when the bundled detector answered (which means the
+        text passed its out-of-distribution test), 'remote' when the code came
+        from LibreTranslate or its cached answer, and None when nothing was
+        detected.
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        pending = [(i, text) for i, text in enumerate(texts) if text and text.strip()]
+
+        local = self._detect_locally([text for _, text in pending])
+        local_indexes = set()
+        for (index, _), language in zip(pending, local):
+            results[index] = language
+            if language:
+                local_indexes.add(index)
+        pending = [item for item, language in zip(pending, local) if not language]
+
+        cached = self.cache.get_many([text for _, text in pending], "auto", DETECT_TARGET)
+        for index, text in pending:
+            results[index] = cached.get(text)
+        pending = [(i, text) for i, text in pending if text not in cached]
+
+        for chunk in self._chunks(pending):
+            if len(chunk) == 1:
+                index, text = chunk[0]
+                results[index] = self._request_detect(text)
+                continue
+
+            payload = {"q": [text for _, text in chunk]}
+            if self.api_key:
+                payload["api_key"] = self.api_key
+            try:
+                response = requests.post(f"{self.host}/detect", json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                result = response.json()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                print(f"Language detection error: {e}")
+                continue
+            except Exception:
+                result = None
+
+            # Batched format: [[{"confidence": 99, "language": "en"}], ...]
+            if (isinstance(result, list) and len(result) == len(chunk)
+                    and all(isinstance(item, list) for item in result)):
+                for (index, _), candidates in zip(chunk, result):
+                    results[index] = candidates[0].get("language") if candidates else None
+            else:
+                for index, text in chunk:
+                    results[index] = self._request_detect(text)
+
+        detected = {text: results[index] for index, text in pending if results[index]}
+        self.cache.put_many(list(detected.items()), "auto", DETECT_TARGET)
+        return [
+            (language, ("local" if index in local_indexes else "remote") if language else None)
+            for index, language in enumerate(results)
+        ]
+
+    def translate_texts(self, texts: List[str], source: str = "auto", target: str = "en") -> List[Tuple[Optional[str], str]]:
+        """
+        Translate several texts that share a source language.
+
+        Texts longer than LIBRETRANSLATE_CHUNK_MAX_CHARS are split at
+        paragraph, then sentence, then word boundaries; every piece is
+        translated and cached on its own and the results are reassembled in
+        order, so a failed piece is the only thing sent again on retry.
+        Pieces go out as q arrays in chunks bounded by
+        LIBRETRANSLATE_BATCH_MAX_ITEMS and LIBRETRANSLATE_BATCH_MAX_CHARS,
+        up to LIBRETRANSLATE_CONCURRENCY requests at a time.
+        Returns (translated_text, status) pairs in input order, with the
+        same statuses as translate_text.
+        """
+        results: List[Tuple[Optional[str], str]] = [(None, "empty")] * len(texts)
+        pending = [(i, text) for i, text in enumerate(texts) if text and text.strip()]
+
+        if source == "en":
+            for index, text in pending:
+                results[index] = (text, "already_english")
+            return results
+
+        # (leading whitespace, piece, trailing whitespace) per text
+        layouts: Dict[int, List[Tuple[str, str, str]]] = {}
+        pieces: Dict[str, int] = {}
+        for index, text in pending:
+            if len(text) > self.chunk_max_chars:
+                layout = [_EDGE_WHITESPACE_RE.match(piece).groups()
+                          for piece in split_text(text, self.chunk_max_chars)]
+            else:
+                layout = [("", text, "")]
+            layouts[index] = layout
+            for _, piece, _ in layout:
+                if piece and piece not in pieces:
+                    pieces[piece] = len(pieces)
+
+        translated = self._translate_pieces(list(pieces), source, target)
+
+        for index, text in pending:
+            parts = []
+            statuses = []
+            for leading, piece, trailing in layouts[index]:
+                if not piece:
+                    parts.append(leading + trailing)
+                    continue
+                value, status = translated[pieces[piece]]
+                statuses.append(status)
+                parts.append(leading + (piece if status == "already_english" else (value or "")) + trailing)
+
+            if not statuses or "error" in statuses:
+                results[index] = (None, "error")
+            elif all(status == "already_english" for status in statuses):
+                results[index] = (text, "already_english")
+            else:
+                results[index] = ("".join(parts), "translated")
+        return results
+
+    def _translate_pieces(self, texts: List[str], source: str, target: str) -> List[Tuple[Optional[str], str]]:
+        """Translate distinct non-empty texts through the cache and batched, concurrent requests."""
+        results: List[Tuple[Optional[str], str]] = [(None, "error")] * len(texts)
+        pending = list(enumerate(texts))
+
+        if source != "auto":
+            cached = self.cache.get_many(texts, source, target)
+            for index, text in pending:
+                if text in cached:
+                    results[index] = (cached[text], "translated")
+            pending = [(i, text) for i, text in pending if text not in cached]
+
+        chunks = self._chunks(pending)
+        if len(chunks) > 1 and self.max_concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks)),
+                                    thread_name_prefix="libretranslate") as executor:
+                list(executor.map(lambda chunk: self._translate_chunk(chunk, source, target, results), chunks))
+        else:
+            for chunk in chunks:
+                self._translate_chunk(chunk, source, target, results)
+
+        if source != "auto":
+            translated = {
+                text: results[index][0]
+                for index, text in pending
+                if results[index][1] == "translated"
+            }
+            self.cache.put_many(list(translated.items()), source, target)
+        return results
+
+    def _translate_chunk(self, chunk: List[Tuple[int, str]], source: str, target: str,
+                         results: List[Tuple[Optional[str], str]]) -> None:
+        """Translate one request's worth of (index, text) pairs into results."""
+        if len(chunk) == 1:
+            index, text = chunk[0]
+            results[index] = self._translate_uncached(text, source, target)
+            return
+
+        payload = {
+            "q": [text for _, text in chunk],
+            "source": source,
+            "target": target,
+            "format": "text"
+        }
+        if self.api_key:
+            payload["api_key"] = self.api_key
+
+        try:
+            response = requests.post(f"{self.host}/translate", json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            result = response.json()
+        except (requests.ConnectionError, requests.Timeout) as e:
+            print(f"Translation error: {e}")
+            for index, _ in chunk:
+                results[index] = (None, "error")
+            return
+        except Exception:
+            result = None
+
+        # Servers without array support reject q lists or echo one string
+        translated = result.get("translatedText") if isinstance(result, dict) else None
+        if not isinstance(translated, list) or len(translated) != len(chunk):
+            for index, text in chunk:
+                results[index] = self._translate_uncached(text, source, target)
+            return
+
+        detected = result.get("detectedLanguage")
+        for position, ((index, text), translated_text) in enumerate(zip(chunk, translated)):
+            language = None
+            if source == "auto" and isinstance(detected, list) and position < len(detected):
+                language = (detected[position] or {}).get("language")
+            if language == "en":
+                results[index] = (text, "already_english")
+            else:
+                results[index] = (translated_text, "translated")
+
     def translate_batch(self, texts: list[str], source: str = "auto", target: str = "en") -> list[Dict]:
         """
         Translate multiple texts efficiently.
 
+        Languages are detected in batched requests, then texts are grouped by
+        source language and translated with one request per chunk.
+
         Returns:
             List of dicts with keys: original, translated, detected_language, status
         """
-        results = []
-        for text in texts:
-            if not text or not text.strip():
-                results.append({
-                    "original": text,
-                    "translated": None,
-                    "detected_language": None,
-                    "status": "empty"
-                })
-                continue
+        if source == "auto":
+            languages = self.detect_languages(texts)
+        else:
+            languages = [source if text and text.strip() else None for text in texts]
 
-            detected_lang = self.detect_language(text)
+        groups: Dict[str, List[int]] = {}
+        for index, (text, language) in enumerate(zip(texts, languages)):
+            if text and text.strip():
+                groups.setdefault(language or "auto", []).append(index)
 
-            if detected_lang == "en":
-                results.append({
-                    "original": text,
-                    "translated": text,
-                    "detected_language": "en",
-                    "status": "already_english"
-                })
-                continue
+        translations: Dict[int, Tuple[Optional[str], str]] = {}
+        for language, indexes in groups.items():
+            group_results = self.translate_texts([texts[i] for i in indexes], source=language, target=target)
+            translations.update(zip(indexes, group_results))
 
-            translated, status = self.translate_text(text, source=source, target=target)
+        results = []
+        for index, text in enumerate(texts):
+            translated, status = translations.get(index, (None, "empty"))
             results.append({
                 "original": text,
                 "translated": translated,
-                "detected_language": detected_lang,
+                "detected_language": languages[index],
                 "status": status
             })
 
@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from lib.database import fetch_all
+from lib.database.counters import get_table_status_counts
+from .content_translator import ContentTranslator
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_DELAY_SECONDS = 2.0
+DEFAULT_POLL_SECONDS = 30.0
+
+# (table, columns loaded for each row, ContentTranslator batch method name)
+SOURCES = [
+    ("leads", "id, title, summary, content, detected_language", "translate_lead_rows"),
+    ("instagram_posts", "id, caption, detected_language", "translate_instagram_post_rows"),
+    ("reddit_posts", "id, title, selftext", "translate_reddit_post_rows"),
+]
+
+
+def _get_number_env(name: str, default: float, cast: Callable = int, allow_zero: bool = False):
+    raw = os.getenv(name, "")
+    try:
+        value = cast(raw)
+    except (TypeError, ValueError):
+        value = default
+    if value > 0 or (allow_zero and value == 0):
+        return value
+    return default
+
+
+def is_worker_enabled() -> bool:
+    return os.getenv("TRANSLATION_WORKER_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
+
+
+class TranslationWorker:
+    """
+    Background pool that drains rows left in translation_status 'pending'.
+
+    Fetchers insert content untranslated and call notify(); the dispatcher
+    thread then walks each source table in id order (keyset pagination, so a
+    row that stays pending is not picked up again in the same pass), splits
+    each batch into one slice per pool thread and translates every slice with
+    batched LibreTranslate requests. Rows whose translation comes back as
+    'error' are retried with a linear backoff before the error is kept.
+    Without notifications the queue is polled every poll_seconds.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, batch_size: Optional[int] = None,
+                 max_retries: Optional[int] = None, retry_delay_seconds: Optional[float] = None,
+                 poll_seconds: Optional[float] = None):
+        self.concurrency = concurrency or _get_number_env("TRANSLATION_WORKER_CONCURRENCY", DEFAULT_CONCURRENCY)
+        self.batch_size = batch_size or _get_number_env("TRANSLATION_WORKER_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        self.max_retries = max_retries if max_retries is not None else _get_number_env(
+            "TRANSLATION_WORKER_MAX_RETRIES", DEFAULT_MAX_RETRIES, allow_zero=True
+        )
+        self.retry_delay_seconds = retry_delay_seconds if retry_delay_seconds is not None else _get_number_env(
+            "TRANSLATION_WORKER_RETRY_DELAY_SECONDS", DEFAULT_RETRY_DELAY_SECONDS, float
+        )
+        self.poll_seconds = poll_seconds or _get_number_env(
+            "TRANSLATION_WORKER_POLL_SECONDS", DEFAULT_POLL_SECONDS, float
+        )
+        self.content_translator = ContentTranslator()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._started_at: Optional[str] = None
+        self._last_activity_at: Optional[str] = None
+        self._in_flight = 0
+        self._counts = {
+            "processed": 0,
+            "translated": 0,
+            "already_english": 0,
+            "skipped": 0,
+            "errors": 0,
+            "retries": 0,
+        }
+        self._busy_seconds = 0.0
+
+    def start(self) -> None:
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._started_at = datetime.utcnow().isoformat()
+        self._thread = threading.Thread(target=self._run, name="translation-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def notify(self) -> None:
+        """Wake the dispatcher because new pending rows were inserted."""
+        self._wake.set()
+
+    def status(self) -> Dict:
+        with self._lock:
+            counts = dict(self._counts)
+            in_flight = self._in_flight
+            busy_seconds = self._busy_seconds
+        pending = {}
+        for table, _, _ in SOURCES:
+            # NULL statuses are counted under ''
+            statuses = get_table_status_counts(table, "translation_status")
+            pending[table] = statuses.get("pending", 0) + statuses.get("", 0)
+        return {
+            "running": self.is_running(),
+            "concurrency": self.concurrency,
+            "batch_size": self.batch_size,
+            "max_retries": self.max_retries,
+            "started_at": self._started_at,
+            "last_activity_at": self._last_activity_at,
+            "in_flight": in_flight,
+            "pending": pending,
+            **counts,
+            "rows_per_second": round(counts["processed"] / busy_seconds, 2) if busy_seconds else 0.0,
+        }
+
+    def drain(self) -> int:
+        """Translate every row that is pending when the pass starts; returns rows processed."""
+        processed = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="translation") as executor:
+            for table, columns, method_name in SOURCES:
+                translate = getattr(self.content_translator, method_name)
+                last_id = 0
+                while not self._stop.is_set():
+                    rows = fetch_all(
+                        f"""SELECT {columns} FROM {table}
+                            WHERE (translation_status IS NULL OR translation_status = 'pending')
+                              AND id > ?
+                            ORDER BY id
+                            LIMIT ?""",
+                        (last_id, self.batch_size)
+                    )
+                    if not rows:
+                        break
+                    last_id = rows[-1]["id"]
+                    started = time.perf_counter()
+                    size = -(-len(rows) // self.concurrency)
+                    slices = [rows[i:i + size] for i in range(0, len(rows), size)]
+                    list(executor.map(lambda rows_slice: self._translate_rows(translate, rows_slice), slices))
+                    with self._lock:
+                        self._busy_seconds += time.perf_counter() - started
+                    processed += len(rows)
+        return processed
+
+    def _translate_rows(self, translate: Callable[[List[Dict]], List[str]], rows: List[Dict]) -> List[str]:
+        with self._lock:
+            self._in_flight += len(rows)
+        statuses = ["error"] * len(rows)
+        try:
+            remaining = list(range(len(rows)))
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    with self._lock:
+                        self._counts["retries"] += len(remaining)
+                    if self._stop.wait(self.retry_delay_seconds * attempt):
+                        break
+                results = translate([rows[i] for i in remaining])
+                for i, status in zip(remaining, results):
+                    statuses[i] = status
+                remaining = [i for i in remaining if statuses[i] == "error"]
+                if not remaining:
+                    break
+        except Exception as e:
+            print(f"Translation worker error on rows {[row.get('id') for row in rows]}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight -= len(rows)
+
+        with self._lock:
+            for status in statuses:
+                self._counts["processed"] += 1
+                key = "errors" if status not in ("translated", "already_english", "skipped") else status
+                self._counts[key] += 1
+            self._last_activity_at = datetime.utcnow().isoformat()
+        return statuses
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.drain()
+            except Exception as e:
+                print(f"Translation worker pass failed: {e}")
+            self._wake.wait(self.poll_seconds)
+
+
+_worker: Optional[TranslationWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_translation_worker() -> TranslationWorker:
+    """Get or create the translation worker singleton."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = TranslationWorker()
+        return _worker
+
+
+def start_translation_worker() -> None:
+    get_translation_worker().start()
+
+
+def stop_translation_worker() -> None:
+    if _worker is not None:
+        _worker.stop()
+
+
+def notify_translation_worker() -> None:
+    """Tell the worker new pending rows exist (no-op when it is not running)."""
+    if _worker is not None and _worker.is_running():
+        _worker.notify()
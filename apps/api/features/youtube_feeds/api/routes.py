@@ -23,8 +23,18 @@ from features.youtube_feeds.service.fetcher import (
 )
 from features.youtube_feeds.service.transcript_extractor import extract_transcript_sync
 from lib.database import fetch_all, fetch_one, execute_query
+from lib.database.fts import SEARCH_INDEX, build_match_query, fts_available, search_ids_sql
+from lib.pagination import (
+    decode_cursor,
+    keyset_condition,
+    keyset_order,
+    paginate,
+    set_next_cursor,
+)
 
 router = APIRouter(prefix="/youtube-feeds", tags=["youtube-feeds"])
+# Keyset sort for /posts, backed by idx_youtube_posts_keyset
+YOUTUBE_POST_SORT = "COALESCE(yp.published_at, yp.collected_at, '')"
 
 
 @router.get("/channel-search", response_model=List[YouTubeChannelSearchResult])
@@ -119,14 +129,16 @@ def trigger_fetch_all_youtube(
 
 @router.get("/posts", response_model=List[YouTubePostResponse])
 def get_youtube_posts(
+    response: Response,
     search: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     country: Optional[str] = Query(None),
     youtube_feed_id: Optional[int] = Query(None),
     limit: Optional[int] = Query(None, ge=1),
     offset: Optional[int] = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
 ) -> List[YouTubePostResponse]:
-    """Get YouTube posts with filters."""
+    """Get YouTube posts with filters; pass X-Next-Cursor back as cursor for the next page."""
     query = """
         SELECT
             yp.id,
@@ -148,7 +160,12 @@ def get_youtube_posts(
     """
     params = []
 
-    if search:
+    match_query = build_match_query(search) if search else None
+    if match_query and fts_available(SEARCH_INDEX):
+        # The index also covers transcripts
+        query += f" AND yp.id IN ({search_ids_sql('youtube_post')})"
+        params.append(match_query)
+    elif search:
         query += " AND (yp.title LIKE ? OR yp.description LIKE ?)"
         search_term = f"%{search}%"
         params.extend([search_term, search_term])
@@ -167,13 +184,29 @@ def get_youtube_posts(
         query += " AND yf.country = ?"
         params.append(country)
 
-    query += " ORDER BY COALESCE(yp.published_at, yp.collected_at) DESC"
+    if cursor:
+        try:
+            sort_value, last_id = decode_cursor(cursor, "published_at", 2)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        condition, condition_params = keyset_condition(YOUTUBE_POST_SORT, "yp.id", sort_value, last_id)
+        query += f" AND {condition}"
+        params.extend(condition_params)
+        offset = 0
+
+    query += f" ORDER BY {keyset_order(YOUTUBE_POST_SORT, 'yp.id')}"
 
     if limit is not None:
         query += " LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        params.extend([limit + 1, offset])
 
     posts = fetch_all(query, tuple(params))
+    if limit is not None:
+        posts, next_cursor = paginate(
+            posts, limit, "published_at",
+            lambda row: (row["published_at"] or row["collected_at"] or "", row["id"])
+        )
+        set_next_cursor(response, next_cursor)
     return [YouTubePostResponse(**post) for post in posts]
 
 
@@ -1,45 +1,11 @@
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, List
-import sqlite3
 
 from features.youtube_feeds.service.youtube_client import (
     fetch_youtube_videos,
     YouTubeAPIError,
 )
-
-DATABASE_PATH = Path(__file__).parent.parent.parent.parent / "leads.db"
-
-
-def fetch_one(query: str, params: tuple) -> dict | None:
-    """Helper to fetch one row from database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    result = cursor.execute(query, params).fetchone()
-    conn.close()
-    return dict(result) if result else None
-
-
-def fetch_all(query: str, params: tuple) -> list:
-    """Helper to fetch all rows from database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    results = cursor.execute(query, params).fetchall()
-    conn.close()
-    return [dict(row) for row in results]
-
-
-def execute_query(query: str, params: tuple) -> int:
-    """Helper to execute query and return lastrowid."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    lastrowid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return lastrowid
+from lib.database import fetch_all, fetch_one, execute_query
 
 
 def fetch_youtube_feed(feed_id: int, max_results: int = 5) -> Dict:
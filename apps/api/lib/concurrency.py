@@ -0,0 +1,72 @@
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def run_with_host_limits(
+    items: Iterable[T],
+    host_of: Callable[[T], str],
+    work: Callable[[T], R],
+    max_workers: int,
+    per_host_limit: int,
+) -> List[Tuple[T, Optional[R], Optional[BaseException]]]:
+    """
+    Run work(item) on a thread pool with a global and a per-host cap.
+
+    Items are only handed to the pool when their host has a free slot, so a
+    slow host never ties up workers that could serve other hosts. Hosts are
+    served round-robin. Returns (item, result, exception) tuples in completion
+    order; exceptions raised by work are captured, never re-raised.
+    """
+    max_workers = max(1, max_workers)
+    per_host_limit = max(1, per_host_limit)
+
+    queues: "OrderedDict[str, Deque[T]]" = OrderedDict()
+    for item in items:
+        queues.setdefault(host_of(item) or "", deque()).append(item)
+
+    in_flight: Dict[str, int] = {host: 0 for host in queues}
+    futures: Dict[Future, Tuple[T, str]] = {}
+    results: List[Tuple[T, Optional[R], Optional[BaseException]]] = []
+
+    if not queues:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while queues or futures:
+            # Hand out one item per host per pass until every free slot is
+            # used or every remaining host is at its limit.
+            submitted = True
+            while submitted and len(futures) < max_workers:
+                submitted = False
+                for host in list(queues.keys()):
+                    if len(futures) >= max_workers:
+                        break
+                    if in_flight[host] >= per_host_limit:
+                        continue
+                    queue = queues[host]
+                    item = queue.popleft()
+                    in_flight[host] += 1
+                    futures[executor.submit(work, item)] = (item, host)
+                    submitted = True
+                    if queue:
+                        # Rotate so the next pass starts with a different host.
+                        queues.move_to_end(host)
+                    else:
+                        del queues[host]
+
+            if not futures:
+                break
+
+            done, _ = wait(list(futures.keys()), return_when=FIRST_COMPLETED)
+            for future in done:
+                item, host = futures.pop(future)
+                in_flight[host] -= 1
+                error = future.exception()
+                result = None if error else future.result()
+                results.append((item, result, error))
+
+    return results
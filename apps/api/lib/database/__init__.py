@@ -1,3 +1,29 @@
-from .db import get_db_connection, execute_query, execute_many, fetch_one, fetch_all
+from .db import (
+    get_db_connection,
+    execute_query,
+    execute_many,
+    fetch_one,
+    fetch_all,
+    transaction,
+    in_transaction,
+    get_pool_stats,
+    get_query_stats,
+    reset_query_stats,
+    close_connections,
+)
+from .unit_of_work import UnitOfWork
 
-__all__ = ["get_db_connection", "execute_query", "execute_many", "fetch_one", "fetch_all"]
+__all__ = [
+    "get_db_connection",
+    "execute_query",
+    "execute_many",
+    "fetch_one",
+    "fetch_all",
+    "transaction",
+    "in_transaction",
+    "get_pool_stats",
+    "get_query_stats",
+    "reset_query_stats",
+    "close_connections",
+    "UnitOfWork",
+]
@@ -0,0 +1,75 @@
+"""
+Database access for async route handlers.
+
+The helpers in db.py block on sqlite3, so calling them from an async def
+handler stalls the event loop and every request waiting on it. These
+wrappers run them on a dedicated thread pool (DB_EXECUTOR_WORKERS threads,
+default 4) instead of the default executor that sync handlers share. Each
+worker uses its own pooled connection and writers still queue on the
+process-wide write lock.
+
+A transaction must stay on one thread: put it in a plain function and run
+the whole function with run_db.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from .db import execute_query, fetch_all, fetch_one
+
+T = TypeVar("T")
+
+DEFAULT_EXECUTOR_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor_workers() -> int:
+    try:
+        value = int(os.getenv("DB_EXECUTOR_WORKERS", ""))
+    except (TypeError, ValueError):
+        value = DEFAULT_EXECUTOR_WORKERS
+    return max(1, value)
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_executor_workers(),
+                thread_name_prefix="db",
+            )
+        return _executor
+
+
+def close_db_executor() -> None:
+    """Wait for queued calls and stop the worker threads."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database function on the database executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def execute_query_async(query: str, params: tuple = ()) -> int:
+    return await run_db(execute_query, query, params)
+
+
+async def fetch_one_async(query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+    return await run_db(fetch_one, query, params)
+
+
+async def fetch_all_async(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    return await run_db(fetch_all, query, params)
@@ -0,0 +1,53 @@
+"""
+Read and repair content_counters, the per-type approval and translation
+status counts kept by triggers (see add_content_counters in init_db.py).
+
+Rebuild the counts from the content tables with:
+
+    python -m lib.database.counters
+"""
+
+from typing import Dict
+
+from .db import execute_query, fetch_all, transaction
+from .init_db import CONTENT_QUEUE_SOURCES, COUNTED_STATUSES, content_counters_rebuild_sql
+
+TABLE_CONTENT_TYPES = {source["table"]: content_type for content_type, source in CONTENT_QUEUE_SOURCES.items()}
+
+
+def get_status_counts(field: str) -> Dict[str, Dict[str, int]]:
+    """Rows per content type and value of field; NULL values are counted under ''."""
+    counts = {content_type: {} for content_type in CONTENT_QUEUE_SOURCES}
+    rows = fetch_all(
+        "SELECT content_type, status, count FROM content_counters WHERE field = ?",
+        (field,)
+    )
+    for row in rows:
+        counts.setdefault(row["content_type"], {})[row["status"]] = row["count"]
+    return counts
+
+
+def get_table_status_counts(table: str, field: str) -> Dict[str, int]:
+    return get_status_counts(field).get(TABLE_CONTENT_TYPES[table], {})
+
+
+def rebuild_counters() -> int:
+    """Recount every status from the content tables; returns the counts corrected."""
+    before = {field: get_status_counts(field) for field in COUNTED_STATUSES}
+    with transaction():
+        execute_query("DELETE FROM content_counters")
+        for content_type in CONTENT_QUEUE_SOURCES:
+            for field in COUNTED_STATUSES:
+                execute_query(content_counters_rebuild_sql(content_type, field))
+    after = {field: get_status_counts(field) for field in COUNTED_STATUSES}
+
+    corrected = 0
+    for field in COUNTED_STATUSES:
+        for content_type in CONTENT_QUEUE_SOURCES:
+            old, new = before[field].get(content_type, {}), after[field].get(content_type, {})
+            corrected += sum(1 for status in set(old) | set(new) if old.get(status, 0) != new.get(status, 0))
+    return corrected
+
+
+if __name__ == "__main__":
+    print(f"✅ Content counters rebuilt ({rebuild_counters()} corrected)")
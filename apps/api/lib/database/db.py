@@ -1,44 +1,192 @@
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .pool import ConnectionPool, configure_connection
 
 DATABASE_PATH = Path(__file__).parent.parent.parent / "leads.db"
 
+_pool = ConnectionPool(DATABASE_PATH)
+_tx_state = threading.local()
+# SQLite allows one writer at a time. Serializing writers inside the process
+# lets concurrent fetch threads queue here instead of spinning on
+# SQLITE_BUSY; the busy timeout still covers writers in other processes.
+_write_lock = threading.RLock()
+
+
+class _QueryStats:
+    """Thread-safe counters for every query that goes through this module."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.operations: Dict[str, Dict[str, float]] = {}
+        self.transactions = {"committed": 0, "rolled_back": 0}
+        self.rows_written_in_batches = 0
+
+    def record(self, operation: str, started: float, rows: int = 0) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            entry = self.operations.setdefault(
+                operation, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            if operation == "execute_many":
+                self.rows_written_in_batches += rows
+
+    def record_transaction(self, committed: bool) -> None:
+        with self._lock:
+            key = "committed" if committed else "rolled_back"
+            self.transactions[key] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            operations = {
+                name: {
+                    "count": int(entry["count"]),
+                    "total_ms": round(entry["total_ms"], 2),
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 3) if entry["count"] else 0.0,
+                    "max_ms": round(entry["max_ms"], 2),
+                }
+                for name, entry in self.operations.items()
+            }
+            return {
+                "operations": operations,
+                "transactions": dict(self.transactions),
+                "rows_written_in_batches": self.rows_written_in_batches,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset()
+
+
+_stats = _QueryStats()
+
 
 def get_db_connection():
-    """Get a database connection with row factory."""
-    conn = sqlite3.connect(DATABASE_PATH)
+    """Get a standalone database connection with row factory.
+
+    The caller owns the connection and must close it. Query helpers below use
+    the per-thread pool instead.
+    """
+    conn = sqlite3.connect(DATABASE_PATH, timeout=_pool.busy_timeout_ms / 1000)
     conn.row_factory = sqlite3.Row
+    configure_connection(conn, _pool.busy_timeout_ms, _pool.cache_size_kb)
     return conn
 
 
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool hit/miss statistics."""
+    return _pool.stats()
+
+
+def get_query_stats() -> Dict[str, Any]:
+    """Return per-operation query counts and timings."""
+    return _stats.snapshot()
+
+
+def reset_query_stats() -> None:
+    """Clear query counters."""
+    _stats.reset()
+
+
+def close_connections() -> None:
+    """Close pooled connections (used on application shutdown)."""
+    _pool.close_all()
+
+
+def set_trace_callback(callback: Optional[Callable[[str], None]]) -> None:
+    """
+    Report every statement run on pooled connections to callback.
+
+    Open connections are closed so the callback applies to all of them;
+    pass None to stop tracing.
+    """
+    _pool.trace_callback = callback
+    _pool.close_all()
+
+
+def in_transaction() -> bool:
+    """Return True when the current thread is inside transaction()."""
+    return getattr(_tx_state, "depth", 0) > 0
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Run the enclosed statements in a single write transaction.
+
+    Every helper in this module called on the same thread inside the block
+    joins the transaction instead of committing on its own. Nested blocks
+    join the outermost one. Commits on success and rolls back on any error.
+    """
+    conn = _pool.get()
+    depth = getattr(_tx_state, "depth", 0)
+    if depth > 0:
+        _tx_state.depth = depth + 1
+        try:
+            yield conn
+        finally:
+            _tx_state.depth -= 1
+        return
+
+    with _write_lock:
+        # IMMEDIATE takes the write lock up front so the transaction cannot
+        # fail halfway through when another connection started writing first.
+        conn.execute("BEGIN IMMEDIATE")
+        _tx_state.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            _tx_state.depth = 0
+            conn.execute("ROLLBACK")
+            _stats.record_transaction(committed=False)
+            raise
+        _tx_state.depth = 0
+        conn.execute("COMMIT")
+        _stats.record_transaction(committed=True)
+
+
 def execute_query(query: str, params: Tuple = ()) -> int:
     """Execute a query and return the last row id."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    last_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    started = time.perf_counter()
+    conn = _pool.get()
+    with _write_lock:
+        cursor = conn.execute(query, params)
+        last_id = cursor.lastrowid
+    _stats.record("execute", started)
     return last_id
 
 
-def execute_many(query: str, params_list: List[Tuple]) -> None:
-    """Execute many queries."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.executemany(query, params_list)
-    conn.commit()
-    conn.close()
+def execute_many(query: str, params_list: List[Tuple]) -> int:
+    """Execute many queries in one transaction and return the rows changed."""
+    if not params_list:
+        return 0
+    started = time.perf_counter()
+    with transaction() as conn:
+        cursor = conn.executemany(query, params_list)
+        changed = cursor.rowcount
+    _stats.record("execute_many", started, rows=len(params_list))
+    return changed
 
 
 def fetch_one(query: str, params: Tuple = ()) -> Optional[dict]:
     """Fetch one row as a dictionary."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query, params)
+    started = time.perf_counter()
+    conn = _pool.get()
+    cursor = conn.execute(query, params)
     row = cursor.fetchone()
-    conn.close()
+    # Close explicitly so an unfinished statement does not pin a WAL snapshot.
+    cursor.close()
+    _stats.record("fetch_one", started)
     if row:
         return dict(row)
     return None
@@ -46,9 +194,8 @@ def fetch_one(query: str, params: Tuple = ()) -> Optional[dict]:
 
 def fetch_all(query: str, params: Tuple = ()) -> List[dict]:
     """Fetch all rows as a list of dictionaries."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
+    started = time.perf_counter()
+    conn = _pool.get()
+    rows = conn.execute(query, params).fetchall()
+    _stats.record("fetch_all", started)
     return [dict(row) for row in rows]
@@ -0,0 +1,247 @@
+"""
+Check that no route query does a full scan of a large table.
+
+Calls every GET route of the app in-process against the local database,
+records each SELECT it runs and prints its EXPLAIN QUERY PLAN. Every query
+parameter is tried on its own (and each allowed value of enum-like ones),
+and list routes are requested again with the cursor they return, so the
+filtered and keyset variants of each query are covered too. A plan step
+that scans one of LARGE_TABLES without an index fails the check.
+
+Run from apps/api after migrations:
+
+    python -m lib.database.explain_check
+
+Exits with status 1 when a full scan or a server error is found.
+"""
+
+import asyncio
+import re
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from .db import get_db_connection, set_trace_callback
+from .init_db import SEARCH_INDEX_SOURCES
+
+# Tables that grow with every fetch; the feed, category and tag tables stay
+# small enough for a scan to be harmless.
+LARGE_TABLES = {
+    "leads",
+    "instagram_posts",
+    "reddit_posts",
+    "youtube_posts",
+    "el_comercio_posts",
+    "diario_correo_posts",
+    "fetch_logs",
+    "instagram_fetch_logs",
+    "reddit_fetch_logs",
+    "youtube_fetch_logs",
+    "el_comercio_fetch_logs",
+    "diario_correo_fetch_logs",
+    "translation_cache",
+    "batch_fetch_job_steps",
+    "content_queue",
+}
+
+# Routes that call external services instead of the database
+SKIPPED_ROUTES = {
+    "/feed",
+    "/youtube-feeds/channel-search",
+    "/instagram-feeds/posts/{post_id}/image",
+}
+
+SAMPLE_VALUES = {
+    "search": ["peru"],
+    "q": ["peru"],
+    "country": ["Peru"],
+    "category": ["News"],
+    "tag": ["news"],
+    "approval_status": ["pending", "approved"],
+    "content_type": ["lead", "reddit_post", *SEARCH_INDEX_SOURCES],
+}
+DEFAULT_STRING = "news"
+DEFAULT_INTEGER = 1
+
+# Parameter combinations that only mean something together
+EXTRA_CASES = {
+    "/leads": [{"search": "peru", "sort": "relevance"}],
+}
+
+_FROM_RE = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_SCAN_RE = re.compile(r"^SCAN (\w+)(.*)$")
+_KEYWORDS = {"WHERE", "JOIN", "LEFT", "INNER", "ON", "GROUP", "ORDER", "LIMIT", "UNION", "USING", "AS"}
+
+
+def _schema_type(schema: Dict) -> Optional[str]:
+    for option in schema.get("anyOf", [schema]):
+        if option.get("type") not in (None, "null"):
+            return option["type"]
+    return None
+
+
+def _param_values(param: Dict) -> List[object]:
+    schema = param.get("schema", {})
+    pattern = None
+    for option in schema.get("anyOf", [schema]):
+        pattern = pattern or option.get("pattern")
+    if pattern:
+        return pattern.strip("^$()").split("|")
+    if param["name"] in SAMPLE_VALUES:
+        return SAMPLE_VALUES[param["name"]]
+    if _schema_type(schema) == "integer":
+        return [DEFAULT_INTEGER]
+    return [DEFAULT_STRING]
+
+
+def _fill_path(path: str, parameters: List[Dict]) -> str:
+    for param in parameters:
+        if param["in"] == "path":
+            value = DEFAULT_INTEGER if _schema_type(param.get("schema", {})) == "integer" else DEFAULT_STRING
+            path = path.replace("{" + param["name"] + "}", str(value))
+    return path
+
+
+def _cases(path: str, parameters: List[Dict]) -> List[Dict]:
+    """Parameter sets to request: the defaults, then each parameter alone."""
+    query = [param for param in parameters if param["in"] == "query" and param["name"] != "cursor"]
+    # limit=1 makes small databases return a next-page cursor as well
+    base = {"limit": 1} if any(param["name"] == "limit" for param in query) else {}
+    cases = [dict(base)]
+    for param in query:
+        if param["name"] in ("limit", "offset"):
+            continue
+        for value in _param_values(param):
+            cases.append({**base, param["name"]: value})
+    cases.extend({**base, **extra} for extra in EXTRA_CASES.get(path, []))
+    return cases
+
+
+async def _get(app, path: str, params: Dict) -> Tuple[int, Dict[str, str]]:
+    """Send one GET request straight to the ASGI app."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params).encode(),
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    headers = {key.decode().lower(): value.decode() for key, value in start["headers"]}
+    return start["status"], headers
+
+
+def _aliases(sql: str) -> Dict[str, str]:
+    aliases = {}
+    for table, alias in _FROM_RE.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in _KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def full_scans(conn, sql: str) -> List[str]:
+    """Plan steps of sql that scan a large table without using an index."""
+    aliases = _aliases(sql)
+    problems = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall():
+        detail = row[3]
+        match = _SCAN_RE.match(detail)
+        if not match or "USING" in match.group(2):
+            continue
+        if aliases.get(match.group(1), match.group(1)) in LARGE_TABLES:
+            problems.append(detail)
+    return problems
+
+
+def run_check() -> int:
+    from app.main import app
+
+    statements: List[str] = []
+    lock = threading.Lock()
+
+    def trace(sql: str) -> None:
+        if sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            with lock:
+                statements.append(sql)
+
+    set_trace_callback(trace)
+    conn = get_db_connection()
+    seen = set()
+    failures = 0
+
+    async def check_route(path: str, parameters: List[Dict]) -> None:
+        nonlocal failures
+        url = _fill_path(path, parameters)
+        for params in _cases(path, parameters):
+            requests = [params]
+            while requests:
+                current = requests.pop()
+                with lock:
+                    statements.clear()
+                status, headers = await _get(app, url, current)
+                label = f"GET {url}?{urlencode(current)}" if current else f"GET {url}"
+                if status >= 500:
+                    failures += 1
+                    print(f"❌ {label} returned {status}")
+                cursor = headers.get("x-next-cursor")
+                if cursor and "cursor" not in current:
+                    requests.append({**current, "cursor": cursor})
+                with lock:
+                    traced = list(statements)
+                for sql in traced:
+                    if sql in seen:
+                        continue
+                    seen.add(sql)
+                    try:
+                        problems = full_scans(conn, sql)
+                    except Exception as e:
+                        print(f"⚠️  {label}: could not explain query: {e}")
+                        continue
+                    if problems:
+                        failures += 1
+                        print(f"❌ {label}: {'; '.join(problems)}")
+                        print(f"   {' '.join(sql.split())[:400]}")
+
+    async def check_all() -> int:
+        routes = 0
+        for path, operations in app.openapi()["paths"].items():
+            if "get" not in operations or path in SKIPPED_ROUTES:
+                continue
+            routes += 1
+            await check_route(path, operations["get"].get("parameters", []))
+        return routes
+
+    try:
+        routes = asyncio.run(check_all())
+    finally:
+        set_trace_callback(None)
+        conn.close()
+
+    print(f"Checked {len(seen)} distinct queries from {routes} routes")
+    if failures:
+        print(f"❌ {failures} problem(s) found")
+        return 1
+    print("✅ No full scans of large tables")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_check())
@@ -0,0 +1,100 @@
+import html
+import re
+import sqlite3
+from typing import Dict, List, Optional
+
+from .db import fetch_all, fetch_one
+from .init_db import SEARCH_INDEX_SOURCES
+
+# snippet() wraps matches in these control characters; format_snippet escapes
+# the text and turns them into <mark> tags, so column HTML is never trusted.
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+SEARCH_INDEX = "search_index"
+# bm25() weights for title, summary, body and their translations: title hits
+# outrank summary hits, which outrank body (content, transcript) hits
+SEARCH_WEIGHTS = "10.0, 4.0, 1.0, 10.0, 4.0, 1.0"
+SEARCH_TYPE_CODES = {content_type: source["code"] for content_type, source in SEARCH_INDEX_SOURCES.items()}
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+_available = set()
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """
+    Turn free-text search input into a safe FTS5 MATCH expression.
+
+    Quoted input stays a phrase; every other word becomes a prefix term
+    ("peru*"). Terms are ANDed. FTS5 operators and punctuation in the input
+    are treated as plain text. Returns None when nothing searchable remains.
+    """
+    terms = []
+    for phrase, word in _TOKEN_RE.findall(search or ""):
+        if phrase:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                terms.append('"' + " ".join(words) + '"')
+        else:
+            terms.extend(f'"{part}"*' for part in _WORD_RE.findall(word))
+    return " ".join(terms) or None
+
+
+def snippet_sql(table: str, max_tokens: int = 16) -> str:
+    """SQL for the best-matching fragment of any column of an FTS5 table."""
+    return f"snippet({table}, -1, char(2), char(3), '…', {max_tokens})"
+
+
+def format_snippet(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a snippet() result and highlight matches with <mark>."""
+    if not snippet:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(SNIPPET_START, "<mark>").replace(SNIPPET_END, "</mark>")
+
+
+def fts_available(table: str) -> bool:
+    """Return True once the FTS table exists (it is created by a migration)."""
+    if table in _available:
+        return True
+    try:
+        row = fetch_one("SELECT 1 AS found FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    except sqlite3.Error:
+        return False
+    if row:
+        _available.add(table)
+    return bool(row)
+
+
+def search_ids_sql(content_type: str) -> str:
+    """
+    Subquery selecting the ids of one content type whose index row matches
+    the MATCH expression bound to its single parameter.
+    """
+    return (
+        f"SELECT rowid >> 3 FROM {SEARCH_INDEX} "
+        f"WHERE {SEARCH_INDEX} MATCH ? AND (rowid & 7) = {SEARCH_TYPE_CODES[content_type]}"
+    )
+
+
+def get_snippets(match_query: str, content_type: str, content_ids: List[int]) -> Dict[int, Optional[str]]:
+    """Highlighted snippets for a page of one content type, keyed by content id."""
+    code = SEARCH_TYPE_CODES[content_type]
+    snippets = get_snippets_by_rowid(match_query, [content_id * 8 + code for content_id in content_ids])
+    return {rowid >> 3: snippet for rowid, snippet in snippets.items()}
+
+
+def get_snippets_by_rowid(match_query: str, rowids: List[int]) -> Dict[int, Optional[str]]:
+    """Highlighted snippets for a page of search_index rows, keyed by rowid."""
+    if not rowids:
+        return {}
+    placeholders = ", ".join("?" for _ in rowids)
+    rows = fetch_all(
+        f"""SELECT rowid, {snippet_sql(SEARCH_INDEX)} AS snippet
+            FROM {SEARCH_INDEX}
+            WHERE {SEARCH_INDEX} MATCH ? AND rowid IN ({placeholders})""",
+        (match_query, *rowids)
+    )
+    return {row["rowid"]: format_snippet(row["snippet"]) for row in rows}
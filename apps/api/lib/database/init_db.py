@@ -1,136 +1,64 @@
 import sqlite3
+import time
 from pathlib import Path
 
 DATABASE_PATH = Path(__file__).parent.parent.parent / "leads.db"
 
 
-def add_image_columns():
+def add_image_columns(schema):
     """Add image_url column to content tables."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
-    # Helper function to check if column exists
-    def column_exists(table_name, column_name):
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [row[1] for row in cursor.fetchall()]
-        return column_name in columns
-
     # Add image_url to leads table
-    if not column_exists('leads', 'image_url'):
-        cursor.execute("ALTER TABLE leads ADD COLUMN image_url TEXT")
+    schema.add_column('leads', 'image_url', "TEXT")
 
-    conn.commit()
-    conn.close()
-    print("✅ Image columns added to content tables")
 
-
-def add_translation_columns():
+def add_translation_columns(schema):
     """Add translation columns to all content tables."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
-    # Helper function to check if column exists
-    def column_exists(table_name, column_name):
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [row[1] for row in cursor.fetchall()]
-        return column_name in columns
-
     # Add translation columns to leads table
-    if not column_exists('leads', 'title_translated'):
-        cursor.execute("ALTER TABLE leads ADD COLUMN title_translated TEXT")
-    if not column_exists('leads', 'summary_translated'):
-        cursor.execute("ALTER TABLE leads ADD COLUMN summary_translated TEXT")
-    if not column_exists('leads', 'content_translated'):
-        cursor.execute("ALTER TABLE leads ADD COLUMN content_translated TEXT")
-    if not column_exists('leads', 'detected_language'):
-        cursor.execute("ALTER TABLE leads ADD COLUMN detected_language TEXT")
-    if not column_exists('leads', 'translation_status'):
-        cursor.execute("ALTER TABLE leads ADD COLUMN translation_status TEXT DEFAULT 'pending'")
-    if not column_exists('leads', 'translated_at'):
-        cursor.execute("ALTER TABLE leads ADD COLUMN translated_at TEXT")
+    schema.add_column('leads', 'title_translated', "TEXT")
+    schema.add_column('leads', 'summary_translated', "TEXT")
+    schema.add_column('leads', 'content_translated', "TEXT")
+    schema.add_column('leads', 'detected_language', "TEXT")
+    schema.add_column('leads', 'translation_status', "TEXT DEFAULT 'pending'")
+    schema.add_column('leads', 'translated_at', "TEXT")
 
     # Add translation columns to instagram_posts table
-    if not column_exists('instagram_posts', 'caption_translated'):
-        cursor.execute("ALTER TABLE instagram_posts ADD COLUMN caption_translated TEXT")
-    if not column_exists('instagram_posts', 'detected_language'):
-        cursor.execute("ALTER TABLE instagram_posts ADD COLUMN detected_language TEXT")
-    if not column_exists('instagram_posts', 'translation_status'):
-        cursor.execute("ALTER TABLE instagram_posts ADD COLUMN translation_status TEXT DEFAULT 'pending'")
-    if not column_exists('instagram_posts', 'translated_at'):
-        cursor.execute("ALTER TABLE instagram_posts ADD COLUMN translated_at TEXT")
+    schema.add_column('instagram_posts', 'caption_translated', "TEXT")
+    schema.add_column('instagram_posts', 'detected_language', "TEXT")
+    schema.add_column('instagram_posts', 'translation_status', "TEXT DEFAULT 'pending'")
+    schema.add_column('instagram_posts', 'translated_at', "TEXT")
 
     # Add translation columns to reddit_posts table
-    if not column_exists('reddit_posts', 'title_translated'):
-        cursor.execute("ALTER TABLE reddit_posts ADD COLUMN title_translated TEXT")
-    if not column_exists('reddit_posts', 'selftext_translated'):
-        cursor.execute("ALTER TABLE reddit_posts ADD COLUMN selftext_translated TEXT")
-    if not column_exists('reddit_posts', 'detected_language'):
-        cursor.execute("ALTER TABLE reddit_posts ADD COLUMN detected_language TEXT")
-    if not column_exists('reddit_posts', 'translation_status'):
-        cursor.execute("ALTER TABLE reddit_posts ADD COLUMN translation_status TEXT DEFAULT 'pending'")
-    if not column_exists('reddit_posts', 'translated_at'):
-        cursor.execute("ALTER TABLE reddit_posts ADD COLUMN translated_at TEXT")
-
-    conn.commit()
-    conn.close()
-    print("✅ Translation columns added to all content tables")
-
-
-def add_approval_columns():
-    """Add approval workflow columns to all content tables."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    schema.add_column('reddit_posts', 'title_translated', "TEXT")
+    schema.add_column('reddit_posts', 'selftext_translated', "TEXT")
+    schema.add_column('reddit_posts', 'detected_language', "TEXT")
+    schema.add_column('reddit_posts', 'translation_status', "TEXT DEFAULT 'pending'")
+    schema.add_column('reddit_posts', 'translated_at', "TEXT")
 
-    # Helper function to check if column exists
-    def column_exists(table_name, column_name):
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [row[1] for row in cursor.fetchall()]
-        return column_name in columns
 
+def add_approval_columns(schema):
+    """Add approval workflow columns to all content tables."""
     tables = ['leads', 'instagram_posts', 'reddit_posts']
 
     for table in tables:
         # Add approval_status column with DEFAULT 'approved' for existing records
-        if not column_exists(table, 'approval_status'):
-            cursor.execute(f"ALTER TABLE {table} ADD COLUMN approval_status TEXT DEFAULT 'approved'")
+        schema.add_column(table, 'approval_status', "TEXT DEFAULT 'approved'")
 
         # Add approved_by column
-        if not column_exists(table, 'approved_by'):
-            cursor.execute(f"ALTER TABLE {table} ADD COLUMN approved_by TEXT")
+        schema.add_column(table, 'approved_by', "TEXT")
 
         # Add approved_at column
-        if not column_exists(table, 'approved_at'):
-            cursor.execute(f"ALTER TABLE {table} ADD COLUMN approved_at TEXT")
+        schema.add_column(table, 'approved_at', "TEXT")
 
         # Add approval_notes column
-        if not column_exists(table, 'approval_notes'):
-            cursor.execute(f"ALTER TABLE {table} ADD COLUMN approval_notes TEXT")
+        schema.add_column(table, 'approval_notes', "TEXT")
 
     # Auto-approve all existing content (set explicit value for NULL entries)
     for table in tables:
-        cursor.execute(f"UPDATE {table} SET approval_status = 'approved' WHERE approval_status IS NULL")
+        schema.execute(f"UPDATE {table} SET approval_status = 'approved' WHERE approval_status IS NULL")
 
-    conn.commit()
-    conn.close()
-    print("✅ Approval columns added to all content tables")
 
-def add_country_columns():
+def add_country_columns(schema):
     """Add country column to feed and content tables when available."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
-    def table_exists(table_name: str) -> bool:
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name = ?",
-            (table_name,)
-        )
-        return cursor.fetchone() is not None
-
-    def column_exists(table_name: str, column_name: str) -> bool:
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [row[1] for row in cursor.fetchall()]
-        return column_name in columns
-
     tables = [
         "feeds",
         "instagram_feeds",
@@ -142,28 +70,20 @@ def add_country_columns():
     ]
 
     for table in tables:
-        if not table_exists(table):
+        if not schema.table_exists(table):
             continue
-        if not column_exists(table, "country"):
-            cursor.execute(f"ALTER TABLE {table} ADD COLUMN country TEXT")
+        schema.add_column(table, "country", "TEXT")
 
-    conn.commit()
-    conn.close()
-    print("✅ Country columns added to feed and content tables")
 
-
-def add_reddit_auto_approval():
+def add_reddit_auto_approval(schema):
     """Auto-approve Reddit posts on insert and clean up pending rows."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
+    schema.execute("""
         UPDATE reddit_posts
         SET approval_status = 'approved'
         WHERE approval_status IS NULL OR approval_status = 'pending'
     """)
 
-    cursor.execute("""
+    schema.execute("""
         CREATE TRIGGER IF NOT EXISTS reddit_posts_auto_approve
         AFTER INSERT ON reddit_posts
         FOR EACH ROW
@@ -175,18 +95,11 @@ def add_reddit_auto_approval():
         END;
     """)
 
-    conn.commit()
-    conn.close()
-    print("✅ Reddit posts set to auto-approve")
-
 
-def init_database():
+def init_database(schema):
     """Initialize the database with schema."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
     # Create categories table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS categories (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT UNIQUE NOT NULL
@@ -194,7 +107,7 @@ def init_database():
     """)
 
     # Create countries table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS countries (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT UNIQUE NOT NULL
@@ -202,7 +115,7 @@ def init_database():
     """)
 
     # Create feeds table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS feeds (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             category_id INTEGER NOT NULL,
@@ -219,7 +132,7 @@ def init_database():
     """)
 
     # Create feed_tags table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS feed_tags (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT UNIQUE NOT NULL
@@ -227,7 +140,7 @@ def init_database():
     """)
 
     # Create feed_tag_map table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS feed_tag_map (
             feed_id INTEGER,
             tag_id INTEGER,
@@ -238,7 +151,7 @@ def init_database():
     """)
 
     # Create leads table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS leads (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             feed_id INTEGER NOT NULL,
@@ -256,7 +169,7 @@ def init_database():
     """)
 
     # Create fetch_logs table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS fetch_logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             feed_id INTEGER NOT NULL,
@@ -269,7 +182,7 @@ def init_database():
     """)
 
     # Create instagram_feeds table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS instagram_feeds (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             category_id INTEGER NOT NULL,
@@ -287,7 +200,7 @@ def init_database():
     """)
 
     # Create instagram_posts table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS instagram_posts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             instagram_feed_id INTEGER NOT NULL,
@@ -309,7 +222,7 @@ def init_database():
     """)
 
     # Create instagram_feed_tag_map table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS instagram_feed_tag_map (
             instagram_feed_id INTEGER,
             tag_id INTEGER,
@@ -320,7 +233,7 @@ def init_database():
     """)
 
     # Create instagram_fetch_logs table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS instagram_fetch_logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             instagram_feed_id INTEGER NOT NULL,
@@ -334,7 +247,7 @@ def init_database():
     """)
 
     # Create reddit_feeds table
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS reddit_feeds (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             category_id INTEGER NOT NULL,
@@ -347,7 +260,7 @@ def init_database():
     """)
 
     # Create reddit_posts table (if not exists)
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS reddit_posts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             reddit_feed_id INTEGER NOT NULL,
@@ -368,7 +281,7 @@ def init_database():
     """)
 
     # Create reddit_feed_tag_map table (if not exists)
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS reddit_feed_tag_map (
             reddit_feed_id INTEGER,
             tag_id INTEGER,
@@ -379,7 +292,7 @@ def init_database():
     """)
 
     # Create reddit_fetch_logs table (if not exists)
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS reddit_fetch_logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             reddit_feed_id INTEGER NOT NULL,
@@ -391,25 +304,11 @@ def init_database():
         )
     """)
 
-    conn.commit()
-    conn.close()
-    print(f"✅ Database initialized at {DATABASE_PATH}")
-
-    # Run migration for new columns
-    add_image_columns()
-    add_translation_columns()
-    add_approval_columns()
-    add_reddit_auto_approval()
-    add_country_columns()
 
-
-def add_el_comercio_tables():
+def add_el_comercio_tables(schema):
     """Add El Comercio scraping tables."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
     # Table 1: Feed configuration
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS el_comercio_feeds (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             category_id INTEGER NOT NULL,
@@ -425,7 +324,7 @@ def add_el_comercio_tables():
     """)
 
     # Table 2: Scraped articles
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS el_comercio_posts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             el_comercio_feed_id INTEGER NOT NULL,
@@ -453,7 +352,7 @@ def add_el_comercio_tables():
     """)
 
     # Table 3: Tag mapping
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS el_comercio_feed_tag_map (
             el_comercio_feed_id INTEGER,
             tag_id INTEGER,
@@ -464,7 +363,7 @@ def add_el_comercio_tables():
     """)
 
     # Table 4: Fetch logs
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS el_comercio_fetch_logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             el_comercio_feed_id INTEGER NOT NULL,
@@ -476,18 +375,11 @@ def add_el_comercio_tables():
         )
     """)
 
-    conn.commit()
-    conn.close()
-    print("✅ El Comercio tables created")
 
-
-def add_diario_correo_tables():
+def add_diario_correo_tables(schema):
     """Add Diario Correo scraping tables."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
     # Table 1: Feed configuration
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS diario_correo_feeds (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             category_id INTEGER NOT NULL,
@@ -503,7 +395,7 @@ def add_diario_correo_tables():
     """)
 
     # Table 2: Scraped articles
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS diario_correo_posts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             diario_correo_feed_id INTEGER NOT NULL,
@@ -531,7 +423,7 @@ def add_diario_correo_tables():
     """)
 
     # Table 3: Tag mapping
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS diario_correo_feed_tag_map (
             diario_correo_feed_id INTEGER,
             tag_id INTEGER,
@@ -542,7 +434,7 @@ def add_diario_correo_tables():
     """)
 
     # Table 4: Fetch logs
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS diario_correo_fetch_logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             diario_correo_feed_id INTEGER NOT NULL,
@@ -554,17 +446,10 @@ def add_diario_correo_tables():
         )
     """)
 
-    conn.commit()
-    conn.close()
-    print("✅ Diario Correo tables created")
-
 
-def add_youtube_tables():
+def add_youtube_tables(schema):
     """Add YouTube feed tables."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS youtube_feeds (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             category_id INTEGER NOT NULL,
@@ -580,7 +465,7 @@ def add_youtube_tables():
         )
     """)
 
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS youtube_posts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             youtube_feed_id INTEGER NOT NULL,
@@ -595,7 +480,7 @@ def add_youtube_tables():
         )
     """)
 
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS youtube_fetch_logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             youtube_feed_id INTEGER NOT NULL,
@@ -608,17 +493,10 @@ def add_youtube_tables():
         )
     """)
 
-    conn.commit()
-    conn.close()
-    print("✅ YouTube tables created")
-
 
-def add_batch_fetch_tables():
+def add_batch_fetch_tables(schema):
     """Add batch fetch job tables."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS batch_fetch_jobs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             status TEXT NOT NULL,
@@ -636,7 +514,7 @@ def add_batch_fetch_tables():
         )
     """)
 
-    cursor.execute("""
+    schema.execute("""
         CREATE TABLE IF NOT EXISTS batch_fetch_job_steps (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             job_id INTEGER NOT NULL,
@@ -653,43 +531,766 @@ def add_batch_fetch_tables():
         )
     """)
 
-    conn.commit()
-    conn.close()
-    print("✅ Batch fetch tables created")
 
-
-def add_youtube_transcript_columns():
+def add_youtube_transcript_columns(schema):
     """Add transcript columns to youtube_posts table."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    schema.add_column('youtube_posts', 'transcript', "TEXT")
+    schema.add_column('youtube_posts', 'transcript_status', "TEXT")
+    schema.add_column('youtube_posts', 'transcript_error', "TEXT")
+    schema.add_column('youtube_posts', 'transcript_extracted_at', "TEXT")
+
+
+def add_lead_dedupe_index(schema):
+    """Index leads by (feed_id, guid) for set-based GUID deduplication."""
+    schema.execute(
+        "CREATE INDEX IF NOT EXISTS idx_leads_feed_guid ON leads(feed_id, guid)"
+    )
+
+
+def add_feed_validator_columns(schema):
+    """Add conditional GET validators (ETag, Last-Modified, body hash) to feeds."""
+    schema.add_column('feeds', 'etag', "TEXT")
+    schema.add_column('feeds', 'last_modified', "TEXT")
+    schema.add_column('feeds', 'content_hash', "TEXT")
+
+
+def add_translation_cache_table(schema):
+    """Create the persistent translation/detection cache."""
+    schema.execute("""
+        CREATE TABLE IF NOT EXISTS translation_cache (
+            text_hash TEXT NOT NULL,
+            source TEXT NOT NULL,
+            target TEXT NOT NULL,
+            value TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (text_hash, source, target)
+        )
+    """)
+    schema.execute(
+        "CREATE INDEX IF NOT EXISTS idx_translation_cache_created_at ON translation_cache(created_at)"
+    )
+
+
+def add_feed_language_columns(schema):
+    """Add the declared feed language and the origin of each lead's language."""
+    schema.add_column('feeds', 'language', "TEXT")
+    # 'local'/'remote' = detected per entry by the bundled detector or LibreTranslate,
+    # 'feed' = taken from the feed language profile, NULL = not detected (or
+    # detected before the source was recorded)
+    schema.add_column('leads', 'language_source', "TEXT")
+    schema.execute(
+        "CREATE INDEX IF NOT EXISTS idx_leads_feed_language_source ON leads(feed_id, language_source)"
+    )
+
+
+def add_language_detection_jobs_table(schema):
+    """Add the table tracking resumable language detection jobs."""
+    schema.execute("""
+        CREATE TABLE IF NOT EXISTS language_detection_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mode TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            started_at TEXT,
+            finished_at TEXT,
+            current_table TEXT,
+            last_id INTEGER DEFAULT 0,
+            total_rows INTEGER DEFAULT 0,
+            processed_rows INTEGER DEFAULT 0,
+            updated_rows INTEGER DEFAULT 0,
+            run_seconds REAL DEFAULT 0,
+            message TEXT,
+            error_message TEXT
+        )
+    """)
+
+
+SEARCH_INDEX_COLUMNS = (
+    "title", "summary", "body", "title_translated", "summary_translated", "body_translated",
+    "content_type", "content_id", "country", "url",
+)
+# Kept in the plain search_index_meta table (same rowid) instead of the FTS
+# table: an FTS5 update re-tokenizes the whole row, and these change on every
+# approval.
+SEARCH_META_COLUMNS = ("approval_status", "published")
+# One entry per searchable table: its type code (rowid = id * 8 + code), the
+# expressions feeding each index column and each meta column, written against
+# the row alias "{r}", and the columns whose updates refresh each of them.
+SEARCH_INDEX_SOURCES = {
+    "lead": {
+        "table": "leads",
+        "code": 1,
+        "values": (
+            "{r}.title", "{r}.summary", "{r}.content",
+            "{r}.title_translated", "{r}.summary_translated", "{r}.content_translated",
+            "{r}.country", "{r}.link",
+        ),
+        "watch": (
+            "title", "summary", "content", "title_translated", "summary_translated",
+            "content_translated", "country", "link",
+        ),
+        "meta": ("{r}.approval_status", "{r}.published"),
+        "meta_watch": ("approval_status", "published"),
+    },
+    "instagram_post": {
+        "table": "instagram_posts",
+        "code": 2,
+        "values": (
+            "{r}.username", "{r}.caption", "NULL",
+            "NULL", "{r}.caption_translated", "NULL",
+            "{r}.country", "{r}.permalink",
+        ),
+        "watch": ("username", "caption", "caption_translated", "country", "permalink"),
+        "meta": ("{r}.approval_status", "{r}.posted_at"),
+        "meta_watch": ("approval_status", "posted_at"),
+    },
+    "reddit_post": {
+        "table": "reddit_posts",
+        "code": 3,
+        "values": (
+            "{r}.title", "{r}.selftext", "{r}.subreddit",
+            "{r}.title_translated", "{r}.selftext_translated", "NULL",
+            "NULL", "{r}.permalink",
+        ),
+        "watch": ("title", "selftext", "subreddit", "title_translated", "selftext_translated", "permalink"),
+        "meta": ("{r}.approval_status", "datetime({r}.created_utc, 'unixepoch')"),
+        "meta_watch": ("approval_status", "created_utc"),
+    },
+    "el_comercio_post": {
+        "table": "el_comercio_posts",
+        "code": 4,
+        "values": (
+            "{r}.title", "{r}.excerpt", "NULL",
+            "{r}.title_translated", "{r}.excerpt_translated", "NULL",
+            "{r}.country", "{r}.url",
+        ),
+        "watch": ("title", "excerpt", "title_translated", "excerpt_translated", "country", "url"),
+        "meta": ("{r}.approval_status", "{r}.published_at"),
+        "meta_watch": ("approval_status", "published_at"),
+    },
+    "diario_correo_post": {
+        "table": "diario_correo_posts",
+        "code": 5,
+        "values": (
+            "{r}.title", "{r}.excerpt", "NULL",
+            "{r}.title_translated", "{r}.excerpt_translated", "NULL",
+            "{r}.country", "{r}.url",
+        ),
+        "watch": ("title", "excerpt", "title_translated", "excerpt_translated", "country", "url"),
+        "meta": ("{r}.approval_status", "{r}.published_at"),
+        "meta_watch": ("approval_status", "published_at"),
+    },
+    # YouTube posts have no approval step and take their country from the channel
+    "youtube_post": {
+        "table": "youtube_posts",
+        "code": 6,
+        "values": (
+            "{r}.title", "{r}.description", "{r}.transcript",
+            "NULL", "NULL", "NULL",
+            "(SELECT country FROM youtube_feeds WHERE id = {r}.youtube_feed_id)", "{r}.video_url",
+        ),
+        "watch": ("title", "description", "transcript", "youtube_feed_id", "video_url"),
+        "meta": ("'approved'", "COALESCE({r}.published_at, {r}.collected_at)"),
+        "meta_watch": ("published_at", "collected_at"),
+    },
+}
+
+
+def _search_index_insert_sql(content_type: str, alias: str) -> str:
+    source = SEARCH_INDEX_SOURCES[content_type]
+    values = [value.format(r=alias) for value in source["values"]]
+    text_values, meta_values = values[:6], values[6:]
+    return (
+        f"INSERT INTO search_index(rowid, {', '.join(SEARCH_INDEX_COLUMNS)}) "
+        f"SELECT {alias}.id * 8 + {source['code']}, {', '.join(text_values)}, "
+        f"'{content_type}', {alias}.id, {', '.join(meta_values)}"
+    )
+
+
+def _search_meta_upsert_sql(content_type: str, alias: str) -> str:
+    source = SEARCH_INDEX_SOURCES[content_type]
+    values = [value.format(r=alias) for value in source["meta"]]
+    return (
+        f"INSERT OR REPLACE INTO search_index_meta(rowid, {', '.join(SEARCH_META_COLUMNS)}) "
+        f"SELECT {alias}.id * 8 + {source['code']}, {', '.join(values)}"
+    )
+
+
+def add_search_index(schema):
+    """
+    Add the cross-source search index (FTS5) and the triggers that keep it in sync.
+
+    Replaces the leads-only leads_fts index. Every content table maps its text
+    into the same six columns, so one MATCH ranks leads, posts, articles and
+    video transcripts together. Approval status and published date live in
+    search_index_meta, so approving a row never rewrites its index entry.
+    """
+    exists = schema.table_exists("search_index")
+    try:
+        schema.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                {', '.join(SEARCH_INDEX_COLUMNS[:6])},
+                {', '.join(f'{column} UNINDEXED' for column in SEARCH_INDEX_COLUMNS[6:])},
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5: searches keep using LIKE
+        print(f"⚠️  Search index not created: {e}")
+        return
+    schema.execute(f"""
+        CREATE TABLE IF NOT EXISTS search_index_meta (
+            rowid INTEGER PRIMARY KEY,
+            {', '.join(f'{column} TEXT' for column in SEARCH_META_COLUMNS)}
+        )
+    """)
+
+    for name in ("leads_fts_ai", "leads_fts_ad", "leads_fts_au"):
+        schema.execute(f"DROP TRIGGER IF EXISTS {name}")
+    schema.execute("DROP TABLE IF EXISTS leads_fts")
+
+    for content_type, source in SEARCH_INDEX_SOURCES.items():
+        table = source["table"]
+        rowid = f"old.id * 8 + {source['code']}"
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN
+                {_search_index_insert_sql(content_type, 'new')};
+                {_search_meta_upsert_sql(content_type, 'new')};
+            END
+        """)
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = {rowid};
+                DELETE FROM search_index_meta WHERE rowid = {rowid};
+            END
+        """)
+        # Only indexed fields re-index a row; status and date updates only
+        # rewrite its search_index_meta row
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {', '.join(source['watch'])} ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = {rowid};
+                {_search_index_insert_sql(content_type, 'new')};
+            END
+        """)
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_meta_au AFTER UPDATE OF {', '.join(source['meta_watch'])} ON {table} BEGIN
+                {_search_meta_upsert_sql(content_type, 'new')};
+            END
+        """)
+
+    schema.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS youtube_feeds_search_au AFTER UPDATE OF country ON youtube_feeds BEGIN
+            UPDATE search_index SET country = new.country
+            WHERE rowid IN (
+                SELECT id * 8 + {SEARCH_INDEX_SOURCES['youtube_post']['code']}
+                FROM youtube_posts WHERE youtube_feed_id = new.id
+            );
+        END
+    """)
+
+    if not exists:
+        for content_type, source in SEARCH_INDEX_SOURCES.items():
+            schema.execute(f"{_search_index_insert_sql(content_type, 'src')} FROM {source['table']} src")
+            schema.execute(f"{_search_meta_upsert_sql(content_type, 'src')} FROM {source['table']} src")
+
+
+def split_search_index_meta(schema):
+    """
+    Move approval status and published date out of the FTS table.
+
+    Both were UNINDEXED search_index columns watched by the update triggers,
+    so every approval deleted and re-tokenized the row's whole text. The
+    index is rebuilt with the current layout and search_index_meta.
+    """
+    if not schema.table_exists("search_index"):
+        # Created without FTS5; add_search_index already gave up
+        return
+    for source in SEARCH_INDEX_SOURCES.values():
+        for suffix in ("ai", "ad", "au", "meta_au"):
+            schema.execute(f"DROP TRIGGER IF EXISTS {source['table']}_search_{suffix}")
+    schema.execute("DROP TRIGGER IF EXISTS youtube_feeds_search_au")
+    schema.execute("DROP TABLE IF EXISTS search_index")
+    schema.execute("DROP TABLE IF EXISTS search_index_meta")
+    add_search_index(schema)
+
+
+# (index name, table, columns) for keyset pagination: equality filters first,
+# then the sort key exactly as the list endpoints write it, then id.
+KEYSET_INDEXES = (
+    ("idx_leads_keyset_published", "leads", "approval_status, COALESCE(published, ''), id"),
+    ("idx_leads_keyset_collected_at", "leads", "approval_status, COALESCE(collected_at, ''), id"),
+    ("idx_leads_keyset_feed_published", "leads", "feed_id, approval_status, COALESCE(published, ''), id"),
+    ("idx_instagram_posts_keyset", "instagram_posts", "approval_status, COALESCE(posted_at, ''), id"),
+    ("idx_youtube_posts_keyset", "youtube_posts", "COALESCE(published_at, collected_at, ''), id"),
+    ("idx_el_comercio_posts_keyset", "el_comercio_posts", "approval_status, COALESCE(published_at, ''), id"),
+    ("idx_el_comercio_posts_keyset_collected", "el_comercio_posts", "approval_status, COALESCE(collected_at, ''), id"),
+    ("idx_diario_correo_posts_keyset", "diario_correo_posts", "approval_status, COALESCE(published_at, ''), id"),
+    ("idx_diario_correo_posts_keyset_collected", "diario_correo_posts", "approval_status, COALESCE(collected_at, ''), id"),
+    ("idx_fetch_logs_keyset", "fetch_logs", "COALESCE(fetched_at, ''), id"),
+    ("idx_fetch_logs_keyset_feed", "fetch_logs", "feed_id, COALESCE(fetched_at, ''), id"),
+)
+
+
+# Hot paths that the keyset indexes do not cover: the approval queue, the
+# approval and translation counters, feed filters on the scrape tables and
+# the *_feed_id joins. Entries are (name, table, columns[, partial WHERE]).
+HOT_PATH_INDEXES = (
+    # /approval/pending lists each source by collected_at; only pending rows
+    # are indexed, so these stay as small as the queue itself.
+    ("idx_leads_pending", "leads", "collected_at", "approval_status = 'pending'"),
+    ("idx_instagram_posts_pending", "instagram_posts", "collected_at", "approval_status = 'pending'"),
+    ("idx_reddit_posts_pending", "reddit_posts", "collected_at", "approval_status = 'pending'"),
+    ("idx_el_comercio_posts_pending", "el_comercio_posts", "collected_at", "approval_status = 'pending'"),
+    ("idx_diario_correo_posts_pending", "diario_correo_posts", "collected_at", "approval_status = 'pending'"),
+    ("idx_reddit_posts_approval_status", "reddit_posts", "approval_status"),
+    # Translation worker scans and the /translate counters
+    ("idx_leads_translation_status", "leads", "translation_status"),
+    ("idx_instagram_posts_translation_status", "instagram_posts", "translation_status"),
+    ("idx_reddit_posts_translation_status", "reddit_posts", "translation_status"),
+    # Unfiltered and per-feed /posts and /scrapes lists of the scrape sources
+    ("idx_el_comercio_posts_published", "el_comercio_posts", "COALESCE(published_at, ''), id"),
+    ("idx_el_comercio_posts_collected", "el_comercio_posts", "COALESCE(collected_at, ''), id"),
+    ("idx_el_comercio_posts_feed_published", "el_comercio_posts", "el_comercio_feed_id, COALESCE(published_at, ''), id"),
+    ("idx_el_comercio_posts_country", "el_comercio_posts", "country, approval_status, COALESCE(collected_at, ''), id"),
+    ("idx_diario_correo_posts_published", "diario_correo_posts", "COALESCE(published_at, ''), id"),
+    ("idx_diario_correo_posts_collected", "diario_correo_posts", "COALESCE(collected_at, ''), id"),
+    ("idx_diario_correo_posts_feed_published", "diario_correo_posts", "diario_correo_feed_id, COALESCE(published_at, ''), id"),
+    ("idx_diario_correo_posts_country", "diario_correo_posts", "country, approval_status, COALESCE(collected_at, ''), id"),
+    # Joins and cascading deletes on the feed foreign keys
+    ("idx_instagram_posts_feed", "instagram_posts", "instagram_feed_id, approval_status, COALESCE(posted_at, ''), id"),
+    ("idx_reddit_posts_feed", "reddit_posts", "reddit_feed_id"),
+    ("idx_youtube_posts_feed", "youtube_posts", "youtube_feed_id, COALESCE(published_at, collected_at, ''), id"),
+    ("idx_instagram_fetch_logs_feed", "instagram_fetch_logs", "instagram_feed_id, fetched_at"),
+    ("idx_reddit_fetch_logs_feed", "reddit_fetch_logs", "reddit_feed_id, fetched_at"),
+    ("idx_youtube_fetch_logs_feed", "youtube_fetch_logs", "youtube_feed_id, fetched_at"),
+    ("idx_el_comercio_fetch_logs_feed", "el_comercio_fetch_logs", "el_comercio_feed_id, fetched_at"),
+    ("idx_diario_correo_fetch_logs_feed", "diario_correo_fetch_logs", "diario_correo_feed_id, fetched_at"),
+)
+
+def _create_index(schema, name: str, table: str, columns: str, where: str = None):
+    sql = f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})"
+    if where:
+        sql += f" WHERE {where}"
+    schema.execute(sql)
+
+
+def add_keyset_indexes(schema):
+    """Add the indexes behind cursor pagination of the list endpoints."""
+    for index in KEYSET_INDEXES:
+        _create_index(schema, *index)
+
+
+def add_hot_path_indexes(schema):
+    """Add the approval, translation and feed join indexes."""
+    for index in HOT_PATH_INDEXES:
+        _create_index(schema, *index)
+    # Without statistics the planner cannot tell that a partial index holds
+    # only a fraction of the table and keeps using the wider ones
+    schema.execute("ANALYZE")
+
+
+CONTENT_QUEUE_COLUMNS = (
+    "title", "summary", "source_name", "collected_at", "approval_status",
+    "image_url", "link", "detected_language", "translation_status",
+)
+# One entry per table with an approval step: the expression feeding each
+# content_queue column, written against the row alias "{r}", the columns whose
+# updates refresh the row, and the feed whose name is shown as source_name.
+CONTENT_QUEUE_SOURCES = {
+    "lead": {
+        "table": "leads",
+        "values": (
+            "COALESCE(NULLIF({r}.title_translated, ''), {r}.title)",
+            "COALESCE(NULLIF({r}.summary_translated, ''), {r}.summary)",
+            "COALESCE((SELECT source_name FROM feeds WHERE id = {r}.feed_id), '')",
+            "{r}.collected_at", "{r}.approval_status", "{r}.image_url", "{r}.link",
+            "{r}.detected_language", "{r}.translation_status",
+        ),
+        "watch": (
+            "title", "title_translated", "summary", "summary_translated", "feed_id", "collected_at",
+            "approval_status", "image_url", "link", "detected_language", "translation_status",
+        ),
+        "feed": {"table": "feeds", "key": "feed_id", "watch": "source_name", "value": "{f}.source_name"},
+    },
+    "instagram_post": {
+        "table": "instagram_posts",
+        "values": (
+            "COALESCE(SUBSTR(NULLIF(COALESCE(NULLIF({r}.caption_translated, ''), {r}.caption), ''), 1, 100), 'No caption')",
+            "COALESCE(NULLIF({r}.caption_translated, ''), {r}.caption)",
+            "COALESCE((SELECT '@' || username FROM instagram_feeds WHERE id = {r}.instagram_feed_id), '')",
+            "{r}.collected_at", "{r}.approval_status",
+            "COALESCE(NULLIF({r}.thumbnail_url, ''), NULLIF({r}.media_url, ''))", "{r}.permalink",
+            "{r}.detected_language", "{r}.translation_status",
+        ),
+        "watch": (
+            "caption", "caption_translated", "instagram_feed_id", "collected_at", "approval_status",
+            "thumbnail_url", "media_url", "permalink", "detected_language", "translation_status",
+        ),
+        "feed": {"table": "instagram_feeds", "key": "instagram_feed_id", "watch": "username", "value": "'@' || {f}.username"},
+    },
+    "reddit_post": {
+        "table": "reddit_posts",
+        "values": (
+            "COALESCE(NULLIF({r}.title_translated, ''), {r}.title)",
+            "SUBSTR(NULLIF(COALESCE(NULLIF({r}.selftext_translated, ''), {r}.selftext), ''), 1, 200)",
+            "'r/' || {r}.subreddit",
+            "{r}.collected_at", "{r}.approval_status", "NULL", "{r}.permalink",
+            "{r}.detected_language", "{r}.translation_status",
+        ),
+        "watch": (
+            "title", "title_translated", "selftext", "selftext_translated", "subreddit", "collected_at",
+            "approval_status", "permalink", "detected_language", "translation_status",
+        ),
+        "feed": None,
+    },
+    "el_comercio_post": {
+        "table": "el_comercio_posts",
+        "values": (
+            "COALESCE(NULLIF({r}.title_translated, ''), {r}.title)",
+            "COALESCE(NULLIF({r}.excerpt_translated, ''), {r}.excerpt)",
+            "COALESCE((SELECT display_name FROM el_comercio_feeds WHERE id = {r}.el_comercio_feed_id), '')",
+            "{r}.collected_at", "{r}.approval_status", "{r}.image_url", "{r}.url",
+            "{r}.detected_language", "{r}.translation_status",
+        ),
+        "watch": (
+            "title", "title_translated", "excerpt", "excerpt_translated", "el_comercio_feed_id", "collected_at",
+            "approval_status", "image_url", "url", "detected_language", "translation_status",
+        ),
+        "feed": {"table": "el_comercio_feeds", "key": "el_comercio_feed_id", "watch": "display_name", "value": "{f}.display_name"},
+    },
+    "diario_correo_post": {
+        "table": "diario_correo_posts",
+        "values": (
+            "COALESCE(NULLIF({r}.title_translated, ''), {r}.title)",
+            "COALESCE(NULLIF({r}.excerpt_translated, ''), {r}.excerpt)",
+            "COALESCE((SELECT display_name FROM diario_correo_feeds WHERE id = {r}.diario_correo_feed_id), '')",
+            "{r}.collected_at", "{r}.approval_status", "{r}.image_url", "{r}.url",
+            "{r}.detected_language", "{r}.translation_status",
+        ),
+        "watch": (
+            "title", "title_translated", "excerpt", "excerpt_translated", "diario_correo_feed_id", "collected_at",
+            "approval_status", "image_url", "url", "detected_language", "translation_status",
+        ),
+        "feed": {"table": "diario_correo_feeds", "key": "diario_correo_feed_id", "watch": "display_name", "value": "{f}.display_name"},
+    },
+}
+
+
+def _content_queue_upsert_sql(content_type: str, where: str) -> str:
+    source = CONTENT_QUEUE_SOURCES[content_type]
+    values = [value.format(r="r") for value in source["values"]]
+    return (
+        f"INSERT OR REPLACE INTO content_queue(content_type, content_id, {', '.join(CONTENT_QUEUE_COLUMNS)}) "
+        f"SELECT '{content_type}', r.id, {', '.join(values)} FROM {source['table']} r {where}"
+    )
+
+
+def add_content_queue(schema):
+    """
+    Add the approval queue spanning every content type, kept in sync by triggers.
+
+    Triggers re-read the stored row instead of using NEW, so the row is right
+    whichever AFTER INSERT trigger (such as reddit_posts_auto_approve) runs last.
+    """
+    exists = schema.table_exists("content_queue")
+    schema.execute(f"""
+        CREATE TABLE IF NOT EXISTS content_queue (
+            content_type TEXT NOT NULL,
+            content_id INTEGER NOT NULL,
+            {', '.join(f'{column} TEXT' for column in CONTENT_QUEUE_COLUMNS)},
+            PRIMARY KEY (content_type, content_id)
+        )
+    """)
+    # The pending queue page and its count read only this partial index
+    schema.execute("""
+        CREATE INDEX IF NOT EXISTS idx_content_queue_pending
+        ON content_queue(collected_at, content_type, content_id)
+        WHERE approval_status = 'pending'
+    """)
+    schema.execute(
+        "CREATE INDEX IF NOT EXISTS idx_content_queue_status ON content_queue(content_type, approval_status)"
+    )
+
+    for content_type, source in CONTENT_QUEUE_SOURCES.items():
+        table = source["table"]
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_queue_ai AFTER INSERT ON {table} BEGIN
+                {_content_queue_upsert_sql(content_type, 'WHERE r.id = new.id')};
+            END
+        """)
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_queue_ad AFTER DELETE ON {table} BEGIN
+                DELETE FROM content_queue WHERE content_type = '{content_type}' AND content_id = old.id;
+            END
+        """)
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_queue_au AFTER UPDATE OF {', '.join(source['watch'])} ON {table} BEGIN
+                {_content_queue_upsert_sql(content_type, 'WHERE r.id = new.id')};
+            END
+        """)
+        feed = source["feed"]
+        if feed:
+            schema.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {feed['table']}_queue_au AFTER UPDATE OF {feed['watch']} ON {feed['table']} BEGIN
+                    UPDATE content_queue SET source_name = {feed['value'].format(f='new')}
+                    WHERE content_type = '{content_type}'
+                      AND content_id IN (SELECT id FROM {table} WHERE {feed['key']} = new.id);
+                END
+            """)
+
+    if not exists:
+        for content_type in CONTENT_QUEUE_SOURCES:
+            schema.execute(_content_queue_upsert_sql(content_type, ""))
+
+
+# Status columns counted per content type in content_counters
+COUNTED_STATUSES = ("approval_status", "translation_status")
+
+
+def content_counters_rebuild_sql(content_type: str, field: str) -> str:
+    """INSERT counting one table's rows per value of one status column."""
+    table = CONTENT_QUEUE_SOURCES[content_type]["table"]
+    return (
+        f"INSERT INTO content_counters (content_type, field, status, count) "
+        f"SELECT '{content_type}', '{field}', COALESCE({field}, ''), COUNT(*) FROM {table} "
+        f"GROUP BY COALESCE({field}, '')"
+    )
+
+
+def _counter_delta_sql(content_type: str, field: str, status: str, delta: int) -> str:
+    return (
+        f"INSERT INTO content_counters (content_type, field, status, count) "
+        f"VALUES ('{content_type}', '{field}', COALESCE({status}, ''), {delta}) "
+        f"ON CONFLICT (content_type, field, status) DO UPDATE SET count = count + {delta}"
+    )
+
+
+def add_content_counters(schema):
+    """
+    Add per-type approval and translation status counts, kept exact by triggers.
+
+    NULL statuses are counted under ''. The deltas commute, so the counts stay
+    right whichever order the insert and auto-approve triggers run in.
+    """
+    exists = schema.table_exists("content_counters")
+    schema.execute("""
+        CREATE TABLE IF NOT EXISTS content_counters (
+            content_type TEXT NOT NULL,
+            field TEXT NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (content_type, field, status)
+        ) WITHOUT ROWID
+    """)
 
-    def column_exists(table_name, column_name):
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [row[1] for row in cursor.fetchall()]
-        return column_name in columns
+    for content_type, source in CONTENT_QUEUE_SOURCES.items():
+        table = source["table"]
+        added = ";\n".join(_counter_delta_sql(content_type, field, f"new.{field}", 1) for field in COUNTED_STATUSES)
+        removed = ";\n".join(_counter_delta_sql(content_type, field, f"old.{field}", -1) for field in COUNTED_STATUSES)
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_counters_ai AFTER INSERT ON {table} BEGIN
+                {added};
+            END
+        """)
+        schema.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_counters_ad AFTER DELETE ON {table} BEGIN
+                {removed};
+            END
+        """)
+        for field in COUNTED_STATUSES:
+            schema.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_counters_{field}_au AFTER UPDATE OF {field} ON {table}
+                WHEN old.{field} IS NOT new.{field} BEGIN
+                    {_counter_delta_sql(content_type, field, f"old.{field}", -1)};
+                    {_counter_delta_sql(content_type, field, f"new.{field}", 1)};
+                END
+            """)
+
+    if not exists:
+        for content_type in CONTENT_QUEUE_SOURCES:
+            for field in COUNTED_STATUSES:
+                schema.execute(content_counters_rebuild_sql(content_type, field))
+
+
+def add_approval_rules_table(schema):
+    """Add the auto-approval rules fetchers evaluate as they insert content."""
+    schema.execute("""
+        CREATE TABLE IF NOT EXISTS approval_rules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            action TEXT NOT NULL CHECK (action IN ('approved', 'rejected')),
+            content_type TEXT,
+            source_name TEXT,
+            country TEXT,
+            language TEXT,
+            keywords TEXT,
+            pattern TEXT,
+            priority INTEGER NOT NULL DEFAULT 0,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
 
-    if not column_exists('youtube_posts', 'transcript'):
-        cursor.execute("ALTER TABLE youtube_posts ADD COLUMN transcript TEXT")
-    if not column_exists('youtube_posts', 'transcript_status'):
-        cursor.execute("ALTER TABLE youtube_posts ADD COLUMN transcript_status TEXT")
-    if not column_exists('youtube_posts', 'transcript_error'):
-        cursor.execute("ALTER TABLE youtube_posts ADD COLUMN transcript_error TEXT")
-    if not column_exists('youtube_posts', 'transcript_extracted_at'):
-        cursor.execute("ALTER TABLE youtube_posts ADD COLUMN transcript_extracted_at TEXT")
 
-    conn.commit()
-    conn.close()
-    print("✅ YouTube transcript columns added")
+def add_feed_detection_index(schema):
+    """
+    Index the detections a feed language profile learns from.
+
+    The profile reads a feed's newest leads with language_source 'local' or
+    'remote'; with this partial index that is a range read in id order.
+    idx_leads_feed_language_source could not serve the ORDER BY, so the
+    planner preferred scanning leads.
+    """
+    _create_index(
+        schema, "idx_leads_feed_detected", "leads", "feed_id, id",
+        "language_source IN ('local', 'remote')"
+    )
+    schema.execute("DROP INDEX IF EXISTS idx_leads_feed_language_source")
+    schema.execute("ANALYZE leads")
+
+
+def mark_captionless_posts_skipped(schema):
+    """
+    Give caption-less Instagram posts the status the translator uses.
+
+    The fetcher used to store them as 'already_english' while the
+    translation worker marks them 'skipped'; both now use 'skipped'.
+    """
+    schema.execute(
+        """UPDATE instagram_posts SET translation_status = 'skipped'
+           WHERE translation_status = 'already_english'
+             AND (caption IS NULL OR caption = '')"""
+    )
+
+
+class Schema:
+    """
+    The connection every migration runs on.
+
+    Column lists are read once per table and kept up to date by add_column,
+    so column checks do not run PRAGMA table_info each time.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._columns = {}
+
+    def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        return self.conn.execute(sql, params)
+
+    def table_exists(self, table: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        return row is not None
+
+    def columns(self, table: str) -> set:
+        if table not in self._columns:
+            self._columns[table] = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+        return self._columns[table]
+
+    def add_column(self, table: str, column: str, definition: str) -> None:
+        """Add a column unless the table already has it."""
+        columns = self.columns(table)
+        if column not in columns:
+            self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            columns.add(column)
+
+
+# Numbered migrations, applied in order and recorded in schema_version.
+# Every step is idempotent, so databases created before schema_version
+# existed replay them once and are then recorded as current. Append new
+# steps with the next number; never renumber or edit one that has shipped.
+MIGRATIONS = (
+    (1, init_database),
+    (2, add_image_columns),
+    (3, add_translation_columns),
+    (4, add_approval_columns),
+    (5, add_reddit_auto_approval),
+    (6, add_country_columns),
+    (7, add_el_comercio_tables),
+    (8, add_diario_correo_tables),
+    (9, add_youtube_tables),
+    (10, add_youtube_transcript_columns),
+    (11, add_batch_fetch_tables),
+    (12, add_lead_dedupe_index),
+    (13, add_feed_validator_columns),
+    (14, add_translation_cache_table),
+    (15, add_feed_language_columns),
+    (16, add_language_detection_jobs_table),
+    (17, add_search_index),
+    (18, add_keyset_indexes),
+    (19, add_hot_path_indexes),
+    (20, add_content_queue),
+    (21, add_content_counters),
+    (22, add_approval_rules_table),
+    (23, add_feed_detection_index),
+    (24, split_search_index_meta),
+    (25, mark_captionless_posts_skipped),
+)
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    try:
+        return conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        # No schema_version table yet: nothing has been recorded
+        return 0
 
 
 def run_migrations():
-    """Run all schema setup and migrations."""
-    init_database()
-    add_el_comercio_tables()
-    add_diario_correo_tables()
-    add_youtube_tables()
-    add_youtube_transcript_columns()
-    add_batch_fetch_tables()
+    """
+    Apply every migration newer than the database's schema version.
+
+    Pending migrations run on one connection in one transaction, so a failure
+    leaves the schema untouched. When the schema is current this costs one
+    query. Returns (version, name, milliseconds) for each applied migration.
+    """
+    conn = sqlite3.connect(DATABASE_PATH, isolation_level=None)
+    try:
+        latest = MIGRATIONS[-1][0]
+        if _schema_version(conn) >= latest:
+            return []
+
+        applied = []
+        started_all = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    duration_ms REAL
+                )
+            """)
+            # Read again under the write lock in case another process migrated
+            current = _schema_version(conn)
+            schema = Schema(conn)
+            for version, migration in MIGRATIONS:
+                if version <= current:
+                    continue
+                started = time.perf_counter()
+                migration(schema)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                conn.execute(
+                    "INSERT INTO schema_version (version, name, duration_ms) VALUES (?, ?, ?)",
+                    (version, migration.__name__, round(elapsed_ms, 2))
+                )
+                applied.append((version, migration.__name__, elapsed_ms))
+                print(f"✅ Migration {version} {migration.__name__} ({elapsed_ms:.1f} ms)")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    total_ms = (time.perf_counter() - started_all) * 1000
+    print(f"✅ Database at {DATABASE_PATH} migrated to version {latest} ({total_ms:.1f} ms)")
+    return applied
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+"""
+Measure event-loop lag while the approval routes run.
+
+Sends concurrent requests to the async approval routes in-process while a
+probe coroutine wakes every PROBE_INTERVAL_MS; how late each wake-up comes
+is time the event loop was blocked. A handler that runs sqlite3 on the loop
+shows up as lag about as long as its queries.
+
+Each request is sent once first, so connection setup is not measured.
+Only no-op writes are sent (approving content id 0, which never exists).
+Run from apps/api after migrations:
+
+    python -m lib.database.loop_lag_check
+
+LOOP_LAG_REQUESTS (default 200), LOOP_LAG_CONCURRENCY (default 20) and
+LOOP_LAG_MAX_MS (default 100) adjust the run. Exits with status 1 when the
+worst lag exceeds LOOP_LAG_MAX_MS or a request fails.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+PROBE_INTERVAL_MS = 5
+
+NOOP_APPROVAL = {
+    "content_type": "lead",
+    "content_id": 0,
+    "status": "approved",
+    "approved_by": "loop-lag-check",
+}
+
+# (method, path, query params, JSON body)
+REQUESTS = (
+    ("GET", "/approval/pending", {"limit": 100}, None),
+    ("GET", "/approval/pending", {"content_type": "lead,instagram_post", "limit": 100, "offset": 100}, None),
+    ("GET", "/approval/stats", {}, None),
+    ("POST", "/approval/approve", {}, NOOP_APPROVAL),
+    ("POST", "/approval/approve/batch", {}, {"items": [NOOP_APPROVAL]}),
+)
+
+
+def _get_int_env(name: str, default: int) -> int:
+    try:
+        value = int(os.getenv(name, ""))
+    except (TypeError, ValueError):
+        value = default
+    return max(1, value)
+
+
+async def _request(app, method: str, path: str, params: Dict, body: Optional[Dict]) -> int:
+    """Send one request straight to the ASGI app and return its status."""
+    payload = json.dumps(body).encode() if body is not None else b""
+    headers = [(b"host", b"localhost")]
+    if body is not None:
+        headers.append((b"content-type", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params).encode(),
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            # Only asked again once the response is done
+            await asyncio.sleep(3600)
+        sent = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _probe(stop: asyncio.Event, lags: List[float]) -> None:
+    interval = PROBE_INTERVAL_MS / 1000
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def measure(app, total: int, concurrency: int) -> Tuple[List[float], List[int], float]:
+    """Return (probe lags in ms, response statuses, elapsed seconds)."""
+    lags: List[float] = []
+    statuses: List[int] = []
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        method, path, params, body = REQUESTS[index % len(REQUESTS)]
+        async with semaphore:
+            statuses.append(await _request(app, method, path, params, body))
+
+    # Open connections and build validators before measuring
+    for method, path, params, body in REQUESTS:
+        await _request(app, method, path, params, body)
+
+    probe = asyncio.create_task(_probe(stop, lags))
+    # Let the probe take a first reading of an idle loop
+    await asyncio.sleep(PROBE_INTERVAL_MS / 1000 * 2)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    return lags, statuses, elapsed
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_check() -> int:
+    from app.main import app
+    from .aio import close_db_executor
+
+    total = _get_int_env("LOOP_LAG_REQUESTS", 200)
+    concurrency = _get_int_env("LOOP_LAG_CONCURRENCY", 20)
+    max_lag_ms = _get_int_env("LOOP_LAG_MAX_MS", 100)
+
+    try:
+        lags, statuses, elapsed = asyncio.run(measure(app, total, concurrency))
+    finally:
+        close_db_executor()
+
+    failed = [status for status in statuses if status >= 400]
+    worst = max(lags) if lags else 0.0
+    print(f"{len(statuses)} requests ({concurrency} concurrent) in {elapsed * 1000:.0f} ms")
+    if lags:
+        print(f"Event loop lag: p50 {_percentile(lags, 0.5):.1f} ms, "
+              f"p99 {_percentile(lags, 0.99):.1f} ms, max {worst:.1f} ms over {len(lags)} probes")
+    if failed:
+        print(f"❌ {len(failed)} request(s) failed")
+    if worst > max_lag_ms:
+        print(f"❌ Event loop blocked for {worst:.1f} ms (limit {max_lag_ms} ms)")
+    if failed or worst > max_lag_ms:
+        return 1
+    print("✅ Approval routes did not block the event loop")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_check())
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHE_SIZE_KB = 16384
+SYNCHRONOUS_MODES = {0: "off", 1: "normal", 2: "full", 3: "extra"}
+
+
+def _get_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name, "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        value = default
+    return max(0, value)
+
+
+class _PooledConnection:
+    """Thread-local holder; weak-referenceable unlike sqlite3.Connection."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def configure_connection(conn: sqlite3.Connection, busy_timeout_ms: int, cache_size_kb: int) -> None:
+    """Apply the connection-level pragmas used for every SQLite connection."""
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+    # Negative cache_size is interpreted by SQLite as KiB rather than pages.
+    conn.execute(f"PRAGMA cache_size = -{int(cache_size_kb)}")
+
+
+class ConnectionPool:
+    """
+    Keeps one long-lived SQLite connection per thread.
+
+    FastAPI runs sync handlers on a reused worker threadpool and the batch
+    fetch job runs on its own Thread, so a thread-local connection is never
+    shared across threads while still being reused across calls. Pragmas are
+    applied once, when the connection is opened.
+    """
+
+    def __init__(self, database_path: Path, busy_timeout_ms: Optional[int] = None,
+                 cache_size_kb: Optional[int] = None):
+        self.database_path = database_path
+        self.busy_timeout_ms = (
+            busy_timeout_ms if busy_timeout_ms is not None
+            else _get_int_env("SQLITE_BUSY_TIMEOUT_MS", DEFAULT_BUSY_TIMEOUT_MS)
+        )
+        self.cache_size_kb = (
+            cache_size_kb if cache_size_kb is not None
+            else _get_int_env("SQLITE_CACHE_SIZE_KB", DEFAULT_CACHE_SIZE_KB)
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Holders disappear together with their thread's local storage, so
+        # this set only tracks connections whose thread is still alive.
+        self._connections: "weakref.WeakSet[_PooledConnection]" = weakref.WeakSet()
+        self._hits = 0
+        self._misses = 0
+        self._closed = 0
+        # Passed to sqlite3 set_trace_callback on every connection opened
+        # afterwards; used by the query plan check, None otherwise.
+        self.trace_callback: Optional[Callable[[str], None]] = None
+
+    def _open(self) -> sqlite3.Connection:
+        # isolation_level=None leaves transaction control to the callers
+        # (see lib.database.db), so a reused connection never carries an
+        # implicit transaction from one request into the next.
+        conn = sqlite3.connect(
+            self.database_path,
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,
+        )
+        conn.row_factory = sqlite3.Row
+        configure_connection(conn, self.busy_timeout_ms, self.cache_size_kb)
+        if self.trace_callback is not None:
+            conn.set_trace_callback(self.trace_callback)
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        holder = getattr(self._local, "holder", None)
+        if holder is not None:
+            with self._lock:
+                self._hits += 1
+            return holder.conn
+
+        holder = _PooledConnection(self._open())
+        self._local.holder = holder
+        with self._lock:
+            self._misses += 1
+            self._connections.add(holder)
+        return holder.conn
+
+    def close_all(self) -> None:
+        """Close every connection opened by this pool."""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections = weakref.WeakSet()
+        for holder in connections:
+            try:
+                holder.conn.close()
+            except sqlite3.Error:
+                # Connections owned by other threads refuse to close here;
+                # they are released when their thread exits.
+                continue
+            with self._lock:
+                self._closed += 1
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, object]:
+        """Pool counters plus the pragmas in effect on this thread's connection."""
+        with self._lock:
+            hits = self._hits
+            misses = self._misses
+            open_connections = len(self._connections)
+            closed = self._closed
+        conn = self.get()
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        requests = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / requests, 4) if requests else 0.0,
+            "open_connections": open_connections,
+            "closed_connections": closed,
+            "busy_timeout_ms": self.busy_timeout_ms,
+            "cache_size_kb": self.cache_size_kb,
+            "journal_mode": journal_mode,
+            "synchronous": SYNCHRONOUS_MODES.get(synchronous, str(synchronous)),
+        }
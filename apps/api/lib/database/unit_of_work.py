@@ -0,0 +1,74 @@
+from typing import Dict, List, Tuple
+
+from .db import execute_many, execute_query, transaction
+
+
+class UnitOfWork:
+    """
+    Collects writes and applies them in one transaction.
+
+    Statements registered with add() are grouped by SQL text and flushed with
+    executemany, in the order each statement was first added. execute() runs
+    a single statement immediately (after flushing pending batches) so its
+    row id can be used, e.g. for a fetch log. Nothing is committed until the
+    block exits cleanly; any error rolls back every write in the unit.
+
+    Usage:
+        with UnitOfWork() as uow:
+            uow.add("INSERT INTO ...", params)
+            log_id = uow.execute("INSERT INTO fetch_logs ...", params)
+    """
+
+    def __init__(self):
+        self._batches: Dict[str, List[Tuple]] = {}
+        self._rowcounts: Dict[str, int] = {}
+        self._transaction = None
+
+    def add(self, query: str, params: Tuple) -> None:
+        """Queue a statement to be executed in a batch."""
+        self._batches.setdefault(query, []).append(params)
+
+    def add_many(self, query: str, params_list: List[Tuple]) -> None:
+        """Queue several parameter sets for the same statement."""
+        if params_list:
+            self._batches.setdefault(query, []).extend(params_list)
+
+    def pending_count(self) -> int:
+        return sum(len(params_list) for params_list in self._batches.values())
+
+    def rowcount(self, query: str) -> int:
+        """Rows changed so far by the flushed batches of a statement."""
+        return self._rowcounts.get(query, 0)
+
+    def flush(self) -> None:
+        """Write queued batches inside the open transaction."""
+        batches = self._batches
+        self._batches = {}
+        for query, params_list in batches.items():
+            changed = execute_many(query, params_list)
+            self._rowcounts[query] = self._rowcounts.get(query, 0) + changed
+
+    def execute(self, query: str, params: Tuple = ()) -> int:
+        """Flush queued batches, then run one statement and return its row id."""
+        self.flush()
+        return execute_query(query, params)
+
+    def __enter__(self) -> "UnitOfWork":
+        self._transaction = transaction()
+        self._transaction.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        context = self._transaction
+        self._transaction = None
+        if exc_type is None:
+            try:
+                self.flush()
+            except BaseException as flush_exc:
+                context.__exit__(type(flush_exc), flush_exc, flush_exc.__traceback__)
+                raise
+            context.__exit__(None, None, None)
+            return False
+        self._batches = {}
+        context.__exit__(exc_type, exc, tb)
+        return False
@@ -0,0 +1,197 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_READ_TIMEOUT_SECONDS = 20.0
+DEFAULT_TOTAL_TIMEOUT_SECONDS = 60.0
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_POOL_SIZE = 16
+CHUNK_SIZE = 64 * 1024
+USER_AGENT = "Mozilla/5.0 (compatible; LeadsManager/1.0)"
+
+
+class FeedDownloadError(Exception):
+    """Raised when a feed document cannot be downloaded within the limits."""
+    pass
+
+
+def _get_float_env(name: str, default: float) -> float:
+    raw = os.getenv(name, "")
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        value = default
+    return value if value > 0 else default
+
+
+def _get_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name, "")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        value = default
+    return value if value > 0 else default
+
+
+CONNECT_TIMEOUT_SECONDS = _get_float_env("FEED_CONNECT_TIMEOUT_SECONDS", DEFAULT_CONNECT_TIMEOUT_SECONDS)
+READ_TIMEOUT_SECONDS = _get_float_env("FEED_READ_TIMEOUT_SECONDS", DEFAULT_READ_TIMEOUT_SECONDS)
+TOTAL_TIMEOUT_SECONDS = _get_float_env("FEED_TOTAL_TIMEOUT_SECONDS", DEFAULT_TOTAL_TIMEOUT_SECONDS)
+MAX_BYTES = _get_int_env("FEED_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+
+class _DownloadStats:
+    """Thread-safe counters for downloads made through this module."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.requests = 0
+        self.not_modified = 0
+        self.errors = 0
+        self.bytes_downloaded = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, started: float, status_code: Optional[int], size: int, failed: bool) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.requests += 1
+            self.bytes_downloaded += size
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            if failed:
+                self.errors += 1
+            elif status_code == 304:
+                self.not_modified += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "not_modified": self.not_modified,
+                "errors": self.errors,
+                "bytes_downloaded": self.bytes_downloaded,
+                "total_ms": round(self.total_ms, 2),
+                "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+                "max_ms": round(self.max_ms, 2),
+                "connect_timeout_seconds": CONNECT_TIMEOUT_SECONDS,
+                "read_timeout_seconds": READ_TIMEOUT_SECONDS,
+                "total_timeout_seconds": TOTAL_TIMEOUT_SECONDS,
+                "max_bytes": MAX_BYTES,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset()
+
+
+_stats = _DownloadStats()
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    # Keep enough pooled keep-alive connections per host for the concurrent
+    # feed fetcher; requests advertises gzip/deflate and decodes them.
+    adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=DEFAULT_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+_session = _build_session()
+
+
+def get_download_stats() -> Dict[str, Any]:
+    """Return download counts, bytes and timings."""
+    return _stats.snapshot()
+
+
+def reset_download_stats() -> None:
+    """Clear download counters."""
+    _stats.reset()
+
+
+def download(url: str, headers: Optional[Dict[str, str]] = None,
+             max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Download a URL through the shared session with bounded time and size.
+
+    The body is streamed and decompressed chunk by chunk; the download is
+    aborted once it exceeds max_bytes (checked on the decoded size, so a
+    small gzip bomb cannot expand past the limit) or takes longer than the
+    total timeout. Returns a dict with status_code, content (b"" for 304),
+    headers (lower-cased), final url and elapsed_ms.
+
+    Raises:
+        FeedDownloadError: on connection errors, timeouts, HTTP errors or
+            oversized bodies.
+    """
+    limit = max_bytes or MAX_BYTES
+    started = time.perf_counter()
+    status_code = None
+    size = 0
+    failed = True
+
+    try:
+        response = _session.get(
+            url,
+            headers=headers,
+            timeout=(CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS),
+            stream=True,
+        )
+    except requests.RequestException as exc:
+        _stats.record(started, status_code, size, failed)
+        raise FeedDownloadError(f"Failed to download {url}: {exc}") from exc
+
+    try:
+        status_code = response.status_code
+        if status_code != 304:
+            if status_code >= 400:
+                raise FeedDownloadError(f"Failed to download {url}: HTTP {status_code}")
+
+            declared = response.headers.get("Content-Length")
+            if declared and declared.isdigit() and response.headers.get("Content-Encoding") is None:
+                if int(declared) > limit:
+                    raise FeedDownloadError(
+                        f"Feed at {url} is {declared} bytes, over the {limit} byte limit"
+                    )
+
+        chunks = []
+        if status_code != 304:
+            deadline = started + TOTAL_TIMEOUT_SECONDS
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                size += len(chunk)
+                if size > limit:
+                    raise FeedDownloadError(f"Feed at {url} exceeded the {limit} byte limit")
+                if time.perf_counter() > deadline:
+                    raise FeedDownloadError(
+                        f"Feed at {url} took longer than {TOTAL_TIMEOUT_SECONDS:g}s to download"
+                    )
+                chunks.append(chunk)
+        failed = False
+    except requests.RequestException as exc:
+        raise FeedDownloadError(f"Failed to download {url}: {exc}") from exc
+    finally:
+        response.close()
+        _stats.record(started, status_code, size, failed)
+
+    return {
+        "status_code": status_code,
+        "content": b"".join(chunks),
+        # content is already decoded, so drop headers describing the wire body
+        "headers": {
+            key.lower(): value
+            for key, value in response.headers.items()
+            if key.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        },
+        "url": response.url,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Encode the sort name and the last row's key values as an opaque token."""
+    raw = json.dumps([sort, *values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> List[Any]:
+    """
+    Decode a cursor made by encode_cursor for the same sort.
+
+    A cursor that is malformed, or was issued for another sort order, raises
+    ValueError (routes answer 400) instead of silently returning the wrong page.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size + 1 or values[0] != sort:
+        raise ValueError("Invalid cursor")
+    return values[1:]
+
+
+def keyset_condition(sort_sql: str, id_sql: str, sort_value: Any, last_id: int) -> Tuple[str, list]:
+    """
+    WHERE clause for the rows after (sort_value, last_id) in
+    "ORDER BY sort_sql DESC, id_sql DESC" order.
+
+    The leading sort_sql <= ? lets SQLite seek an index on (..., sort_sql, id)
+    even when sort_sql is an expression; the row value breaks ties by id.
+    """
+    return (
+        f"{sort_sql} <= ? AND ({sort_sql}, {id_sql}) < (?, ?)",
+        [sort_value, sort_value, last_id],
+    )
+
+
+def keyset_order(sort_sql: str, id_sql: str) -> str:
+    return f"{sort_sql} DESC, {id_sql} DESC"
+
+
+def paginate(
+    rows: List[dict],
+    limit: int,
+    sort: str,
+    key: Callable[[dict], Sequence[Any]],
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Trim a page fetched with LIMIT limit + 1 and build the next cursor.
+
+    The extra row only tells whether another page exists; the cursor is made
+    from the last row that is returned.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(sort, key(rows[-1]))
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -5,7 +5,7 @@ export function instagramPostImageUrl(postId) {
   return `${API_BASE}/instagram-feeds/posts/${postId}/image`;
 }
 
-async function request(endpoint, options = {}) {
+async function send(endpoint, options = {}) {
   const response = await fetch(`${API_BASE}${endpoint}`, {
     headers: {
       'Content-Type': 'application/json',
@@ -21,6 +21,12 @@ async function request(endpoint, options = {}) {
     throw err;
   }
 
+  return response;
+}
+
+async function request(endpoint, options = {}) {
+  const response = await send(endpoint, options);
+
   if (response.status === 204) {
     return null;
   }
@@ -28,6 +34,16 @@ async function request(endpoint, options = {}) {
   return response.json();
 }
 
+// List endpoints return the cursor for the next page in X-Next-Cursor;
+// it is absent on the last page.
+async function requestPage(endpoint, options = {}) {
+  const response = await send(endpoint, options);
+  return {
+    data: await response.json(),
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  };
+}
+
 // Categories API
 export const categoriesApi = {
   getAll: (params = {}) => {
@@ -87,6 +103,10 @@ export const leadsApi = {
     const query = new URLSearchParams(params).toString();
     return request(`/leads${query ? `?${query}` : ''}`);
   },
+  getPage: (params = {}) => {
+    const query = new URLSearchParams(params).toString();
+    return requestPage(`/leads${query ? `?${query}` : ''}`);
+  },
   getById: (id) => request(`/leads/${id}`),
   getByFeed: (feedId, params = {}) => {
     const query = new URLSearchParams(params).toString();
@@ -111,6 +131,10 @@ export const fetchLogsApi = {
     const query = new URLSearchParams(params).toString();
     return request(`/logs${query ? `?${query}` : ''}`);
   },
+  getPage: (params = {}) => {
+    const query = new URLSearchParams(params).toString();
+    return requestPage(`/logs${query ? `?${query}` : ''}`);
+  },
   getById: (id) => request(`/logs/${id}`),
   getByFeed: (feedId, params = {}) => {
     const query = new URLSearchParams(params).toString();
@@ -161,6 +185,10 @@ export const instagramPostsApi = {
     const query = new URLSearchParams(params).toString();
     return request(`/instagram-feeds/posts${query ? `?${query}` : ''}`);
   },
+  getPage: (params = {}) => {
+    const query = new URLSearchParams(params).toString();
+    return requestPage(`/instagram-feeds/posts${query ? `?${query}` : ''}`);
+  },
   getById: (id) => request(`/instagram-feeds/posts/${id}`),
   delete: (id) => request(`/instagram-feeds/posts/${id}`, { method: 'DELETE' }),
 };
@@ -182,6 +210,10 @@ export const elComercioPostsApi = {
     const query = new URLSearchParams(params).toString();
     return request(`/el-comercio-feeds/posts${query ? `?${query}` : ''}`);
   },
+  getPage: (params = {}) => {
+    const query = new URLSearchParams(params).toString();
+    return requestPage(`/el-comercio-feeds/posts${query ? `?${query}` : ''}`);
+  },
   getById: (id) => request(`/el-comercio-feeds/posts/${id}`),
   delete: (id) => request(`/el-comercio-feeds/posts/${id}`, { method: 'DELETE' }),
 };
@@ -203,6 +235,10 @@ export const diarioCorreoPostsApi = {
     const query = new URLSearchParams(params).toString();
     return request(`/diario-correo-feeds/posts${query ? `?${query}` : ''}`);
   },
+  getPage: (params = {}) => {
+    const query = new URLSearchParams(params).toString();
+    return requestPage(`/diario-correo-feeds/posts${query ? `?${query}` : ''}`);
+  },
   getById: (id) => request(`/diario-correo-feeds/posts/${id}`),
 };
 
@@ -236,6 +272,10 @@ export const youtubePostsApi = {
     const query = new URLSearchParams(params).toString();
     return request(`/youtube-feeds/posts${query ? `?${query}` : ''}`);
   },
+  getPage: (params = {}) => {
+    const query = new URLSearchParams(params).toString();
+    return requestPage(`/youtube-feeds/posts${query ? `?${query}` : ''}`);
+  },
   getById: (id) => request(`/youtube-feeds/posts/${id}`),
   delete: (id) => request(`/youtube-feeds/posts/${id}`, { method: 'DELETE' }),
   getTranscript: (id) => request(`/youtube-feeds/posts/${id}/transcript`),
@@ -249,6 +289,10 @@ export const scrapesApi = {
     const query = new URLSearchParams(params).toString();
     return request(`/scrapes${query ? `?${query}` : ''}`);
   },
+  getPage: (params = {}) => {
+    const query = new URLSearchParams(params).toString();
+    return requestPage(`/scrapes${query ? `?${query}` : ''}`);
+  },
 };
 
 // Subreddits API
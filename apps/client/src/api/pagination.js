@@ -0,0 +1,19 @@
+// Options shared by the infinite lists. Pages come from requestPage() as
+// { data, nextCursor }; select hands components the page bodies only.
+export const cursorPagination = {
+  initialPageParam: null,
+  getNextPageParam: (lastPage) => lastPage?.nextCursor || undefined,
+  select: (data) => ({ ...data, pages: data.pages.map((page) => page.data) }),
+};
+
+export function removeFromPages(old, id) {
+  if (!old?.pages) return old;
+  return {
+    ...old,
+    pages: old.pages.map((page) =>
+      Array.isArray(page?.data)
+        ? { ...page, data: page.data.filter((item) => item.id !== id) }
+        : page
+    ),
+  };
+}
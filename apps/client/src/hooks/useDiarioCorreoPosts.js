@@ -4,6 +4,7 @@ import {
   useQuery,
 } from '@tanstack/react-query';
 import { diarioCorreoPostsApi } from '../api';
+import { cursorPagination } from '../api/pagination';
 import { queryKeys } from '../api/queryKeys';
 
 function buildDiarioCorreoParams(filters) {
@@ -14,6 +15,7 @@ function buildDiarioCorreoParams(filters) {
   if (filters?.country) params.country = filters.country;
   if (filters?.limit != null && filters.limit !== '') params.limit = filters.limit;
   if (filters?.offset != null && filters.offset !== '') params.offset = filters.offset;
+  if (filters?.cursor) params.cursor = filters.cursor;
   return params;
 }
 
@@ -28,15 +30,9 @@ export function useDiarioCorreoPostsList(filters) {
 export function useInfiniteDiarioCorreoPostsList(filters, limit = 30) {
   return useInfiniteQuery({
     queryKey: queryKeys.diarioCorreoPostsInfinite({ ...filters, limit }),
-    queryFn: ({ pageParam = 0 }) => diarioCorreoPostsApi.getAll(
-      buildDiarioCorreoParams({ ...filters, limit, offset: pageParam })
+    queryFn: ({ pageParam }) => diarioCorreoPostsApi.getPage(
+      buildDiarioCorreoParams({ ...filters, limit, cursor: pageParam })
     ),
-    initialPageParam: 0,
-    getNextPageParam: (lastPage, allPages) => {
-      if (!Array.isArray(lastPage) || lastPage.length < limit) {
-        return undefined;
-      }
-      return allPages.length * limit;
-    },
+    ...cursorPagination,
   });
 }
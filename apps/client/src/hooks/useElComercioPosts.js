@@ -6,6 +6,7 @@ import {
   useQueryClient,
 } from '@tanstack/react-query';
 import { elComercioPostsApi } from '../api';
+import { cursorPagination, removeFromPages } from '../api/pagination';
 import { queryKeys } from '../api/queryKeys';
 
 function buildElComercioParams(filters) {
@@ -16,6 +17,7 @@ function buildElComercioParams(filters) {
   if (filters?.country) params.country = filters.country;
   if (filters?.limit != null && filters.limit !== '') params.limit = filters.limit;
   if (filters?.offset != null && filters.offset !== '') params.offset = filters.offset;
+  if (filters?.cursor) params.cursor = filters.cursor;
   return params;
 }
 
@@ -30,16 +32,10 @@ export function useElComercioPostsList(filters) {
 export function useInfiniteElComercioPostsList(filters, limit = 30) {
   return useInfiniteQuery({
     queryKey: queryKeys.elComercioPostsInfinite({ ...filters, limit }),
-    queryFn: ({ pageParam = 0 }) => elComercioPostsApi.getAll(
-      buildElComercioParams({ ...filters, limit, offset: pageParam })
+    queryFn: ({ pageParam }) => elComercioPostsApi.getPage(
+      buildElComercioParams({ ...filters, limit, cursor: pageParam })
     ),
-    initialPageParam: 0,
-    getNextPageParam: (lastPage, allPages) => {
-      if (!Array.isArray(lastPage) || lastPage.length < limit) {
-        return undefined;
-      }
-      return allPages.length * limit;
-    },
+    ...cursorPagination,
   });
 }
 
@@ -57,15 +53,10 @@ export function useDeleteElComercioPost() {
       queryClient.setQueriesData({ queryKey: ['elComercioPosts', 'list'] }, (old) =>
         Array.isArray(old) ? old.filter((item) => item.id !== id) : old
       );
-      queryClient.setQueriesData({ queryKey: ['elComercioPosts', 'infinite'] }, (old) => {
-        if (!old?.pages) return old;
-        return {
-          ...old,
-          pages: old.pages.map((page) =>
-            Array.isArray(page) ? page.filter((item) => item.id !== id) : page
-          ),
-        };
-      });
+      queryClient.setQueriesData(
+        { queryKey: ['elComercioPosts', 'infinite'] },
+        (old) => removeFromPages(old, id)
+      );
 
       return { previous, previousInfinite };
     },
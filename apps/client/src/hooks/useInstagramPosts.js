@@ -6,6 +6,7 @@ import {
   useQueryClient,
 } from '@tanstack/react-query';
 import { instagramPostsApi, translationApi } from '../api';
+import { cursorPagination, removeFromPages } from '../api/pagination';
 import { queryKeys } from '../api/queryKeys';
 
 function buildInstagramParams(filters) {
@@ -17,6 +18,7 @@ function buildInstagramParams(filters) {
   if (filters?.instagram_feed_id) params.instagram_feed_id = filters.instagram_feed_id;
   if (filters?.limit != null && filters.limit !== '') params.limit = filters.limit;
   if (filters?.offset != null && filters.offset !== '') params.offset = filters.offset;
+  if (filters?.cursor) params.cursor = filters.cursor;
   return params;
 }
 
@@ -31,16 +33,10 @@ export function useInstagramPostsList(filters) {
 export function useInfiniteInstagramPostsList(filters, limit = 30) {
   return useInfiniteQuery({
     queryKey: queryKeys.instagramPostsInfinite({ ...filters, limit }),
-    queryFn: ({ pageParam = 0 }) => instagramPostsApi.getAll(
-      buildInstagramParams({ ...filters, limit, offset: pageParam })
+    queryFn: ({ pageParam }) => instagramPostsApi.getPage(
+      buildInstagramParams({ ...filters, limit, cursor: pageParam })
     ),
-    initialPageParam: 0,
-    getNextPageParam: (lastPage, allPages) => {
-      if (!Array.isArray(lastPage) || lastPage.length < limit) {
-        return undefined;
-      }
-      return allPages.length * limit;
-    },
+    ...cursorPagination,
   });
 }
 
@@ -58,15 +54,10 @@ export function useDeleteInstagramPost() {
       queryClient.setQueriesData({ queryKey: ['instagramPosts', 'list'] }, (old) =>
         Array.isArray(old) ? old.filter((item) => item.id !== id) : old
       );
-      queryClient.setQueriesData({ queryKey: ['instagramPosts', 'infinite'] }, (old) => {
-        if (!old?.pages) return old;
-        return {
-          ...old,
-          pages: old.pages.map((page) =>
-            Array.isArray(page) ? page.filter((item) => item.id !== id) : page
-          ),
-        };
-      });
+      queryClient.setQueriesData(
+        { queryKey: ['instagramPosts', 'infinite'] },
+        (old) => removeFromPages(old, id)
+      );
 
       return { previous, previousInfinite };
     },
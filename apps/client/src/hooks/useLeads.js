@@ -6,6 +6,7 @@ import {
   useQueryClient,
 } from '@tanstack/react-query';
 import { leadsApi, translationApi } from '../api';
+import { cursorPagination, removeFromPages } from '../api/pagination';
 import { queryKeys } from '../api/queryKeys';
 
 function buildLeadParams(filters) {
@@ -18,6 +19,7 @@ function buildLeadParams(filters) {
   if (filters?.sort) params.sort = filters.sort;
   if (filters?.limit != null && filters.limit !== '') params.limit = filters.limit;
   if (filters?.offset != null && filters.offset !== '') params.offset = filters.offset;
+  if (filters?.cursor) params.cursor = filters.cursor;
   return params;
 }
 
@@ -32,16 +34,10 @@ export function useLeadsList(filters) {
 export function useInfiniteLeadsList(filters, limit = 30) {
   return useInfiniteQuery({
     queryKey: queryKeys.leadsInfinite({ ...filters, limit }),
-    queryFn: ({ pageParam = 0 }) => leadsApi.getAll(
-      buildLeadParams({ ...filters, limit, offset: pageParam })
+    queryFn: ({ pageParam }) => leadsApi.getPage(
+      buildLeadParams({ ...filters, limit, cursor: pageParam })
     ),
-    initialPageParam: 0,
-    getNextPageParam: (lastPage, allPages) => {
-      if (!Array.isArray(lastPage) || lastPage.length < limit) {
-        return undefined;
-      }
-      return allPages.length * limit;
-    },
+    ...cursorPagination,
   });
 }
 
@@ -59,15 +55,10 @@ export function useDeleteLead() {
       queryClient.setQueriesData({ queryKey: ['leads', 'list'] }, (old) =>
         Array.isArray(old) ? old.filter((item) => item.id !== id) : old
       );
-      queryClient.setQueriesData({ queryKey: ['leads', 'infinite'] }, (old) => {
-        if (!old?.pages) return old;
-        return {
-          ...old,
-          pages: old.pages.map((page) =>
-            Array.isArray(page) ? page.filter((item) => item.id !== id) : page
-          ),
-        };
-      });
+      queryClient.setQueriesData(
+        { queryKey: ['leads', 'infinite'] },
+        (old) => removeFromPages(old, id)
+      );
 
       return { previous, previousInfinite };
     },
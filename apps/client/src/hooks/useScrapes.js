@@ -4,6 +4,7 @@ import {
   useQuery,
 } from '@tanstack/react-query';
 import { scrapesApi } from '../api';
+import { cursorPagination } from '../api/pagination';
 import { queryKeys } from '../api/queryKeys';
 
 function buildScrapesParams(filters) {
@@ -14,6 +15,7 @@ function buildScrapesParams(filters) {
   if (filters?.country) params.country = filters.country;
   if (filters?.limit != null && filters.limit !== '') params.limit = filters.limit;
   if (filters?.offset != null && filters.offset !== '') params.offset = filters.offset;
+  if (filters?.cursor) params.cursor = filters.cursor;
   return params;
 }
 
@@ -28,18 +30,9 @@ export function useScrapesList(filters) {
 export function useInfiniteScrapes(filters, limit = 30) {
   return useInfiniteQuery({
     queryKey: queryKeys.scrapesInfinite({ ...filters, limit }),
-    queryFn: ({ pageParam = 0 }) => scrapesApi.getAll(
-      buildScrapesParams({ ...filters, limit, offset: pageParam }),
+    queryFn: ({ pageParam }) => scrapesApi.getPage(
+      buildScrapesParams({ ...filters, limit, cursor: pageParam }),
     ),
-    initialPageParam: 0,
-    getNextPageParam: (lastPage, allPages) => {
-      const items = lastPage?.items;
-      if (!Array.isArray(items) || items.length < limit) {
-        return undefined;
-      }
-      const totalCount = lastPage?.total_count ?? 0;
-      const nextOffset = allPages.length * limit;
-      return nextOffset >= totalCount ? undefined : nextOffset;
-    },
+    ...cursorPagination,
   });
 }
@@ -6,6 +6,7 @@ import {
   useQueryClient,
 } from '@tanstack/react-query';
 import { youtubePostsApi } from '../api';
+import { cursorPagination, removeFromPages } from '../api/pagination';
 import { queryKeys } from '../api/queryKeys';
 
 function buildYouTubeParams(filters) {
@@ -16,6 +17,7 @@ function buildYouTubeParams(filters) {
   if (filters?.youtube_feed_id) params.youtube_feed_id = filters.youtube_feed_id;
   if (filters?.limit != null && filters.limit !== '') params.limit = filters.limit;
   if (filters?.offset != null && filters.offset !== '') params.offset = filters.offset;
+  if (filters?.cursor) params.cursor = filters.cursor;
   return params;
 }
 
@@ -30,16 +32,10 @@ export function useYouTubePostsList(filters) {
 export function useInfiniteYouTubePostsList(filters, limit = 30) {
   return useInfiniteQuery({
     queryKey: queryKeys.youtubePostsInfinite({ ...filters, limit }),
-    queryFn: ({ pageParam = 0 }) => youtubePostsApi.getAll(
-      buildYouTubeParams({ ...filters, limit, offset: pageParam })
+    queryFn: ({ pageParam }) => youtubePostsApi.getPage(
+      buildYouTubeParams({ ...filters, limit, cursor: pageParam })
     ),
-    initialPageParam: 0,
-    getNextPageParam: (lastPage, allPages) => {
-      if (!Array.isArray(lastPage) || lastPage.length < limit) {
-        return undefined;
-      }
-      return allPages.length * limit;
-    },
+    ...cursorPagination,
   });
 }
 
@@ -57,15 +53,10 @@ export function useDeleteYouTubePost() {
       queryClient.setQueriesData({ queryKey: ['youtubePosts', 'list'] }, (old) =>
         Array.isArray(old) ? old.filter((item) => item.id !== id) : old
       );
-      queryClient.setQueriesData({ queryKey: ['youtubePosts', 'infinite'] }, (old) => {
-        if (!old?.pages) return old;
-        return {
-          ...old,
-          pages: old.pages.map((page) =>
-            Array.isArray(page) ? page.filter((item) => item.id !== id) : page
-          ),
-        };
-      });
+      queryClient.setQueriesData(
+        { queryKey: ['youtubePosts', 'infinite'] },
+        (old) => removeFromPages(old, id)
+      );
 
       return { previous, previousInfinite };
     },
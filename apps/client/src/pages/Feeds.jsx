@@ -103,7 +103,7 @@ export default function Feeds() {
         `${feedName} fetch ${hasErrors ? 'finished with errors' : 'completed'}.`,
       );
       await dialog.alert(
-        `Fetch completed!\nStatus: ${result.status}\nLeads collected: ${result.lead_count}${result.error_message ? '\nErrors: ' + result.error_message : ''}`,
+        `Fetch completed!\nStatus: ${result.status}\nLeads collected: ${result.lead_count}${result.updated_count !== undefined ? `\nUpdated: ${result.updated_count}, unchanged: ${result.unchanged_count}` : ''}${result.error_message ? '\nErrors: ' + result.error_message : ''}`,
         {
           title: hasErrors ? 'Fetch completed with errors' : 'Fetch completed',
           tone,
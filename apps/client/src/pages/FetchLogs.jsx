@@ -90,6 +90,7 @@ export default function FetchLogs() {
               <option value="">All Statuses</option>
               <option value="SUCCESS">Success</option>
               <option value="FAILED">Failed</option>
+              <option value="NOT_MODIFIED">Not modified</option>
             </select>
           </div>
         </div>
@@ -191,7 +191,9 @@ export default function Leads() {
     try {
       // Force re-detection for all leads (not just NULL ones)
       const result = await detectLanguages.mutateAsync(true);
-      await dialog.alert(`Language detection complete!\n${result.leads_updated} leads updated`);
+      await dialog.alert(
+        `Language detection started (job #${result.id}).\n${result.total_rows} rows will be re-detected in the background.`,
+      );
     } catch (err) {
       await dialog.alert(`Error: ${err.message}`);
     }
@@ -339,7 +341,10 @@ export default function Leads() {
                   {lead.author && <span>By {lead.author}</span>}
                   {lead.published && <span>{new Date(lead.published).toLocaleDateString()}</span>}
                 </div>
-                {summary && (
+                {lead.snippet ? (
+                  // Server escapes the snippet; only <mark> tags are HTML
+                  <p className="lead-summary" dangerouslySetInnerHTML={{ __html: lead.snippet }} />
+                ) : summary && (
                   <p className="lead-summary">{summary}</p>
                 )}
                 <div className="lead-footer">